@@ -85,10 +85,10 @@ core_modules = [
 utils_modules = [
     # non UI tools
     "cad_module", "cad_module_class", "sv_bmesh_utils", "sv_viewer_utils", "sv_curve_utils",
-    "voronoi", "sv_script", "sv_itertools", "script_importhelper", "sv_oldnodes_parser",
-    "csg_core", "csg_geom", "geom", "sv_easing_functions", "sv_text_io_common",
+    "voronoi", "voronoi_array", "sv_script", "sv_itertools", "script_importhelper", "sv_oldnodes_parser",
+    "csg_core", "csg_geom", "csg_array", "geom", "sv_easing_functions", "sv_text_io_common",
     "snlite_utils", "snlite_importhelper", "context_managers",
-    "profile", "logging", "testing",
+    "profile", "sv_stats", "logging", "testing", "sv_jagged_array",
     # UI text editor ui
     "text_editor_submenu", "text_editor_plugins",
     # UI operators and tools
@@ -96,7 +96,7 @@ utils_modules = [
     "sv_panels_tools", "sv_gist_tools", "sv_IO_panel_tools", "sv_load_archived_blend",
     "monad", "sv_help", "sv_default_macros", "sv_macro_utils", "sv_extra_search", "sv_3dview_tools",
     #"loadscript",
-    "debug_script", "sv_update_utils", "sv_bgl_primitives"
+    "debug_script", "sv_update_utils", "sv_bgl_primitives", "sv_monad_pool"
 ]
 
 ui_modules = [
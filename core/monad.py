@@ -18,18 +18,25 @@
 
 import pprint
 import random
+import time
 from itertools import chain
 
+import numpy as np
+
 import bpy
 from bpy.types import Node, NodeTree
 from bpy.props import StringProperty, FloatProperty, IntProperty, BoolProperty, CollectionProperty
 
 import sverchok
 from sverchok.utils import get_node_class_reference
-from sverchok.utils.logging import info, error
+from sverchok.utils.logging import info, error, exception
 from sverchok.node_tree import SverchCustomTreeNode, SvNodeTreeCommon
 from sverchok.data_structure import get_other_socket, updateNode, match_long_repeat
-from sverchok.core.update_system import make_tree_from_nodes, do_update
+from sverchok.core.update_system import (
+    make_tree_from_nodes, invalidate_dependency_index, get_dependency_index)
+from sverchok.core.socket_data import get_socket_cache, SvNoDataError
+from sverchok.utils.sv_jagged_array import make_readonly
+from sverchok.utils import sv_stats
 from sverchok.core.monad_properties import SvIntPropertySettingsGroup, SvFloatPropertySettingsGroup
 
 
@@ -223,6 +230,7 @@ class SverchGroupTree(NodeTree, SvNodeTreeCommon):
 
 
     def update(self):
+        invalidate_dependency_index(self)
         affected_trees = {instance.id_data for instance in self.instances}
         for tree in affected_trees:
             tree.update()
@@ -340,6 +348,105 @@ class SverchGroupTree(NodeTree, SvNodeTreeCommon):
 
 
 
+# compiled execution plans of monads, {monad name: MonadPlan}
+monad_plans = {}
+
+
+class MonadPlan(object):
+    """
+    Everything needed to evaluate a monad, computed once per change of its
+    topology: nodes to process in order, and ids of sockets through which
+    data enter and leave the monad, so that data can be put into and taken
+    from socket cache directly.
+    """
+
+    def __init__(self, monad, version):
+        in_node = monad.input_node
+        out_node = monad.output_node
+        self.version = version
+        self.node_names = [name for name in make_tree_from_nodes([out_node.name], monad, down=False)
+                           if hasattr(monad.nodes[name], "process")]
+        # per input node output: socket id, or None if the socket is not linked
+        self.input_ids = [socket.socket_id if socket.is_linked else None
+                          for socket in in_node.outputs]
+        # per output node input: id of the socket feeding it, or None
+        self.output_ids = [socket.other.socket_id if socket.is_linked else None
+                           for socket in out_node.inputs]
+        self.output_sockets = [socket.name for socket in out_node.inputs]
+        # whether all elements of vectorized input can be passed in one pass
+        self.batchable = all(getattr(monad.nodes[name], "sv_batchable", False)
+                             for name in self.node_names)
+
+    def bind(self, monad):
+        """Returns nodes of the plan, raises KeyError if some node is gone."""
+        nodes = monad.nodes
+        return [nodes[name] for name in self.node_names]
+
+    def run(self, nodes, cache, inputs):
+        """
+        Put inputs into input node sockets, process nodes.
+        Exception of a failed node is passed on, so that the failure is shown
+        on the monad instance; data of the previous run is removed from
+        output sockets beforehand, so it is never taken for the result.
+        """
+        for s_id in self.output_ids:
+            if s_id is not None:
+                cache.pop(s_id, None)
+        for s_id, data in zip(self.input_ids, inputs):
+            if s_id is not None:
+                if isinstance(data, np.ndarray):
+                    data = make_readonly(data)
+                cache[s_id] = data
+        for node in nodes:
+            try:
+                if sv_stats.is_currently_enabled:
+                    start = time.perf_counter()
+                    node.process()
+                    sv_stats.record_node(node, start, time.perf_counter() - start)
+                else:
+                    node.process()
+            except Exception as err:
+                exception("Node %s had exception: %s", node.name, err)
+                raise
+
+    def get_output(self, monad, cache, index):
+        s_id = self.output_ids[index]
+        if s_id is None or s_id not in cache:
+            raise SvNoDataError(monad.output_node.inputs[index])
+        return cache[s_id]
+
+
+def evaluate_elements(monad, plan, nodes, cache, data_in, n_outputs, start_index=0):
+    """
+    Evaluate monad once per element of vectorized inputs data_in
+    (list of matched lists, one per input), returns list of
+    joined results per output.
+    """
+    data_out = [[] for idx in range(n_outputs)]
+    for master_idx, data in enumerate(zip(*data_in), start_index):
+        monad["current_index"] = master_idx
+        plan.run(nodes, cache, [[d] for d in data])
+        for idx in range(n_outputs):
+            data_out[idx].extend(plan.get_output(monad, cache, idx))
+    return data_out
+
+
+def get_monad_plan(monad):
+    """
+    Returns (plan, nodes) for monad, compiling the plan
+    if it does not exist yet or topology of monad has changed.
+    """
+    version = get_dependency_index(monad).version
+    plan = monad_plans.get(monad.name)
+    if plan is not None and plan.version == version:
+        try:
+            return plan, plan.bind(monad)
+        except KeyError:
+            pass
+    plan = monad_plans[monad.name] = MonadPlan(monad, version)
+    return plan, plan.bind(monad)
+
+
 def split_list(data, size=1):
     size = max(1, int(size))
     return (data[i:i+size] for i in range(0, len(data), size))
@@ -363,11 +470,23 @@ def uset(self, value, origin):
     return None
 
 
+# only these sockets can carry array payloads, see SvGetSocket
+array_socket_types = {'VerticesSocket', 'StringsSocket', 'MatrixSocket'}
+
+
+def get_input_data(socket):
+    if socket.bl_idname in array_socket_types:
+        return socket.sv_get(deepcopy=False, allow_arrays=True)
+    return socket.sv_get(deepcopy=False)
+
+
 class SvGroupNodeExp:
     """
     Base class for all monad instances
     """
     bl_icon = 'OUTLINER_OB_EMPTY'
+    # the fingerprint of instance does not cover nodes inside of the monad
+    sv_incremental = False
 
     vectorize = BoolProperty(
         name="Vectorize", description="Vectorize using monad",
@@ -377,6 +496,14 @@ class SvGroupNodeExp:
         name="Split", description="Split inputs into lenght 1",
         default=False, update=updateNode)
 
+    batch = BoolProperty(
+        name="Batch", description="Vectorize by passing all elements through the monad at once, if all its nodes support it",
+        default=False, update=updateNode)
+
+    processes = IntProperty(
+        name="Processes", description="Number of background Blender processes (workers) to evaluate vectorized elements in, 1 means evaluate in this Blender",
+        default=1, min=1, max=64, update=updateNode)
+
     loop_me = BoolProperty(default=False, update=updateNode)
     loops_max = IntProperty(default=5, description='maximum')
     loops = IntProperty(
@@ -417,6 +544,27 @@ class SvGroupNodeExp:
     def draw_buttons_ext(self, context, layout):
         self.draw_buttons(context, layout)
         layout.prop(self, 'loops_max')
+        row = layout.row(align=True)
+        row.active = self.vectorize
+        row.prop(self, 'processes')
+        monad = self.monad
+        if monad and self.processes > 1:
+            from sverchok.utils.sv_monad_pool import has_pool
+            callback = "node.sv_monad_workers_callback"
+            if has_pool(monad):
+                row.operator(callback, text="Stop workers").fn_name = "stop_workers"
+            else:
+                row.operator(callback, text="Start workers").fn_name = "start_workers"
+
+    def start_workers(self, operator):
+        from sverchok.utils.sv_monad_pool import start_pool
+        if start_pool(self.monad, self.processes) is None:
+            operator.report({'WARNING'}, "Monad uses scene data, it can not be evaluated in workers")
+        updateNode(self, None)
+
+    def stop_workers(self, operator):
+        from sverchok.utils.sv_monad_pool import stop_pool
+        stop_pool(self.monad.name)
 
     def draw_buttons(self, context, layout):
 
@@ -427,6 +575,7 @@ class SvGroupNodeExp:
         cA.prop(self, "vectorize", toggle=True)
         cB.active = self.vectorize
         cB.prop(self, "split", toggle=True)
+        cB.prop(self, "batch", toggle=True)
         
         c2 = layout.column()
         row = c2.row(align=True)
@@ -457,30 +606,23 @@ class SvGroupNodeExp:
             return
 
         monad = self.monad
-        in_node = monad.input_node
-        out_node = monad.output_node
+        plan, nodes = get_monad_plan(monad)
+        cache = get_socket_cache(monad.name)
 
-        for index, socket in enumerate(self.inputs):
-            data = socket.sv_get(deepcopy=False)
-            in_node.outputs[index].sv_set(data)
-
-        #  get update list
-        #  could be cached
-        ul = make_tree_from_nodes([out_node.name], monad, down=False)
-        do_update(ul, monad.nodes)
+        inputs = [get_input_data(socket) for socket in self.inputs]
+        plan.run(nodes, cache, inputs)
         # set output sockets correctly
         for index, socket in enumerate(self.outputs):
             if socket.is_linked:
-                data = out_node.inputs[index].sv_get(deepcopy=False)
-                socket.sv_set(data)
+                socket.sv_set(plan.get_output(monad, cache, index))
 
     def process_vectorize(self):
         monad = self.monad
-        in_node = monad.input_node
-        out_node = monad.output_node
-        ul = make_tree_from_nodes([out_node.name], monad, down=False)
+        plan, nodes = get_monad_plan(monad)
+        cache = get_socket_cache(monad.name)
+        n_outputs = len(monad.output_node.inputs) - 1
 
-        data_out = [[] for s in self.outputs]
+        data_out = None
 
         data_in = match_long_repeat([s.sv_get(deepcopy=False) for s in self.inputs])
         if self.split:
@@ -489,45 +631,54 @@ class SvGroupNodeExp:
                 data_in[idx] = new_data
             data_in = match_long_repeat(data_in)
 
-        monad["current_total"] = len(data_in[0])
+        total = len(data_in[0])
+        monad["current_total"] = total
 
+        if self.batch and plan.batchable:
+            data_out = self.process_batch(plan, nodes, cache, data_in, n_outputs, total)
 
-        for master_idx, data in enumerate(zip(*data_in)):
-            for idx, d in enumerate(data):
-                socket = in_node.outputs[idx]
-                if socket.is_linked:
-                    socket.sv_set([d])
-            monad["current_index"] = master_idx
-            do_update(ul, monad.nodes)
-            for idx, s in enumerate(out_node.inputs[:-1]):
-                data_out[idx].extend(s.sv_get(deepcopy=False))
+        if data_out is None and self.processes > 1 and total > 1:
+            from sverchok.utils.sv_monad_pool import evaluate_in_processes
+            data_out = evaluate_in_processes(monad, data_in, n_outputs, self.processes)
+
+        if data_out is None:
+            data_out = evaluate_elements(monad, plan, nodes, cache, data_in, n_outputs)
 
         for idx, socket in enumerate(self.outputs):
             if socket.is_linked:
                 socket.sv_set(data_out[idx])
 
+    def process_batch(self, plan, nodes, cache, data_in, n_outputs, total):
+        """
+        Pass all elements of vectorized inputs through the monad in one
+        evaluation. Failures are not retried element by element,
+        to not evaluate the monad twice.
+        """
+        monad = self.monad
+        monad["current_index"] = 0
+        plan.run(nodes, cache, data_in)
+        data_out = [list(plan.get_output(monad, cache, idx)) for idx in range(n_outputs)]
+        if any(len(data) != total for data in data_out):
+            raise ValueError("Monad {}: batched result does not match {} elements, turn Batch off".format(
+                             monad.name, total))
+        return data_out
+
 
     # ----------- loop (iterate 2)
 
     def do_process(self, sockets_data_in):
 
         monad = self.monad
-        in_node = monad.input_node
-        out_node = monad.output_node
-
-        for index, data in enumerate(sockets_data_in):
-            in_node.outputs[index].sv_set(data)        
-
+        plan, nodes = get_monad_plan(monad)
+        cache = get_socket_cache(monad.name)
 
-        ul = make_tree_from_nodes([out_node.name], monad, down=False)
-        do_update(ul, monad.nodes)
+        plan.run(nodes, cache, sockets_data_in)
 
         # set output sockets correctly
         socket_data_out = []
         for index, socket in enumerate(self.outputs):
             if socket.is_linked:
-                data = out_node.inputs[index].sv_get(deepcopy=False)
-                socket_data_out.append(data)
+                socket_data_out.append(plan.get_output(monad, cache, index))
 
         return socket_data_out
 
@@ -16,8 +16,14 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import itertools
+import sys
+
+import numpy as np
+
 from sverchok import data_structure
-from sverchok.utils.logging import warning
+from sverchok.utils.logging import debug, warning
+from sverchok.utils.sv_jagged_array import SvJaggedArray, make_readonly, is_array_payload, payload_to_lists
 
 #####################################
 # socket data cache                 #
@@ -28,6 +34,20 @@ sentinel = object()
 # socket cache
 socket_data_cache = {}
 
+# socket data versions, used by incremental update to detect
+# whether data that a node consumes has actually changed
+socket_data_version = {}
+_version_counter = itertools.count(1)
+# whether SvSetSocket compares new data with the cached one to keep the
+# version when nothing changed; the update system turns it off for nodes
+# that have no consumers which could be skipped, see is_same_data()
+compare_output_data = True
+
+# estimated size of cached socket data in bytes,
+# {tree name: {socket id: size}}, and totals per tree
+socket_data_size = {}
+socket_data_total = {}
+
 # faster than builtin deep copy for us.
 # useful for our limited case
 # we should be able to specify vectors here to get them create
@@ -43,6 +63,74 @@ def sv_deep_copy(lst):
     return lst
 
 
+class SvLazyList(list):
+    """
+    Lazily copied nested list from socket cache.
+
+    Only the top level is copied on creation (which is cheap pointer copy),
+    nested lists are copied when the consumer first reads them, and stored
+    back, so the consumer never gets lists owned by the cache and still
+    sees its own modifications. Parts of data the consumer never gets to
+    are not copied; a node reading all of its input still copies all of it.
+    Lists of plain values (numbers, tuples) are copied directly.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, idx):
+        item = list.__getitem__(self, idx)
+        if isinstance(idx, slice):
+            return SvLazyList(item)
+        if type(item) is list:
+            item = lazy_copy(item)
+            list.__setitem__(self, idx, item)
+        return item
+
+    def __iter__(self):
+        for idx, item in enumerate(list.__iter__(self)):
+            if type(item) is list:
+                item = lazy_copy(item)
+                list.__setitem__(self, idx, item)
+            yield item
+
+    def __reversed__(self):
+        for idx in range(len(self) - 1, -1, -1):
+            yield self[idx]
+
+    def pop(self, *args):
+        item = list.pop(self, *args)
+        if type(item) is list:
+            item = lazy_copy(item)
+        return item
+
+    def copy(self):
+        return SvLazyList(self)
+
+    def __add__(self, other):
+        return SvLazyList(list.__add__(self, other))
+
+    def __radd__(self, other):
+        # list + SvLazyList would join items of the cache without copying them;
+        # python prefers this method since SvLazyList is a subclass of list
+        return other + list(self)
+
+    def __mul__(self, n):
+        return SvLazyList(list.__mul__(self, n))
+
+    __rmul__ = __mul__
+
+
+def lazy_copy(data):
+    """return lazily copied list structure"""
+    if isinstance(data, list):
+        items = list(list.__iter__(data))
+        # all items are checked: lists can be mixed, like [[...], 5]
+        if any(isinstance(item, list) for item in items):
+            return SvLazyList(items)
+        return items
+    return sv_deep_copy(data)
+
+
 # Build string for showing in socket label
 def SvGetSocketInfo(socket):
     """returns string to show in socket label"""
@@ -62,7 +150,7 @@ def SvGetSocketInfo(socket):
     if ng in socket_data_cache:
         if s_id in socket_data_cache[ng]:
             data = socket_data_cache[ng][s_id]
-            if data:
+            if data is not None and len(data):
                 return str(len(data))
     return ''
 
@@ -75,18 +163,130 @@ def SvSetSocket(socket, out):
             warning("{} setting input socket: {}".format(socket.node.name, socket.name))
         if not socket.is_linked:
             warning("{} setting unconncted socket: {}".format(socket.node.name, socket.name))
+    if isinstance(out, np.ndarray):
+        out = make_readonly(out)
     s_id = socket.socket_id
     s_ng = socket.id_data.name
     if s_ng not in socket_data_cache:
         socket_data_cache[s_ng] = {}
-    socket_data_cache[s_ng][s_id] = out
+    s_cache = socket_data_cache[s_ng]
+    if data_structure.INCREMENTAL_UPDATE:
+        versions = socket_data_version.setdefault(s_ng, {})
+        if s_id not in s_cache or not compare_output_data or not is_same_data(s_cache[s_id], out):
+            versions[s_id] = next(_version_counter)
+    s_cache[s_id] = out
+    sizes = socket_data_size.setdefault(s_ng, {})
+    size = estimate_data_size(out)
+    socket_data_total[s_ng] = socket_data_total.get(s_ng, 0) - sizes.get(s_id, 0) + size
+    sizes[s_id] = size
+
+
+def estimate_data_size(data):
+    """
+    Rough estimate of memory used by socket data, in bytes.
+    Nested lists are supposed to be homogeneous,
+    so only the first item at each level is inspected.
+    """
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, SvJaggedArray):
+        return data.nbytes
+    size = sys.getsizeof(data)
+    if isinstance(data, (list, tuple)) and data:
+        size += len(data) * estimate_data_size(data[0])
+    return size
 
 
-def SvGetSocket(socket, deepcopy=True):
+def get_socket_cache_size(ng_name=None):
+    """
+    Estimated size of cached socket data in bytes,
+    for one node tree or for all of them.
+    """
+    if ng_name is not None:
+        return socket_data_total.get(ng_name, 0)
+    return sum(socket_data_total.values())
+
+
+def get_output_data_stats(node):
+    """
+    Total number of items and estimated size in bytes
+    of data cached for output sockets of the node.
+    """
+    s_ng = node.id_data.name
+    s_cache = socket_data_cache.get(s_ng, {})
+    sizes = socket_data_size.get(s_ng, {})
+    items, nbytes = 0, 0
+    for socket in node.outputs:
+        s_id = socket.socket_id
+        if s_id in s_cache:
+            data = s_cache[s_id]
+            if hasattr(data, "__len__"):
+                items += len(data)
+            nbytes += sizes.get(s_id, 0)
+    return items, nbytes
+
+
+def evict_socket_data(socket):
+    """
+    Remove data of output socket from cache, return number of bytes freed.
+    """
+    s_ng = socket.id_data.name
+    s_id = socket.socket_id
+    s_cache = socket_data_cache.get(s_ng)
+    if not s_cache or s_id not in s_cache:
+        return 0
+    del s_cache[s_id]
+    socket_data_version.get(s_ng, {}).pop(s_id, None)
+    size = socket_data_size.get(s_ng, {}).pop(s_id, 0)
+    socket_data_total[s_ng] = socket_data_total.get(s_ng, 0) - size
+    return size
+
+
+def is_same_data(old, new):
+    """
+    Check if new socket data is equal to the data already in cache.
+    Data that can't be compared cheaply (numpy arrays and such)
+    is considered to be changed.
+    """
+    if old is new:
+        return True
+    if isinstance(old, np.ndarray) or isinstance(new, np.ndarray):
+        return (isinstance(old, np.ndarray) and isinstance(new, np.ndarray)
+                and old.dtype == new.dtype and np.array_equal(old, new))
+    try:
+        return bool(old == new)
+    except Exception:
+        return False
+
+
+def get_socket_data_version(socket):
+    """
+    Return version of data available to input socket from the linked output,
+    None if there is no data.
+    """
+    other = socket.other
+    if not other:
+        return None
+    versions = socket_data_version.get(other.id_data.name)
+    if not versions:
+        return None
+    return versions.get(other.socket_id)
+
+
+def has_socket_data(socket):
+    """True if there is cached data for the (output) socket"""
+    s_cache = socket_data_cache.get(socket.id_data.name)
+    return bool(s_cache) and socket.socket_id in s_cache
+
+
+def SvGetSocket(socket, deepcopy=True, allow_arrays=False):
     """gets socket data from socket,
     if deep copy is True a deep copy is make_dep_dict,
     to increase performance if the node doesn't mutate input
-    set to False and increase performance substanstilly
+    set to False and increase performance substanstilly.
+    If the socket carries numpy array or SvJaggedArray, it is
+    returned as is (read-only) when allow_arrays is True,
+    otherwise it is converted into nested lists.
     """
     global socket_data_cache
     if socket.is_linked:
@@ -97,7 +297,13 @@ def SvGetSocket(socket, deepcopy=True):
             raise LookupError
         if s_id in socket_data_cache[s_ng]:
             out = socket_data_cache[s_ng][s_id]
+            if is_array_payload(out):
+                if allow_arrays:
+                    return out
+                return payload_to_lists(out, copy=deepcopy)
             if deepcopy:
+                if data_structure.LAZY_COPY:
+                    return lazy_copy(out)
                 return sv_deep_copy(out)
             else:
                 return out
@@ -109,6 +315,28 @@ def SvGetSocket(socket, deepcopy=True):
     # not linked
     raise SvNoDataError(socket)
 
+def get_socket_cache(ng_name):
+    """
+    Data cache of one node tree, {socket id: data}.
+    For code that passes data through sockets of a tree many times in a row
+    (compiled monad plans); data put into it directly bypasses memory
+    accounting and versioning of SvSetSocket.
+    """
+    s_cache = socket_data_cache.get(ng_name)
+    if s_cache is None:
+        s_cache = socket_data_cache[ng_name] = {}
+    return s_cache
+
+def get_output_socket_data(socket, default=sentinel):
+    """gets data that was set to output socket"""
+    s_cache = socket_data_cache.get(socket.id_data.name, {})
+    s_id = socket.socket_id
+    if s_id in s_cache:
+        return s_cache[s_id]
+    if default is sentinel:
+        raise SvNoDataError(socket)
+    return default
+
 class SvNoDataError(LookupError):
     def __init__(self, socket=None, node=None):
         if node is None and socket is not None:
@@ -136,9 +364,41 @@ class SvNoDataError(LookupError):
     def __format__(self, spec):
         return repr(self)
 
+def get_input_data_snapshot(node):
+    """
+    Remember data from socket cache which linked inputs of the node refer to,
+    together with a deep copy of it, see check_input_mutation()
+    """
+    snapshot = []
+    for socket in node.inputs:
+        if not socket.is_linked:
+            continue
+        other = socket.other
+        if not other:
+            continue
+        data = socket_data_cache.get(other.id_data.name, {}).get(other.socket_id)
+        if isinstance(data, (list, tuple)):
+            snapshot.append((socket.name, data, sv_deep_copy(data)))
+    return snapshot
+
+
+def check_input_mutation(node, snapshot):
+    """
+    Warn if node modified data from socket cache,
+    which it was given without copying
+    """
+    for socket_name, data, data_copy in snapshot:
+        if data != data_copy:
+            warning("Node %s modified data of input socket `%s' without copying it",
+                    node.name, socket_name)
+
+
 def reset_socket_cache(ng):
     """
     Reset socket cache either for node group.
     """
     global socket_data_cache
     socket_data_cache[ng.name] = {}
+    socket_data_version[ng.name] = {}
+    socket_data_size[ng.name] = {}
+    socket_data_total[ng.name] = 0
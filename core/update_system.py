@@ -17,15 +17,24 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import collections
+import concurrent.futures
+import heapq
+import os
 import time
 
 import bpy
 from mathutils import Vector
 
 from sverchok import data_structure
-from sverchok.core.socket_data import SvNoDataError, reset_socket_cache
+from sverchok.core import socket_data
+from sverchok.core.socket_data import (
+    SvNoDataError, reset_socket_cache,
+    get_socket_data_version, has_socket_data,
+    get_input_data_snapshot, check_input_mutation,
+    get_socket_cache_size, evict_socket_data)
 from sverchok.utils.logging import debug, info, warning, error, exception
 from sverchok.utils.profile import profile
+from sverchok.utils import sv_stats
 import sverchok
 
 import traceback
@@ -46,6 +55,14 @@ def update_error_colors(self, context):
 update_cache = {}
 # cache for partial update lists
 partial_update_cache = {}
+# dependency index of node trees, {tree name: TreeDependencyIndex}
+dependency_index = {}
+# nodes whose output data was dropped from socket cache to fit into
+# memory budget, {tree name: set of node names}
+evicted_nodes = {}
+# fingerprints of node inputs and settings used by incremental update,
+# {tree name: {node name: fingerprint}}
+node_fingerprints = {}
 
 
 def make_dep_dict(node_tree, down=False):
@@ -94,6 +111,168 @@ def make_dep_dict(node_tree, down=False):
     return deps
 
 
+class TreeDependencyIndex(object):
+    """
+    Dependency dictionaries and partial update lists of a node tree.
+    They are built on first request and kept until topology of the tree
+    changes, see invalidate_dependency_index(), or until nodes get renamed,
+    since dependencies refer to nodes by name.
+    """
+
+    def __init__(self, version=0, node_names=()):
+        self.version = version
+        self.node_names = node_names
+        self.deps = {}
+        self.partial_lists = {}
+
+
+def get_dependency_index(node_tree):
+    index = dependency_index.get(node_tree.name)
+    # blender does not report renaming of nodes to the tree
+    node_names = tuple(node_tree.nodes.keys())
+    if index is None or index.node_names != node_names:
+        version = index.version + 1 if index is not None else 0
+        index = dependency_index[node_tree.name] = TreeDependencyIndex(version, node_names)
+    return index
+
+
+def invalidate_dependency_index(node_tree):
+    """
+    Drop cached dependencies of the tree,
+    to be called when links or nodes of the tree change.
+    """
+    index = dependency_index.get(node_tree.name)
+    if index is not None:
+        dependency_index[node_tree.name] = TreeDependencyIndex(index.version + 1, index.node_names)
+
+
+def get_dep_dict(node_tree, down=False):
+    """
+    Cached version of make_dep_dict(). The returned dictionary is shared,
+    callers must not modify it; since it is a defaultdict, read it
+    with deps.get(name, ()) so that missing keys are not added to it.
+    """
+    index = get_dependency_index(node_tree)
+    deps = index.deps.get(down)
+    if deps is None:
+        deps = make_dep_dict(node_tree, down)
+        # empty result can mean invalid links, which are
+        # usually fixed by blender a moment later; don't cache that
+        if deps or not node_tree.links:
+            index.deps[down] = deps
+    return deps
+
+
+class SvCyclicTreeError(ValueError):
+    """
+    Raised when nodes of a tree depend on each other in a loop;
+    `cycle' is the list of names of nodes forming the loop.
+    """
+
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__("Node tree contains a cycle: " + " -> ".join(cycle))
+
+
+def find_cycle(node_set, deps):
+    """
+    Returns list of names of nodes forming a dependency loop
+    within node_set, or None if there is no loop.
+    """
+    state = {}
+    for root in sorted(node_set):
+        if root in state:
+            continue
+        path = [root]
+        stack = [iter(sorted(deps.get(root, ())))]
+        state[root] = 1
+        while stack:
+            for dep_name in stack[-1]:
+                if dep_name not in node_set:
+                    continue
+                dep_state = state.get(dep_name)
+                if dep_state == 1:
+                    return path[path.index(dep_name):] + [dep_name]
+                if dep_state is None:
+                    state[dep_name] = 1
+                    path.append(dep_name)
+                    stack.append(iter(sorted(deps.get(dep_name, ()))))
+                    break
+            else:
+                state[path.pop()] = 2
+                stack.pop()
+    return None
+
+
+def sort_nodes(node_set, deps):
+    """
+    Order names from node_set so that each node comes after all its
+    dependencies, in O(nodes + links). Nodes of one chain are kept together,
+    so that intermediate data is not kept longer than needed.
+    Raises SvCyclicTreeError if there is a dependency loop.
+    """
+    out = []
+    state = {}
+    for root in sorted(node_set):
+        if root in state:
+            continue
+        path = [root]
+        stack = [iter(deps.get(root, ()))]
+        state[root] = 1
+        while stack:
+            for dep_name in stack[-1]:
+                if dep_name not in node_set:
+                    continue
+                dep_state = state.get(dep_name)
+                if dep_state is None:
+                    state[dep_name] = 1
+                    path.append(dep_name)
+                    stack.append(iter(deps.get(dep_name, ())))
+                    break
+                if dep_state == 1:
+                    raise SvCyclicTreeError(find_cycle(node_set, deps))
+            else:
+                name = path.pop()
+                state[name] = 2
+                out.append(name)
+                stack.pop()
+    return out
+
+
+def sort_nodes_by_levels(node_set, deps):
+    """
+    Split names from node_set into levels: the first level contains nodes
+    without dependencies, each next one contains nodes depending only on nodes
+    of previous levels. Nodes within one level do not depend on each other,
+    so they can be processed in parallel.
+    Raises SvCyclicTreeError if there is a dependency loop.
+    """
+    waiting = {}
+    dependents = collections.defaultdict(list)
+    for name in node_set:
+        node_deps = [dep_name for dep_name in deps.get(name, ()) if dep_name in node_set]
+        waiting[name] = len(node_deps)
+        for dep_name in node_deps:
+            dependents[dep_name].append(name)
+
+    levels = []
+    level = sorted(name for name, count in waiting.items() if not count)
+    done = 0
+    while level:
+        levels.append(level)
+        done += len(level)
+        next_level = []
+        for name in level:
+            for other in dependents[name]:
+                waiting[other] -= 1
+                if not waiting[other]:
+                    next_level.append(other)
+        level = sorted(next_level)
+    if done < len(node_set):
+        raise SvCyclicTreeError(find_cycle(node_set, deps))
+    return levels
+
+
 def make_update_list(node_tree, node_set=None, dependencies=None):
     """
     Makes a update list from a node_group
@@ -107,47 +286,35 @@ def make_update_list(node_tree, node_set=None, dependencies=None):
         node_set = set(ng.nodes.keys())
     if len(node_set) == 1:
         return list(node_set)
-    if node_set:  # get one name
-        name = node_set.pop()
-        node_set.add(name)
-    else:
+    if not node_set:
         return []
     if not dependencies:
-        deps = make_dep_dict(ng)
+        deps = get_dep_dict(ng)
     else:
         deps = dependencies
 
-    tree_stack = collections.deque([name])
-    tree_stack_append = tree_stack.append
-    tree_stack_pop = tree_stack.pop
-    out = collections.OrderedDict()
-    # travel in node graph create one sorted list of nodes based on dependencies
-    node_count = len(node_set)
-    while node_count > len(out):
-        node_dependencies = True
-        for dep_name in deps[name]:
-            if dep_name in node_set and dep_name not in out:
-                tree_stack_append(name)
-                name = dep_name
-                node_dependencies = False
-                break
-        if len(tree_stack) > node_count:
-            error("Invalid node tree!")
-            return []
-        # if all dependencies are in out
-        if node_dependencies:
-            if name not in out:
-                out[name] = 1
-            if tree_stack:
-                name = tree_stack_pop()
-            else:
-                if node_count == len(out):
-                    break
-                for node_name in node_set:
-                    if node_name not in out:
-                        name = node_name
-                        break
-    return list(out.keys())
+    try:
+        return sort_nodes(set(node_set), deps)
+    except SvCyclicTreeError as err:
+        error("Invalid node tree %s: %s", ng.name, err)
+        return []
+
+
+def make_update_levels(node_tree, node_set=None, dependencies=None):
+    """
+    Same as make_update_list, but returns list of levels (lists of names
+    of nodes that do not depend on each other), see sort_nodes_by_levels.
+    """
+    ng = node_tree
+    if not node_set:
+        node_set = set(ng.nodes.keys())
+    deps = dependencies or get_dep_dict(ng)
+
+    try:
+        return sort_nodes_by_levels(set(node_set), deps)
+    except SvCyclicTreeError as err:
+        error("Invalid node tree %s: %s", ng.name, err)
+        return []
 
 
 def separate_nodes(ng, links=None):
@@ -159,10 +326,10 @@ def separate_nodes(ng, links=None):
     nodes = set(ng.nodes.keys())
     if not nodes:
         return []
-    node_links = make_dep_dict(ng)
-    down = make_dep_dict(ng, down=True)
-    for name, links in down.items():
-        node_links[name].update(links)
+    node_links = collections.defaultdict(set)
+    for deps in (get_dep_dict(ng), get_dep_dict(ng, down=True)):
+        for name, links in deps.items():
+            node_links[name].update(links)
     n = nodes.pop()
     node_set_list = [set([n])]
     node_stack = collections.deque()
@@ -202,15 +369,25 @@ def make_tree_from_nodes(node_names, tree, down=True):
         warning("No nodes!")
         return make_update_list(ng)
 
+    index = get_dependency_index(ng)
+    key = (frozenset(node_names), down)
+    update_list = index.partial_lists.get(key)
+    if update_list is None:
+        update_list = make_tree_from_nodes_uncached(node_names, ng, down)
+        if update_list:
+            index.partial_lists[key] = update_list
+    return list(update_list)
+
+
+def make_tree_from_nodes_uncached(node_names, ng, down):
     out_set = set(node_names)
 
     out_stack = collections.deque(node_names)
     current_node = out_stack.pop()
 
-    # build downwards links, this should be cached perhaps
-    node_links = make_dep_dict(ng, down)
+    node_links = get_dep_dict(ng, down)
     while current_node:
-        for node in node_links[current_node]:
+        for node in node_links.get(current_node, ()):
             if node not in out_set:
                 out_set.add(node)
                 out_stack.append(node)
@@ -244,7 +421,7 @@ def make_animation_tree(node_types, node_list, tree_name):
     return a_tree
 
 
-def do_update_heat_map(node_list, nodes):
+def do_update_heat_map(node_list, nodes, incremental=False):
     """
     Create a heat map for the node tree,
     Needs development.
@@ -253,10 +430,12 @@ def do_update_heat_map(node_list, nodes):
         color_data = {node.name: (node.color[:], node.use_custom_color) for node in nodes}
         nodes.id_data.sv_user_colors = str(color_data)
 
-    times = do_update_general(node_list, nodes)
+    times = do_update_general(node_list, nodes, incremental=incremental)
     if not times:
         return
     t_max = max(times)
+    if not t_max:
+        return
     addon_name = data_structure.SVERCHOK_NAME
     addon = bpy.context.user_preferences.addons.get(addon_name)
     if addon:
@@ -304,10 +483,204 @@ def reset_error_nodes(ng):
         del ng["error nodes"]
 
 
+def freeze_value(value):
+    """
+    Convert property value to something hashable and comparable
+    """
+    if hasattr(value, "to_dict"):
+        value = value.to_dict()
+    elif hasattr(value, "to_list"):
+        value = value.to_list()
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze_value(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_value(v) for v in value)
+    return value
+
+
+def freeze_property(value):
+    """
+    Convert value of RNA property to something hashable and comparable
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, bpy.types.ID):
+        return value.name
+    if isinstance(value, bpy.types.PropertyGroup):
+        return freeze_value(value.items())
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    try:
+        return tuple(freeze_property(v) for v in value)
+    except TypeError:
+        return repr(value)
+
+
+# names of properties declared by node classes, {node class: tuple of names}
+node_property_names = {}
+
+
+def get_node_property_names(node):
+    """
+    Names of RNA properties declared by the node class itself,
+    without ones common to all nodes (name, location, color and so on).
+    """
+    cls = type(node)
+    names = node_property_names.get(cls)
+    if names is None:
+        common = set(bpy.types.Node.bl_rna.properties.keys())
+        names = tuple(name for name in node.bl_rna.properties.keys() if name not in common)
+        node_property_names[cls] = names
+    return names
+
+
+def node_fingerprint(node):
+    """
+    Fingerprint of everything node.process() depends on:
+    node properties, properties of unlinked input sockets
+    and versions of data coming into linked input sockets.
+    Properties are read through RNA, since node.items() contains
+    only properties that were ever set to something but default.
+    Returns None if some input data has unknown version.
+    """
+    properties = tuple(freeze_property(getattr(node, name, None))
+                       for name in get_node_property_names(node))
+    inputs = []
+    for socket in node.inputs:
+        if socket.is_linked:
+            version = get_socket_data_version(socket)
+            if version is None:
+                return None
+            inputs.append((socket.identifier, version))
+        else:
+            inputs.append((socket.identifier, freeze_value(socket.items())))
+    return properties, freeze_value(node.items()), tuple(inputs)
+
+
+def is_incremental(node):
+    """
+    Nodes which read scene, texts, images or other blender data,
+    and nodes which opt out, are processed on every update.
+    """
+    return getattr(node, "sv_incremental", True) and not getattr(node, "sv_uses_scene_data", False)
+
+
+def has_incremental_consumers(nodes, name, down):
+    """
+    True if some node using output data of the node can be skipped
+    by incremental update, so that it's worth checking whether the data changed.
+    """
+    return any(is_incremental(nodes[consumer])
+               for consumer in down.get(name, ()) if consumer in nodes)
+
+
+def can_skip_node(node, fingerprint, fingerprints):
+    """
+    Node doesn't have to be processed if it supports incremental update,
+    nothing it depends on changed since last processing and
+    its output data is still in socket cache.
+    """
+    if not is_incremental(node):
+        return False
+    if fingerprint is None or fingerprints.get(node.name) != fingerprint:
+        return False
+    return all(has_socket_data(s) for s in node.outputs if s.is_linked)
+
+
+def reset_node_fingerprints(ng=None):
+    """
+    Forget recorded fingerprints for node group, or for all trees.
+    """
+    global node_fingerprints
+    if ng is None:
+        node_fingerprints = {}
+    else:
+        node_fingerprints[ng.name] = {}
+
+
+class CacheBudget(object):
+    """
+    Keeps socket cache of a tree within memory budget during one update:
+    output data of processed nodes is dropped, oldest first, once all nodes
+    of the update list consuming it are processed.
+    Data is never dropped if one of its consumers declares
+    sv_reads_inputs_later, since such nodes (viewers and the like)
+    read their inputs outside of update.
+    """
+
+    def __init__(self, ng, node_list):
+        self.ng = ng
+        self.budget = data_structure.SOCKET_CACHE_BUDGET * 1024 * 1024
+        self.evicted = evicted_nodes.setdefault(ng.name, set())
+        self.deps = get_dep_dict(ng)
+        down = get_dep_dict(ng, down=True)
+        nodes = ng.nodes
+        pending = set(node_list)
+        # number of consumers not processed yet, only for nodes which can be dropped
+        self.waiting = {}
+        for name in node_list:
+            consumers = [nodes[consumer] for consumer in down.get(name, ()) if consumer in nodes]
+            if not consumers or any(getattr(consumer, "sv_reads_inputs_later", False) for consumer in consumers):
+                continue
+            self.waiting[name] = sum(1 for consumer in consumers if consumer.name in pending)
+        self.done = set()
+        self.ready = collections.deque()
+
+    def node_done(self, name):
+        """
+        To be called after node is processed (or skipped);
+        drops data which is not needed any more if cache is over budget.
+        """
+        self.done.add(name)
+        self.evicted.discard(name)
+        waiting = self.waiting
+        for dep in self.deps.get(name, ()):
+            if dep in waiting:
+                waiting[dep] -= 1
+                if not waiting[dep] and dep in self.done:
+                    self.ready.append(dep)
+        if waiting.get(name) == 0:
+            self.ready.append(name)
+
+        ng_name = self.ng.name
+        nodes = self.ng.nodes
+        while self.ready and get_socket_cache_size(ng_name) > self.budget:
+            dropped = self.ready.popleft()
+            freed = sum(evict_socket_data(socket) for socket in nodes[dropped].outputs)
+            self.evicted.add(dropped)
+            if data_structure.DEBUG_MODE:
+                debug("Dropped output data of %s, %d bytes", dropped, freed)
+
+
+def add_evicted_dependencies(ng, update_list):
+    """
+    Add nodes whose output data was dropped from cache,
+    but is needed by nodes from update_list, to the update list.
+    """
+    evicted = evicted_nodes.get(ng.name)
+    if not evicted:
+        return update_list
+    deps = get_dep_dict(ng)
+    list_set = set(update_list)
+    needed = set()
+    stack = list(update_list)
+    while stack:
+        name = stack.pop()
+        for dep in deps.get(name, ()):
+            if dep in evicted and dep not in list_set and dep not in needed:
+                needed.add(dep)
+                stack.append(dep)
+    if not needed:
+        return update_list
+    return make_update_list(ng, list_set | needed, deps)
+
+
 @profile(section="UPDATE")
-def do_update_general(node_list, nodes, procesed_nodes=set()):
+def do_update_general(node_list, nodes, procesed_nodes=set(), incremental=False):
     """
-    General update function for node set
+    General update function for node set.
+    If incremental is True, then nodes whose inputs and settings did not
+    change since last processing are skipped.
     """
     global graphs
     timings = []
@@ -315,15 +688,49 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
     total_time = 0
     done_nodes = set(procesed_nodes)
 
+    ng = nodes.id_data
+    use_fingerprints = data_structure.INCREMENTAL_UPDATE and ng.bl_idname == "SverchCustomTreeType"
+    if use_fingerprints:
+        fingerprints = node_fingerprints.setdefault(ng.name, {})
+        down = get_dep_dict(ng, down=True)
+    use_budget = data_structure.SOCKET_CACHE_BUDGET and ng.bl_idname == "SverchCustomTreeType"
+    if use_budget:
+        budget = CacheBudget(ng, node_list)
+
     for node_name in node_list:
         if node_name in done_nodes:
             continue
         try:
             node = nodes[node_name]
+            if use_fingerprints:
+                fingerprint = node_fingerprint(node)
+                if incremental and can_skip_node(node, fingerprint, fingerprints):
+                    if data_structure.DEBUG_MODE:
+                        debug("Skipped unchanged %s", node_name)
+                    if sv_stats.is_currently_enabled:
+                        sv_stats.record_node(node, time.perf_counter(), 0.0, cache_hit=True)
+                    if use_budget:
+                        budget.node_done(node_name)
+                    timings.append(0.0)
+                    continue
+                fingerprints.pop(node_name, None)
+                socket_data.compare_output_data = has_incremental_consumers(nodes, node_name, down)
+            if data_structure.CHECK_INPUT_MUTATION:
+                snapshot = get_input_data_snapshot(node)
+            if sv_stats.is_currently_enabled:
+                memory_before = sv_stats.begin_node()
             start = time.perf_counter()
             if hasattr(node, "process"):
                 node.process()
             delta = time.perf_counter() - start
+            if sv_stats.is_currently_enabled:
+                sv_stats.record_node(node, start, delta, memory_before)
+            if data_structure.CHECK_INPUT_MUTATION:
+                check_input_mutation(node, snapshot)
+            if use_fingerprints and fingerprint is not None:
+                fingerprints[node_name] = fingerprint
+            if use_budget:
+                budget.node_done(node_name)
             total_time += delta
             if data_structure.DEBUG_MODE:
                 debug("Processed  %s in: %.4f", node_name, delta)
@@ -339,17 +746,138 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
             #traceback.print_tb(err.__traceback__)
             exception("Node %s had exception: %s", node_name, err)
             return None
+        finally:
+            socket_data.compare_output_data = True
     graphs.append(graph)
     if data_structure.DEBUG_MODE:
         debug("Node set updated in: %.4f seconds", total_time)
+        debug("Socket cache size: %.1f MB (%.1f MB in all trees)",
+              get_socket_cache_size(ng.name) / 1048576, get_socket_cache_size() / 1048576)
     return timings
 
 
-def do_update(node_list, nodes):
+# thread pool of parallel update, created on demand
+_update_executor = None
+
+
+def get_update_executor():
+    global _update_executor
+    if _update_executor is None:
+        workers = data_structure.PARALLEL_WORKERS or os.cpu_count() or 1
+        _update_executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    return _update_executor
+
+
+def shutdown_update_executor():
+    global _update_executor
+    if _update_executor is not None:
+        _update_executor.shutdown(wait=True)
+        _update_executor = None
+
+
+def run_job(compute):
+    start = time.perf_counter()
+    results = compute()
+    return results, start, time.perf_counter() - start
+
+
+@profile(section="UPDATE")
+def do_update_parallel(node_lists, nodes):
+    """
+    Update several node lists at once, every node is processed as soon
+    as all its dependencies are done. Nodes declaring sv_thread_safe are
+    prepared in the main thread, compute in worker threads while other
+    nodes are processed, and their outputs are set in the main thread
+    again; all access to blender data stays in the main thread.
+    """
+    global graphs
+    graph = []
+    ng = nodes.id_data
+
+    order = {}
+    for node_list in node_lists:
+        for name in node_list:
+            order.setdefault(name, len(order))
+    deps = get_dep_dict(ng)
+    down = get_dep_dict(ng, down=True)
+    waiting = {name: sum(1 for dep in deps.get(name, ()) if dep in order) for name in order}
+    ready = [(order[name], name) for name, count in waiting.items() if not count]
+    heapq.heapify(ready)
+
+    use_fingerprints = data_structure.INCREMENTAL_UPDATE
+    if use_fingerprints:
+        fingerprints = node_fingerprints.setdefault(ng.name, {})
+    budget = CacheBudget(ng, list(order)) if data_structure.SOCKET_CACHE_BUDGET else None
+    executor = get_update_executor()
+    # future -> (node name, fingerprint)
+    running = {}
+
+    def node_done(name, fingerprint, start, delta):
+        node = nodes[name]
+        if sv_stats.is_currently_enabled:
+            sv_stats.record_node(node, start, delta)
+        if use_fingerprints and fingerprint is not None:
+            fingerprints[name] = fingerprint
+        if budget:
+            budget.node_done(name)
+        if data_structure.DEBUG_MODE:
+            debug("Processed  %s in: %.4f", name, delta)
+        graph.append({"name": name,
+                      "bl_idname": node.bl_idname,
+                      "start": start,
+                      "duration": delta})
+        for other in down.get(name, ()):
+            if other in waiting:
+                waiting[other] -= 1
+                if not waiting[other]:
+                    heapq.heappush(ready, (order[other], other))
+
+    name = None
+    try:
+        while ready or running:
+            finished = [future for future in running if future.done()]
+            if not finished and not ready:
+                finished, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in finished:
+                name, fingerprint = running.pop(future)
+                results, start, delta = future.result()
+                nodes[name].sv_apply(results)
+                node_done(name, fingerprint, start, delta)
+            if not ready:
+                continue
+
+            _, name = heapq.heappop(ready)
+            node = nodes[name]
+            fingerprint = None
+            if use_fingerprints:
+                fingerprint = node_fingerprint(node)
+                fingerprints.pop(name, None)
+            start = time.perf_counter()
+            if getattr(node, "sv_thread_safe", False):
+                compute = node.sv_prepare()
+                if compute is not None:
+                    running[executor.submit(run_job, compute)] = (name, fingerprint)
+                    continue
+            elif hasattr(node, "process"):
+                node.process()
+            node_done(name, fingerprint, start, time.perf_counter() - start)
+
+    except Exception as err:
+        # no worker may go on with data of this update
+        concurrent.futures.wait(running)
+        update_error_nodes(ng, name, err)
+        exception("Node %s had exception: %s", name, err)
+        return None
+
+    graphs.append(graph)
+    return graph
+
+
+def do_update(node_list, nodes, incremental=False):
     if data_structure.HEAT_MAP:
-        do_update_heat_map(node_list, nodes)
+        do_update_heat_map(node_list, nodes, incremental)
     else:
-        do_update_general(node_list, nodes)
+        do_update_general(node_list, nodes, incremental=incremental)
 
 def build_update_list(ng=None):
     """
@@ -365,12 +893,15 @@ def build_update_list(ng=None):
         for ng in sverchok_trees():
             build_update_list(ng)
     else:
+        invalidate_dependency_index(ng)
         node_sets = separate_nodes(ng)
-        deps = make_dep_dict(ng)
+        deps = get_dep_dict(ng)
         out = [make_update_list(ng, s, deps) for s in node_sets]
         update_cache[ng.name] = out
         partial_update_cache[ng.name] = {}
         reset_socket_cache(ng)
+        reset_node_fingerprints(ng)
+        evicted_nodes[ng.name] = set()
 
 
 def process_to_node(node):
@@ -395,7 +926,9 @@ def process_from_nodes(nodes):
     node_names = [node.name for node in nodes]
     ng = nodes[0].id_data
     update_list = make_tree_from_nodes(node_names, ng)
-    do_update(update_list, ng.nodes)
+    update_list = add_evicted_dependencies(ng, update_list)
+    forget_fingerprints(ng, node_names)
+    do_update(update_list, ng.nodes, incremental=True)
 
 
 def process_from_node(node):
@@ -423,10 +956,20 @@ def process_from_node(node):
         nodes = ng.nodes
         if not ng.sv_process:
             return
-        do_update(update_list, nodes)
+        # the node that initiated update is always processed,
+        # for example monad instance can have changes inside
+        forget_fingerprints(ng, [node.name])
+        update_list = add_evicted_dependencies(ng, update_list)
+        do_update(update_list, nodes, incremental=True)
     else:
         process_tree(ng)
 
+def forget_fingerprints(ng, node_names):
+    fingerprints = node_fingerprints.get(ng.name)
+    if fingerprints:
+        for name in node_names:
+            fingerprints.pop(name, None)
+
 def sverchok_trees():
     for ng in bpy.data.node_groups:
         if ng.bl_idname == "SverchCustomTreeType":
@@ -450,6 +993,9 @@ def process_tree(ng=None):
         if not update_list:
             build_update_list(ng)
             update_list = update_cache.get(ng.name)
+        if data_structure.PARALLEL_UPDATE and not data_structure.HEAT_MAP:
+            do_update_parallel(update_list, ng.nodes)
+            return
         for l in update_list:
             do_update(l, ng.nodes)
     else:
@@ -477,3 +1023,7 @@ def register():
     addon = bpy.context.user_preferences.addons.get(addon_name)
     if addon:
         update_error_colors(addon.preferences, [])
+
+
+def unregister():
+    shutdown_update_executor()
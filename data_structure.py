@@ -26,6 +26,14 @@ import numpy as np
 
 DEBUG_MODE = False
 HEAT_MAP = False
+INCREMENTAL_UPDATE = False
+LAZY_COPY = False
+CHECK_INPUT_MUTATION = False
+# socket cache budget in megabytes, 0 means unlimited
+SOCKET_CACHE_BUDGET = 0
+PARALLEL_UPDATE = False
+# number of worker threads of parallel update, 0 means number of CPUs
+PARALLEL_WORKERS = 0
 RELOAD_EVENT = False
 
 # this is set correctly later.
@@ -350,27 +358,17 @@ def describe_data_shape(data):
 
 
 def Matrix_listing(prop):
-    """Convert Matrix() into Sverchok data"""
-    mat_out = []
-    for i, matrix in enumerate(prop):
-        unit = []
-        for k, m in enumerate(matrix):
-            # [Matrix0, Matrix1, ... ]
-            unit.append(m[:])
-        mat_out.append((unit))
-    return mat_out
+    """Convert Matrix() (or (N, 4, 4) array) into Sverchok data"""
+    if hasattr(prop, "tolist"):
+        return prop.tolist()
+    return [[m[:] for m in matrix] for matrix in prop]
 
 
 def Matrix_generate(prop):
-    """Generate Matrix() data from Sverchok data"""
-    mat_out = []
-    for i, matrix in enumerate(prop):
-        unit = Matrix()
-        for k, m in enumerate(matrix):
-            # [Matrix0, Matrix1, ... ]
-            unit[k] = Vector(m)
-        mat_out.append(unit)
-    return mat_out
+    """Generate Matrix() data from Sverchok data (or (N, 4, 4) array)"""
+    if hasattr(prop, "tolist"):
+        prop = prop.tolist()
+    return [Matrix(matrix) for matrix in prop]
 
 
 def Matrix_location(prop, list=False):
@@ -503,6 +501,12 @@ def setup_init():
     """
     global DEBUG_MODE
     global HEAT_MAP
+    global INCREMENTAL_UPDATE
+    global LAZY_COPY
+    global CHECK_INPUT_MUTATION
+    global SOCKET_CACHE_BUDGET
+    global PARALLEL_UPDATE
+    global PARALLEL_WORKERS
     global SVERCHOK_NAME
     import sverchok
     SVERCHOK_NAME = sverchok.__name__
@@ -510,6 +514,12 @@ def setup_init():
     if addon:
         DEBUG_MODE = addon.preferences.show_debug
         HEAT_MAP = addon.preferences.heat_map
+        INCREMENTAL_UPDATE = addon.preferences.incremental_update
+        LAZY_COPY = addon.preferences.lazy_copy
+        CHECK_INPUT_MUTATION = addon.preferences.check_input_mutation
+        SOCKET_CACHE_BUDGET = addon.preferences.socket_cache_budget
+        PARALLEL_UPDATE = addon.preferences.parallel_update
+        PARALLEL_WORKERS = addon.preferences.parallel_workers
     else:
         print("Setup of preferences failed")
 
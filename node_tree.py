@@ -46,6 +46,7 @@ from sverchok.core.update_system import (
     build_update_list,
     process_from_node,
     process_tree,
+    invalidate_dependency_index,
     get_update_lists, update_error_nodes)
 
 from sverchok.core.socket_conversions import (
@@ -354,7 +355,7 @@ class MatrixSocket(NodeSocket, SvSocketCommon):
     def get_prop_data(self):
         return {}
 
-    def sv_get(self, default=sentinel, deepcopy=True):
+    def sv_get(self, default=sentinel, deepcopy=True, allow_arrays=False):
         self.num_matrices = 0
         if self.is_linked and not self.is_output:
 
@@ -370,7 +371,7 @@ class MatrixSocket(NodeSocket, SvSocketCommon):
                 self.num_matrices = len(out)
                 return out
 
-            return SvGetSocket(self, deepcopy)
+            return SvGetSocket(self, deepcopy, allow_arrays)
         elif default is sentinel:
             raise SvNoDataError(self)
         else:
@@ -395,13 +396,13 @@ class VerticesSocket(NodeSocket, SvSocketCommon):
         else:
             return {}
 
-    def sv_get(self, default=sentinel, deepcopy=True):
+    def sv_get(self, default=sentinel, deepcopy=True, allow_arrays=False):
         if self.is_linked and not self.is_output:
             if is_matrix_to_vector(self):
                 out = get_locs_from_matrices(SvGetSocket(self, deepcopy=True))
                 return out
 
-            return SvGetSocket(self, deepcopy)
+            return SvGetSocket(self, deepcopy, allow_arrays)
 
         if self.prop_name:
             return [[getattr(self.node, self.prop_name)[:]]]
@@ -528,9 +529,9 @@ class StringsSocket(NodeSocket, SvSocketCommon):
         else:
             return {}
 
-    def sv_get(self, default=sentinel, deepcopy=True):
+    def sv_get(self, default=sentinel, deepcopy=True, allow_arrays=False):
         if self.is_linked and not self.is_output:
-            return SvGetSocket(self, deepcopy)
+            return SvGetSocket(self, deepcopy, allow_arrays)
         elif self.prop_name:
             # to deal with subtype ANGLE, this solution should be considered temporary...
             _, prop_dict = getattr(self.node.rna_type, self.prop_name, (None, {}))
@@ -657,6 +658,7 @@ class SverchCustomTree(NodeTree, SvNodeTreeCommon):
         Tags tree for update for handle
         get update list for debug info, tuple (fulllist, dictofpartiallists)
         '''
+        invalidate_dependency_index(self)
         self.has_changed = True
 
     def process_ani(self):
@@ -687,6 +689,36 @@ class SverchCustomTreeNode:
     # A cache for get_docstring() method
     _docstring = None
 
+    # Set to False in nodes that depend on something besides their inputs
+    # and properties (scene, frame, text blocks), so that incremental
+    # update never skips them.
+    sv_incremental = True
+
+    # Set to True in nodes that process each object of input lists
+    # independently of other objects, so that batched vectorization of
+    # monads can pass all elements through them in one go. Nodes that
+    # join, sort, count or reorder objects must keep it False.
+    sv_batchable = False
+
+    # Set to True in nodes that read their input sockets outside of
+    # process() (in operators, draw callbacks and such), so that data
+    # they are linked to is never dropped to fit socket cache budget.
+    sv_reads_inputs_later = False
+
+    # Set to True in nodes that read or write objects, texts, images or
+    # other blender data in process(), so that incremental update never
+    # skips them and monads containing them are not evaluated in
+    # background Blender processes.
+    sv_uses_scene_data = False
+
+    # Set to True in nodes that can compute their outputs in a worker
+    # thread during parallel update. Such nodes implement sv_prepare():
+    # it runs in the main thread, reads inputs and properties and returns
+    # a function without arguments, or None if there is nothing to do.
+    # That function runs in a worker thread, must not touch bpy at all,
+    # and returns {output socket name: data}, see sv_apply().
+    sv_thread_safe = False
+
     @classmethod
     def poll(cls, ntree):
         return ntree.bl_idname in ['SverchCustomTreeType', 'SverchGroupTreeType']
@@ -697,6 +729,11 @@ class SverchCustomTreeNode:
             self.n_id = str(hash(self) ^ hash(time.monotonic()))
         return self.n_id
 
+    def sv_apply(self, results):
+        """Set output data computed by the function sv_prepare() returned"""
+        for name, data in results.items():
+            self.outputs[name].sv_set(data)
+
     def mark_error(self, err):
         """
         marks the with system error color
@@ -16,11 +16,32 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import hashlib
+
 import bpy
 import mathutils
-from bpy.props import FloatProperty, EnumProperty, IntProperty
+import numpy as np
+from bpy.props import FloatProperty, EnumProperty, IntProperty, BoolProperty, StringProperty
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import (updateNode, match_long_repeat as mlr)
+from sverchok.data_structure import (updateNode, node_id, match_long_repeat as mlr)
+from sverchok.utils.sv_jagged_array import SvJaggedArray
+
+# node id -> {fingerprint of inserted vertices: balanced KDTree}
+kdtree_cache = {}
+
+
+def points_fingerprint(vertices):
+    """Key identifying set of points (in this order), cheaper than building the tree"""
+    array = np.ascontiguousarray(vertices, dtype=np.float64)
+    return array.shape, hashlib.sha1(array.tobytes()).hexdigest()
+
+
+def build_kdtree(vertices):
+    kd = mathutils.kdtree.KDTree(len(vertices))
+    for idx, co in enumerate(vertices):
+        kd.insert(co, idx)
+    kd.balance()
+    return kd
 
 
 class SvKDTreeNodeMK2(bpy.types.Node, SverchCustomTreeNode):
@@ -51,9 +72,41 @@ class SvKDTreeNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         items=modes, description="mathutils kdtree metods",
         default="find_n", update=update_mode)
 
+    output_numpy = BoolProperty(
+        name='NumPy',
+        description='Output flat NumPy arrays of results of all queries (with offsets) instead of lists',
+        default=False, update=updateNode)
+
+    n_id = StringProperty(default='')
+
     def draw_buttons(self, context, layout):
         row = layout.row()
         row.prop(self, 'mode', expand=True)
+        row.prop(self, 'output_numpy', text="NP", toggle=True)
+
+    def copy(self, node):
+        self.n_id = ''
+
+    def free(self):
+        kdtree_cache.pop(node_id(self), None)
+
+    def get_kdtrees(self, vertices_s):
+        """
+        Balanced KDTree for each object; trees are reused while
+        inserted vertices do not change (e.g. only queries are animated)
+        """
+        old_cache = kdtree_cache.get(node_id(self), {})
+        new_cache = {}
+        trees = []
+        for vertices in vertices_s:
+            key = points_fingerprint(vertices)
+            kd = new_cache.get(key, old_cache.get(key))
+            if kd is None:
+                kd = build_kdtree(vertices)
+            new_cache[key] = kd
+            trees.append(kd)
+        kdtree_cache[node_id(self)] = new_cache
+        return trees
 
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', 'insert')
@@ -66,19 +119,20 @@ class SvKDTreeNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         self.outputs.new('StringsSocket', 'distance')
 
     def process(self):
-        V1, V2, N, R = [i.sv_get() for i in self.inputs]
-        out = []
         Co, ind, dist = self.outputs
+        if not any(s.is_linked for s in self.outputs):
+            return
+        V1, V2, N, R = [i.sv_get(deepcopy=False) for i in self.inputs]
+        out = []
         find_n = self.mode == "find_n"
-        for v, v2, k in zip(V1, V2, (N if find_n else R)):
-            kd = mathutils.kdtree.KDTree(len(v))
-            for idx, co in enumerate(v):
-                kd.insert(co, idx)
-            kd.balance()
+        for kd, v2, k in zip(self.get_kdtrees(V1), V2, (N if find_n else R)):
             if find_n:
                 out.extend([kd.find_n(vert, num) for vert, num in zip(*mlr([v2, k]))])
             else:
                 out.extend([kd.find_range(vert, dist) for vert, dist in zip(*mlr([v2, k]))])
+        if self.output_numpy:
+            self.output_arrays(out)
+            return
         if Co.is_linked:
             Co.sv_set([[i[0][:] for i in i2] for i2 in out])
         if ind.is_linked:
@@ -86,6 +140,26 @@ class SvKDTreeNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         if dist.is_linked:
             dist.sv_set([[i[2] for i in i2] for i2 in out])
 
+    def output_arrays(self, out):
+        """
+        Results of all queries as flat arrays, query i being
+        data[offsets[i]:offsets[i+1]] (or list of lists per query,
+        as usual, for nodes which do not take arrays)
+        """
+        Co, ind, dist = self.outputs
+        offsets = np.zeros(len(out) + 1, dtype=np.int64)
+        np.cumsum([len(found) for found in out], out=offsets[1:])
+        flat = [item for found in out for item in found]
+        if Co.is_linked:
+            data = np.array([item[0][:] for item in flat], dtype=np.float64).reshape((-1, 3))
+            Co.sv_set(SvJaggedArray(data, offsets))
+        if ind.is_linked:
+            data = np.fromiter((item[1] for item in flat), dtype=np.int64, count=len(flat))
+            ind.sv_set(SvJaggedArray(data, offsets))
+        if dist.is_linked:
+            data = np.fromiter((item[2] for item in flat), dtype=np.float64, count=len(flat))
+            dist.sv_set(SvJaggedArray(data, offsets))
+
 
 def register():
     bpy.utils.register_class(SvKDTreeNodeMK2)
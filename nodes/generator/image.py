@@ -18,9 +18,56 @@
 
 import bpy
 from bpy.props import IntProperty, FloatProperty, StringProperty
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, fullList
+from sverchok.utils.sv_operator_mixins import SvGenericCallbackWithParams
+
+# node id -> (fingerprint of image, its pixels as read-only (height, width, 4) float32 array);
+# every node keeps only the pixels of the image it sampled last time
+pixels_cache = {}
+
+
+def image_fingerprint(image):
+    return (image.name, image.as_pointer(), tuple(image.size), image.filepath_raw, image.source)
+
+
+def read_pixels(image):
+    """Pixels of image as (height, width, 4) float32 array"""
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    try:
+        image.pixels.foreach_get(pixels)
+    except AttributeError:
+        # older Blender has no foreach_get for arrays
+        pixels[:] = image.pixels[:]
+    return pixels.reshape((height, width, 4))
+
+
+def get_pixels(image, key):
+    """
+    Pixels of image, read once and reused until the image is
+    changed (see image_fingerprint) or reloaded with the node's button.
+    Images with unsaved changes (painted or changed by scripts) are
+    read every time, is_dirty does not tell if they changed since then.
+    """
+    if image.is_dirty:
+        pixels_cache.pop(key, None)
+        return read_pixels(image)
+    fingerprint = image_fingerprint(image)
+    cached = pixels_cache.get(key)
+    if cached is None or cached[0] != fingerprint:
+        pixels = read_pixels(image)
+        pixels.setflags(write=False)
+        cached = pixels_cache[key] = (fingerprint, pixels)
+    return cached[1]
+
+
+class SvImageNodeCallback(bpy.types.Operator, SvGenericCallbackWithParams):
+    """ Read pixels of the image again """
+    bl_idname = "node.sv_image_node_callback"
+    bl_label = "Execute a function on the calling node"
 
 
 class ImageNode(bpy.types.Node, SverchCustomTreeNode):
@@ -28,9 +75,11 @@ class ImageNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'ImageNode'
     bl_label = 'Image'
     bl_icon = 'FILE_IMAGE'
+    sv_uses_scene_data = True
 
 
     name_image = StringProperty(name='image_name', description='image name', default='', update=updateNode)
+    n_id = StringProperty(default='')
 
     R = FloatProperty(
         name='R', description='R', default=0.30, min=0, max=1,
@@ -76,6 +125,15 @@ class ImageNode(bpy.types.Node, SverchCustomTreeNode):
         row.prop(self, "R", text="R")
         row.prop(self, "G", text="G")
         row.prop(self, "B", text="B")
+        if self.name_image:
+            layout.operator("node.sv_image_node_callback", text="Reload").fn_name = "reload_image"
+
+    def reload_image(self, operator):
+        pixels_cache.pop(self.node_id, None)
+        image = bpy.data.images.get(self.name_image)
+        if image is not None:
+            image.reload()
+        updateNode(self, bpy.context)
 
     def process(self):
         inputs, outputs = self.inputs, self.outputs
@@ -105,6 +163,8 @@ class ImageNode(bpy.types.Node, SverchCustomTreeNode):
 
         if outputs['vecs'].is_linked:
             out = [self.make_vertices(IntegerX-1, IntegerY-1, StepX, StepY, self.name_image)]
+        else:
+            pixels_cache.pop(self.node_id, None)
         outputs['vecs'].sv_set(out)
 
         if outputs['edgs'].is_linked:
@@ -129,35 +189,39 @@ class ImageNode(bpy.types.Node, SverchCustomTreeNode):
         outputs['pols'].sv_set(plg)
         
 
+    def copy(self, node):
+        self.n_id = ''
+
+    def free(self):
+        pixels_cache.pop(self.node_id, None)
+
     def make_vertices(self, delitelx, delitely, stepx, stepy, image_name):
-        lenx = bpy.data.images[image_name].size[0]
-        leny = bpy.data.images[image_name].size[1]
+        image = bpy.data.images[image_name]
+        lenx, leny = image.size
         if delitelx > lenx:
             delitelx = lenx
         if delitely > leny:
             delitely = leny
-        R, G, B = self.R, self.G, self.B
         xcoef = lenx//delitelx
         ycoef = leny//delitely
-        # copy images data, pixels is created on every access with [i], extreme speedup.
-        # http://blender.stackexchange.com/questions/3673/why-is-accessing-image-data-so-slow
-        imag = bpy.data.images[image_name].pixels[:]
-        vertices = []
-        addition = 0
-        for y in range(delitely+1):
-            addition = int(ycoef*y*4*lenx)
-            for x in range(delitelx+1):
-                #  каждый пиксель кодируется RGBA, и записан строкой, без разделения на строки и столбцы.
-                middle = (imag[addition]*R+imag[addition+1]*G+imag[addition+2]*B)*imag[addition+3]
-                vertex = [x*stepx[x], y*stepy[y], middle]
-                vertices.append(vertex) 
-                addition += int(xcoef*4)
-        return vertices
+        # sample every xcoef-th pixel of every ycoef-th row, staying inside of the image
+        columns = np.minimum(np.arange(delitelx+1) * xcoef, lenx-1)
+        rows = np.minimum(np.arange(delitely+1) * ycoef, leny-1)
+        pixels = get_pixels(image, self.node_id)[rows[:, np.newaxis], columns].astype(np.float64)
+        heights = pixels[..., :3].dot((self.R, self.G, self.B)) * pixels[..., 3]
+
+        vertices = np.empty((delitely+1, delitelx+1, 3))
+        vertices[..., 0] = np.arange(delitelx+1) * np.array(stepx[:delitelx+1], dtype=np.float64)
+        vertices[..., 1] = (np.arange(delitely+1) * np.array(stepy[:delitely+1], dtype=np.float64))[:, np.newaxis]
+        vertices[..., 2] = heights
+        return vertices.reshape((-1, 3)).tolist()
 
 
 def register():
+    bpy.utils.register_class(SvImageNodeCallback)
     bpy.utils.register_class(ImageNode)
 
 
 def unregister():
     bpy.utils.unregister_class(ImageNode)
+    bpy.utils.unregister_class(SvImageNodeCallback)
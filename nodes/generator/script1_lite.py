@@ -99,6 +99,7 @@ class SvScriptNodeLite(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvScriptNodeLite'
     bl_label = 'Scripted Node Lite'
     bl_icon = 'SCRIPTPLUGINS'
+    sv_incremental = False
 
     def custom_enum_func(self, context):
         ND = self.node_dict.get(hash(self))
@@ -291,6 +291,7 @@ class SvGenerativeArtNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvGenerativeArtNode'
     bl_label = 'Generative Art'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_uses_scene_data = True
 
     def updateNode_filename(self, context):
         self.process_node(context)
@@ -202,6 +202,7 @@ class SvMeshEvalNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvMeshEvalNode'
     bl_label = 'Mesh Expression'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_uses_scene_data = True
 
     def on_update(self, context):
         self.adjust_sockets()
@@ -156,6 +156,7 @@ class SvScriptNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvScriptNode'
     bl_label = 'Scripted Node'
     bl_icon = 'SCRIPTPLUGINS'
+    sv_uses_scene_data = True
 
     def avail_templates(self, context):
         fullpath = [sv_path, "node_scripts", "templates"]
@@ -113,6 +113,7 @@ class SvScriptNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvScriptNodeMK2'
     bl_label = 'Script 2'
     bl_icon = 'SCRIPTPLUGINS'
+    sv_uses_scene_data = True
 
     def avail_templates(self, context):
         templates_path = os.path.join(sv_path, "node_scripts", "SN2-templates")
@@ -21,6 +21,7 @@ from bpy.props import StringProperty, EnumProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
+from sverchok.core.update_system import invalidate_dependency_index
 
 # Warning, changing this node without modifying the update system might break functionlaity
 # bl_idname and var_name is used by the update system
@@ -31,9 +32,14 @@ class WifiOutNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'WifiOutNode'
     bl_label = 'Wifi out'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_incremental = False
+
+    def change_var_name(self, context):
+        # dependencies of wifi nodes are defined by var_name
+        invalidate_dependency_index(self.id_data)
 
     var_name = StringProperty(name='var_name',
-                              default='')
+                              default='', update=change_var_name)
 
     def avail_var_name(self, context):
         ng = self.id_data
@@ -18,10 +18,11 @@
 
 import bpy
 from bpy.props import BoolProperty
-from mathutils import Matrix, Vector
+import numpy as np
+
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import (Matrix_generate, updateNode)
-from sverchok.utils.sv_mesh_utils import mesh_join
+from sverchok.data_structure import updateNode
+from sverchok.utils.sv_matrix_utils import matrices_to_array, apply_matrices_to_objects
 
 
 class SvMatrixApplyJoinNode(bpy.types.Node, SverchCustomTreeNode):
@@ -52,21 +53,28 @@ class SvMatrixApplyJoinNode(bpy.types.Node, SverchCustomTreeNode):
     def process(self):
         if not self.inputs['Matrices'].is_linked:
             return
-        vertices = self.inputs['Vertices'].sv_get()
-        matrices = self.inputs['Matrices'].sv_get()
-        matrices = Matrix_generate(matrices)
+        vertices = self.inputs['Vertices'].sv_get(deepcopy=False, allow_arrays=True)
+        matrices = self.inputs['Matrices'].sv_get(deepcopy=False, allow_arrays=True)
+        matrices = matrices_to_array(matrices)
         n = len(matrices)
-        result_vertices = (vertices*n)[:n]
-        outV = []
-        for i, i2 in zip(matrices, result_vertices):
-            outV.append([(i*Vector(v))[:] for v in i2])
+        outV = apply_matrices_to_objects(matrices, vertices)
         edges = self.inputs['Edges'].sv_get(default=[[]])
         faces = self.inputs['Faces'].sv_get(default=[[]])
         result_edges = (edges * n)[:n]
         result_faces = (faces * n)[:n]
         if self.do_join:
-            outV, result_edges, result_faces = mesh_join(outV, result_edges, result_faces)
-            outV, result_edges, result_faces = [outV], [result_edges], [result_faces]
+            if isinstance(outV, np.ndarray):
+                lengths = [outV.shape[1]] * n
+                joined = outV.reshape((1, -1, 3))
+            else:
+                lengths = outV.lengths.tolist()
+                joined = outV.data.reshape((1, -1, 3))
+            offsets = np.cumsum([0] + lengths).tolist()
+            result_edges = [[tuple(i + offset for i in edge)
+                             for edges, offset in zip(result_edges, offsets) for edge in edges]]
+            result_faces = [[[i + offset for i in face]
+                             for faces, offset in zip(result_faces, offsets) for face in faces]]
+            outV = joined
         self.outputs['Edges'].sv_set(result_edges)
         self.outputs['Faces'].sv_set(result_faces)
         self.outputs['Vertices'].sv_set(outV)
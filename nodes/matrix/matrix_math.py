@@ -20,11 +20,13 @@ import bpy
 from bpy.props import IntProperty, FloatProperty, BoolProperty, EnumProperty
 
 from mathutils import Matrix
-from functools import reduce
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode, MatrixSocket, StringsSocket
-from sverchok.data_structure import (updateNode, match_long_repeat,
-                                     Matrix_listing, Matrix_generate)
+from sverchok.data_structure import updateNode, Matrix_listing
+from sverchok.utils.sv_matrix_utils import (
+    matrices_to_array, multiply_matrices, invert_matrices,
+    decompose_matrices, compose_matrices)
 
 operationItems = [
     ("MULTIPLY", "Multiply", "Multiply two matrices", 0),
@@ -125,47 +127,24 @@ class SvMatrixMathNode(bpy.types.Node, SverchCustomTreeNode):
             row.prop(self, "filter_s", toggle=True, text="S")
 
     def operation_filter(self, a):
-        T, R, S = a.decompose()
-
-        if self.filter_t:
-            mat_t = Matrix().Identity(4)
-        else:
-            mat_t = Matrix().Translation(T)
-
-        if self.filter_r:
-            mat_r = Matrix().Identity(4)
-        else:
-            mat_r = R.to_matrix().to_4x4()
-
-        if self.filter_s:
-            mat_s = Matrix().Identity(4)
-        else:
-            mat_s = Matrix().Identity(4)
-            mat_s[0][0] = S[0]
-            mat_s[1][1] = S[1]
-            mat_s[2][2] = S[2]
-
-        m = mat_t * mat_r * mat_s
-
-        return m
+        T, R, S = decompose_matrices(a)
+        return compose_matrices(
+            None if self.filter_t else T,
+            None if self.filter_r else R,
+            None if self.filter_s else S,
+            count=len(a))
 
     def operation_basis(self, a):
-        T, R, S = a.decompose()
-
-        rot = R.to_matrix().to_4x4()
-        Rx = (rot[0][0], rot[1][0], rot[2][0])
-        Ry = (rot[0][1], rot[1][1], rot[2][1])
-        Rz = (rot[0][2], rot[1][2], rot[2][2])
-
-        return Rx, Ry, Rz
+        T, R, S = decompose_matrices(a)
+        return R[:, :, 0], R[:, :, 1], R[:, :, 2]
 
     def get_operation(self):
         if self.operation == "MULTIPLY":
-            return lambda l: reduce((lambda a, b: a * b), l)
+            return multiply_matrices
         elif self.operation == "FILTER":
             return self.operation_filter
         elif self.operation == "INVERT":
-            return lambda a: a.inverted()
+            return invert_matrices
         elif self.operation == "BASIS":
             return self.operation_basis
 
@@ -190,46 +169,32 @@ class SvMatrixMathNode(bpy.types.Node, SverchCustomTreeNode):
 
         I = []  # collect the inputs from the connected sockets
         for s in filter(lambda s: s.is_linked, self.inputs):
-            I.append([Matrix(m) for m in s.sv_get(default=id_mat)])
+            matrices = s.sv_get(default=id_mat, deepcopy=False, allow_arrays=True)
+            I.append(matrices_to_array(matrices))
 
         operation = self.get_operation()
 
         if self.operation in {"MULTIPLY"}:  # multiple input operations
             if self.prePost == "PRE":  # A op B : keep input order
-                parameters = match_long_repeat(I)
+                parameters = I
             else:  # B op A : reverse input order
-                parameters = match_long_repeat(I[::-1])
+                parameters = I[::-1]
 
-            matrixList = [operation(params) for params in zip(*parameters)]
-
-            matrices = Matrix_listing(matrixList)
-            outputs['C'].sv_set(matrices)
+            outputs['C'].sv_set(operation(parameters))
 
         else:  # single input operations
             parameters = I[0]
-            print("parameters=", parameters)
 
             if self.operation == "BASIS":
-                xList = []
-                yList = []
-                zList = []
-                for a in parameters:
-                    Rx, Ry, Rz = operation(a)
-                    xList.append(Rx)
-                    yList.append(Ry)
-                    zList.append(Rz)
+                xList, yList, zList = operation(parameters)
                 outputs['X'].sv_set(xList)
                 outputs['Y'].sv_set(yList)
                 outputs['Z'].sv_set(zList)
 
-                matrices = Matrix_listing(parameters)
-                outputs['C'].sv_set(matrices)
+                outputs['C'].sv_set(parameters)
 
             else:  # INVERSE / FILTER
-                matrixList = [operation(a) for a in parameters]
-
-                matrices = Matrix_listing(matrixList)
-                outputs['C'].sv_set(matrices)
+                outputs['C'].sv_set(operation(parameters))
 
 
 def register():
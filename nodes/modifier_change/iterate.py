@@ -16,68 +16,35 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
-from mathutils import Vector, Matrix
-from operator import iadd
-from functools import reduce
+import numpy as np
 
 import bpy
 from bpy.props import IntProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import updateNode, match_long_repeat, Matrix_generate, Vector_generate, Vector_degenerate
+from sverchok.data_structure import updateNode, match_long_repeat
+from sverchok.utils.sv_matrix_utils import matrices_to_array, apply_matrices
 
 
-def concat(lists):
-    return reduce(iadd, lists)
-
-
-def Matrix_degenerate(ms):
-    return [[j[:] for j in M] for M in ms]
-
-
-def iterate_matrices(matrices, vertices, edges, faces, count, offset, r=0):
-    result_vertices = []
-    result_edges = []
-    result_faces = []
-
-    x = 0
-    for matrix in matrices:
-        new_vertices, new_edges, new_faces = iterate(matrices, matrix, vertices, edges, faces, count, offset+x, r)
-        x += len(new_vertices)
-        result_vertices.extend(new_vertices)
-        result_edges.extend(new_edges)
-        result_faces.extend(new_faces)
-
-    return result_vertices, result_edges, result_faces
-
-
-def iterate(matrices, matrix, vertices, edges, faces, count, offset, r=0):
-    result_vertices = []
-    result_edges = []
-    result_faces = []
-    if count == 0:
-        return result_vertices, result_edges, result_faces
-
-    new_vertices = [matrix*v for v in vertices]
-    new_edges = [(v1+offset+r, v2+offset+r) for v1, v2 in edges]
-    new_faces = [[v+offset+r for v in face] for face in faces]
-
-    result_vertices.extend(new_vertices)
-    result_edges.extend(new_edges)
-    result_faces.extend(new_faces)
-
-    n = len(new_vertices)
-    rest_vertices, rest_edges, rest_faces = iterate_matrices(matrices, new_vertices, edges, faces, count-1, offset, r+n)
-
-    result_vertices.extend(rest_vertices)
-    result_edges.extend(rest_edges)
-    result_faces.extend(rest_faces)
-
-    return result_vertices, result_edges, result_faces
+def iterated_matrices(matrices, count):
+    """
+    Matrices of all copies made by applying matrices `count' times
+    recursively, in the order the copies are output: each copy is
+    followed by copies made from it. matrices is (N, 4, 4) array.
+    """
+    result = []
 
+    def iterate(matrix, count):
+        if count == 0:
+            return
+        for new_matrix in np.matmul(matrices, matrix):
+            result.append(new_matrix)
+            iterate(new_matrix, count-1)
 
-def shift_edges(edges, offset):
-    return [(v1+offset, v2+offset) for (v1, v2) in edges]
+    iterate(np.identity(4), count)
+    if not result:
+        return np.zeros((0, 4, 4))
+    return np.array(result)
 
 
 def shift_faces(faces, offset):
@@ -86,16 +53,16 @@ def shift_faces(faces, offset):
 
 def calc_matrix_powers(matrices, count):
     if count == 0:
-        return []
+        return np.zeros((0, 4, 4))
     if count == 1:
         return matrices
 
-    result = []
-    result.extend(matrices)
+    powers = calc_matrix_powers(matrices, count-1)
+    result = [matrices]
     for m in matrices:
-        result.extend([m*n for n in calc_matrix_powers(matrices, count-1)])
+        result.append(np.matmul(m, powers))
 
-    return result
+    return np.concatenate(result)
 
 
 class SvIterateNode(bpy.types.Node, SverchCustomTreeNode):
@@ -125,13 +92,12 @@ class SvIterateNode(bpy.types.Node, SverchCustomTreeNode):
         if not self.inputs['Matrix'].is_linked:
             return
 
-        matrices = self.inputs['Matrix'].sv_get()
-        matrices = Matrix_generate(matrices)
+        matrices = self.inputs['Matrix'].sv_get(deepcopy=False, allow_arrays=True)
+        matrices = matrices_to_array(matrices)
         counts = self.inputs['Iterations'].sv_get()[0]
-        vertices_s = self.inputs['Vertices'].sv_get(default=[[]])
-        vertices_s = Vector_generate(vertices_s)
-        edges_s = self.inputs['Edges'].sv_get(default=[[]])
-        faces_s = self.inputs['Polygons'].sv_get(default=[[]])
+        vertices_s = self.inputs['Vertices'].sv_get(default=[[]], deepcopy=False)
+        edges_s = self.inputs['Edges'].sv_get(default=[[]], deepcopy=False)
+        faces_s = self.inputs['Polygons'].sv_get(default=[[]], deepcopy=False)
 
         if self.outputs['Vertices'].is_linked or self.outputs['Matrices'].is_linked:
 
@@ -156,24 +122,25 @@ class SvIterateNode(bpy.types.Node, SverchCustomTreeNode):
 
             offset = 0
             for vertices, edges, faces, count in zip(*meshes):
-                result_vertices.extend(vertices)
-
-                result_edges.extend(shift_edges(edges, offset))
-                result_faces.extend(shift_faces(faces, offset))
-                #result_matrices.extend([Matrix()] * len(matrices))
-                result_matrices.append(Matrix())
-                offset += len(vertices)
-
-                new_vertices, new_edges, new_faces = iterate_matrices(matrices, vertices, edges, faces, count, offset)
-                offset += len(new_vertices)
-                new_matrices = calc_matrix_powers(matrices, count)
-
-                result_vertices.extend(new_vertices)
-                result_edges.extend(new_edges)
-                result_faces.extend(new_faces)
-                result_matrices.extend(new_matrices)
-
-            result_vertices = Vector_degenerate([result_vertices])
+                vertices = np.array(vertices, dtype=np.float64).reshape((-1, 3))
+                n = len(vertices)
+                copies = iterated_matrices(matrices, count)
+                # original mesh goes first, then all the copies
+                result_vertices.append(vertices)
+                result_vertices.append(apply_matrices(copies, vertices).reshape((-1, 3)))
+
+                copy_offsets = offset + n * np.arange(len(copies) + 1)
+                if len(edges):
+                    shifted = np.array(edges)[np.newaxis] + copy_offsets[:, np.newaxis, np.newaxis]
+                    result_edges.extend(shifted.reshape((-1, 2)).tolist())
+                for copy_offset in copy_offsets.tolist():
+                    result_faces.extend(shift_faces(faces, copy_offset))
+
+                result_matrices.append(np.identity(4)[np.newaxis])
+                result_matrices.append(calc_matrix_powers(matrices, count))
+                offset += n * (len(copies) + 1)
+
+            result_vertices = np.concatenate(result_vertices).reshape((1, -1, 3))
             if self.outputs['Vertices'].is_linked:
                 self.outputs['Vertices'].sv_set(result_vertices)
             if self.outputs['Edges'].is_linked:
@@ -181,7 +148,7 @@ class SvIterateNode(bpy.types.Node, SverchCustomTreeNode):
             if self.outputs['Polygons'].is_linked:
                 self.outputs['Polygons'].sv_set([result_faces])
             if self.outputs['Matrices'].is_linked:
-                self.outputs['Matrices'].sv_set(Matrix_degenerate(result_matrices))
+                self.outputs['Matrices'].sv_set(np.concatenate(result_matrices))
 
 
 def register():
@@ -17,34 +17,10 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
-import sys
 from bpy.props import EnumProperty, BoolProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, match_long_cycle as mlr
-from sverchok.utils.csg_core import CSG
-
-
-def Boolean(VA, PA, VB, PB, operation):
-    a = CSG.Obj_from_pydata(VA, PA)
-    b = CSG.Obj_from_pydata(VB, PB)
-    faces = []
-    vertices = []
-    if operation == 'DIFF':
-        polygons = a.subtract(b).toPolygons()
-    elif operation == 'JOIN':
-        polygons = a.union(b).toPolygons()
-    elif operation == 'ITX':
-        polygons = a.intersect(b).toPolygons()
-    for polygon in polygons:
-        indices = []
-        for v in polygon.vertices:
-            pos = [v.pos.x, v.pos.y, v.pos.z]
-            if pos not in vertices:
-                vertices.append(pos)
-            index = vertices.index(pos)
-            indices.append(index)
-        faces.append(indices)
-    return [vertices, faces]
+from sverchok.utils.csg_array import boolean as Boolean, boolean_balanced
 
 
 class SvCSGBooleanNodeMK2(bpy.types.Node, SverchCustomTreeNode):
@@ -84,6 +60,12 @@ class SvCSGBooleanNodeMK2(bpy.types.Node, SverchCustomTreeNode):
                             default=True,
                             update=update_mode)
 
+    balanced = BoolProperty(name="balanced",
+                            description="combine nested objects pairwise instead of one by one, "
+                                        "faster for many objects",
+                            default=False,
+                            update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', 'Verts A')
         self.inputs.new('StringsSocket',  'Polys A')
@@ -101,6 +83,8 @@ class SvCSGBooleanNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         col.prop(self, "nest_objs", toggle=True)
         if self.nest_objs:
             col.prop(self, "out_last", toggle=True)
+            if self.out_last:
+                col.prop(self, "balanced", toggle=True)
 
     def process(self):
         OutV, OutP = self.outputs
@@ -109,13 +93,15 @@ class SvCSGBooleanNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         VertA, PolA, VertB, PolB, VertN, PolN = self.inputs
         SMode = self.selected_mode
         out = []
-        recursionlimit = sys.getrecursionlimit()
-        sys.setrecursionlimit(10000)
         if not self.nest_objs:
-            for v1, p1, v2, p2 in zip(*mlr([VertA.sv_get(), PolA.sv_get(), VertB.sv_get(), PolB.sv_get()])):
+            for v1, p1, v2, p2 in zip(*mlr([VertA.sv_get(deepcopy=False), PolA.sv_get(deepcopy=False),
+                                               VertB.sv_get(deepcopy=False), PolB.sv_get(deepcopy=False)])):
                 out.append(Boolean(v1, p1, v2, p2, SMode))
+        elif self.out_last and self.balanced:
+            vnest, pnest = VertN.sv_get(deepcopy=False), PolN.sv_get(deepcopy=False)
+            out.append(boolean_balanced(list(zip(vnest, pnest)), SMode))
         else:
-            vnest, pnest = VertN.sv_get(), PolN.sv_get()
+            vnest, pnest = VertN.sv_get(deepcopy=False), PolN.sv_get(deepcopy=False)
             First = Boolean(vnest[0], pnest[0], vnest[1], pnest[1], SMode)
             if not self.out_last:
                 out.append(First)
@@ -126,7 +112,6 @@ class SvCSGBooleanNodeMK2(bpy.types.Node, SverchCustomTreeNode):
                 for i in range(2, len(vnest)):
                     First = Boolean(First[0], First[1], vnest[i], pnest[i], SMode)
                 out.append(First)
-        sys.setrecursionlimit(recursionlimit)
         OutV.sv_set([i[0] for i in out])
         if OutP.is_linked:
             OutP.sv_set([i[1] for i in out])
@@ -17,11 +17,19 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
-from bpy.props import FloatProperty
+from bpy.props import FloatProperty, BoolProperty
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
-from sverchok.utils.voronoi import Site, computeVoronoiDiagram, computeDelaunayTriangulation
+from sverchok.utils.sv_jagged_array import SvJaggedArray
+from sverchok.utils.sv_mesh_utils import split_by_offsets
+from sverchok.utils.voronoi_array import (
+    delaunay_triangles, voronoi_edges, voronoi_cells, polygon_edges, bounding_box)
+
+
+def to_3d(vertices):
+    return np.column_stack((vertices, np.zeros(len(vertices))))
 
 
 class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
@@ -35,16 +43,29 @@ class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
         default=1.0, min=0,
         options={'ANIMATABLE'}, update=updateNode)
 
+    output_cells = BoolProperty(
+        name='Cells',
+        description='Output closed cells clipped to bounds (convex polygon, or bounding box of points '
+                    'enlarged by clipping distance) instead of edges of the diagram',
+        default=False, update=updateNode)
+
+    output_numpy = BoolProperty(
+        name='NumPy',
+        description='Output vertices and edges as NumPy arrays instead of lists',
+        default=False, update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', "Vertices")
-        # self.inputs.new('StringsSocket', "Clipping")
+        self.inputs.new('VerticesSocket', "Bounds")
         self.outputs.new('VerticesSocket', "Vertices")
         self.outputs.new('StringsSocket', "Edges")
-        # Polygon output does not work right now. Should be fixed
-        # self.outputs.new('StringsSocket', "Polygons")
+        self.outputs.new('StringsSocket', "Polygons")
 
     def draw_buttons(self, context, layout):
         layout.prop(self, "clip", text="Clipping")
+        row = layout.row(align=True)
+        row.prop(self, "output_cells", toggle=True)
+        row.prop(self, "output_numpy", text="NP", toggle=True)
 
     def process(self):
 
@@ -54,57 +75,47 @@ class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
         if not self.outputs['Vertices'].is_linked:
             return
 
-        points_in = self.inputs['Vertices'].sv_get()
+        points_in = self.inputs['Vertices'].sv_get(deepcopy=False)
+        bounds_in = []
+        if 'Bounds' in self.inputs and self.inputs['Bounds'].is_linked:
+            bounds_in = self.inputs['Bounds'].sv_get(deepcopy=False)
 
         pts_out = []
-        # polys_out = []
         edges_out = []
-        for obj in points_in:
-            pt_list = []
-            x_max = obj[0][0]
-            x_min = obj[0][0]
-            y_min = obj[0][1]
-            y_max = obj[0][1]
-            # creates points in format for voronoi library, throwing away z
-            for pt in obj:
-                x, y = pt[0], pt[1]
-                x_max = max(x, x_max)
-                x_min = min(x, x_min)
-                y_max = max(y, y_max)
-                y_min = min(x, x_min)
-                pt_list.append(Site(pt[0], pt[1]))
-
-            res = computeVoronoiDiagram(pt_list)
-
-            edges = res[2]
-            delta = self.clip
-            x_max = x_max + delta
-            y_max = y_max + delta
-
-            x_min = x_min - delta
-            y_min = y_min - delta
-
-            # clipping box to bounding box.
-            pts_tmp = []
-            for pt in res[0]:
-                x, y = pt[0], pt[1]
-                if x < x_min:
-                    x = x_min
-                if x > x_max:
-                    x = x_max
-
-                if y < y_min:
-                    y = y_min
-                if y > y_max:
-                    y = y_max
-                pts_tmp.append((x, y, 0))
-
-            pts_out.append(pts_tmp)
-            edges_out.append([(edge[1], edge[2]) for edge in edges if -1 not in edge])
+        polys_out = []
+        for i, obj in enumerate(points_in):
+            if not len(obj):
+                pts_out.append(np.zeros((0, 3)))
+                edges_out.append(np.zeros((0, 2), dtype=np.int64))
+                polys_out.append([])
+                continue
+            points = np.asarray(obj, dtype=np.float64).reshape((len(obj), -1))[:, :2]
+            if self.output_cells:
+                if bounds_in:
+                    bounds = bounds_in[min(i, len(bounds_in) - 1)]
+                else:
+                    bounds = bounding_box(points, self.clip)
+                vertices, loops, offsets, _ = voronoi_cells(points, bounds)
+                edges = polygon_edges(loops, offsets, len(vertices))
+                polys_out.append(split_by_offsets(loops, offsets))
+            else:
+                vertices, edges = voronoi_edges(points)
+                # clipping box to bounding box.
+                low, _, high, _ = bounding_box(points, self.clip)
+                vertices = np.clip(vertices, low, high)
+                polys_out.append([])
+            pts_out.append(to_3d(vertices))
+            edges_out.append(edges)
 
         # outputs
-        self.outputs['Vertices'].sv_set(pts_out)
-        self.outputs['Edges'].sv_set(edges_out)
+        if self.output_numpy and pts_out:
+            self.outputs['Vertices'].sv_set(SvJaggedArray.from_arrays(pts_out))
+            self.outputs['Edges'].sv_set(SvJaggedArray.from_arrays(edges_out))
+        else:
+            self.outputs['Vertices'].sv_set([vertices.tolist() for vertices in pts_out])
+            self.outputs['Edges'].sv_set([edges.tolist() for edges in edges_out])
+        if 'Polygons' in self.outputs:
+            self.outputs['Polygons'].sv_set(polys_out)
 
 
 # computeDelaunayTriangulation
@@ -114,11 +125,19 @@ class DelaunayTriangulation2DNode(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Delaunay 2D'
     bl_icon = 'OUTLINER_OB_EMPTY'
 
+    output_numpy = BoolProperty(
+        name='NumPy',
+        description='Output triangles as NumPy array instead of lists',
+        default=False, update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', "Vertices")
         # self.outputs.new('StringsSocket', "Edges")
         self.outputs.new('StringsSocket', "Polygons")
 
+    def draw_buttons(self, context, layout):
+        layout.prop(self, "output_numpy", text="NP", toggle=True)
+
     def process(self):
 
         if not self.inputs['Vertices'].is_linked:
@@ -126,17 +145,13 @@ class DelaunayTriangulation2DNode(bpy.types.Node, SverchCustomTreeNode):
         if not self.outputs['Polygons'].is_linked:
             return
 
-        tris_out = []
-        points_in = []
-        points_in = self.inputs['Vertices'].sv_get()
-
-        for obj in points_in:
-            pt_list = [Site(pt[0], pt[1]) for pt in obj]
-            res = computeDelaunayTriangulation(pt_list)
-            tris_out.append([tri for tri in res if -1 not in tri])
-
+        points_in = self.inputs['Vertices'].sv_get(deepcopy=False)
+        tris_out = [delaunay_triangles(obj) for obj in points_in]
 
-        self.outputs['Polygons'].sv_set(tris_out)
+        if self.output_numpy and tris_out:
+            self.outputs['Polygons'].sv_set(SvJaggedArray.from_arrays(tris_out))
+        else:
+            self.outputs['Polygons'].sv_set([tris.tolist() for tris in tris_out])
 
 
 def register():
@@ -17,6 +17,8 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import parser
+from functools import lru_cache
+from itertools import chain
 from math import (
     acos, acosh, asin, asinh, atan, atan2,
     atanh, ceil, copysign, cos, cosh, degrees, e,
@@ -33,7 +35,13 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (
     updateNode, multi_socket, changable_sockets,
     dataSpoil, dataCorrect, levelsOflist)
+from sverchok.utils.sv_formula import compile_formula
+from sverchok.utils.sv_vectorize import as_numeric
 
+@lru_cache(maxsize=256)
+def get_compiled_formula(formula):
+    ''' formula -> (code for eval(), VectorFormula or None) '''
+    return parser.expr(formula).compile(), compile_formula(formula)
 
 
 class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
@@ -84,7 +92,7 @@ class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
                 if socket.is_linked:
                     list_mult.append(socket.sv_get())
 
-        code_formula = parser.expr(self.formula).compile()
+        code_formula, vector_formula = get_compiled_formula(self.formula)
         # finding nested levels, make equal nastedness (canonical 0,1,2,3)
         levels = [levelsOflist(vecs)]
         for n in list_mult:
@@ -103,7 +111,11 @@ class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
                 list_temp = dataSpoil([list_mult[i-1]], diflevel-1)
                 list_mult[i-1] = dataCorrect(list_temp, nominal_dept=2)
 
-        r = self.inte(vecs, code_formula, list_mult, 3)
+        r = None
+        if vector_formula is not None:
+            r = self.inte_vectorized(vecs, vector_formula, list_mult)
+        if r is None:
+            r = self.inte(vecs, code_formula, list_mult, 3)
         result = dataCorrect(r, nominal_dept=min((levels[0]-1), 2))
 
         self.outputs['Result'].sv_set(result)
@@ -124,26 +136,44 @@ class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
         return out
 
 
-    def calc_item(self, x, formula, nlist, j, k, q):
-        X = x
-        n = []
-        a = []
-        sv_Vars = {} #is dead for long time, but not sure about this
-        list_vars = [w for w in sv_Vars.keys()]
-        for v in list_vars:
-            if v[:6] == 'sv_typ':
-                continue
-            abra = sv_Vars[v]
-            exec(str(v)+'=[]')
-            for i, aa_abra in enumerate(abra):
-                eva = str(v)+'.append('+str(aa_abra)+')'
-                eval(eva)
+    def inte_vectorized(self, list_x, formula, list_n):
+        ''' calc all items at once, returns None if it can not be done with numpy '''
+        new_list_n = self.normalize(list_n, list_x)
+        try:
+            lengths = [len(x_lis) for x_obj in list_x for x_lis in x_obj]
+            x = as_numeric(list(chain.from_iterable(chain.from_iterable(list_x))))
+            ns = []
+            for ne in new_list_n:
+                items = chain.from_iterable(
+                            n_lis[:len(x_lis)]
+                            for x_obj, n_obj in zip(list_x, ne)
+                            for x_lis, n_lis in zip(x_obj, n_obj))
+                ns.append(as_numeric(list(items)))
+        except TypeError:
+            return None
+        if x is None or x.ndim != 1 or any(n is None or n.shape != x.shape for n in ns):
+            return None
+
+        try:
+            result = formula(x, ns).tolist()
+        except (FloatingPointError, ValueError, TypeError, IndexError, OverflowError):
+            return None
 
-        for nitem in nlist:
-            n.append(nitem[j][k][q])
-        N = n
-        return eval(formula)
+        out = []
+        start = 0
+        lengths = iter(lengths)
+        for x_obj in list_x:
+            out1 = []
+            for x_lis in x_obj:
+                end = start + next(lengths)
+                out1.append(result[start:end])
+                start = end
+            out.append(out1)
+        return out
 
+    def calc_item(self, x, formula, nlist, j, k, q):
+        n = [nitem[j][k][q] for nitem in nlist]
+        return eval(formula, globals(), {'x': x, 'X': x, 'n': n, 'N': n})
 
     def normalize(self, listN, listX):
         Lennox = len(listX)
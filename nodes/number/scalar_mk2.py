@@ -21,11 +21,14 @@ from itertools import zip_longest
 
 import bpy
 from bpy.props import EnumProperty, FloatProperty, IntProperty
+import numpy as np
 
 from sverchok.ui.sv_icons import custom_icon
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 from sverchok.utils.sv_itertools import (recurse_fx, recurse_fxy)
+from sverchok.utils.sv_vectorize import numpy_fx, numpy_fxy
+from sverchok.utils.sv_jagged_array import is_array_payload, payload_to_lists
 # pylint: disable=C0326
 
 # Rules for modification:
@@ -85,9 +88,77 @@ func_dict = {
     "THETA TAU":   (140, lambda x: pi * 2 * ((x-1) / x),   ('s s'), "tau * (x-1 / x)")
 }
 
+def to_int(x):
+    # math.ceil, floor and round return integers
+    if not np.isfinite(x).all():
+        raise OverflowError("cannot convert infinity or NaN to integer")
+    return x.astype(np.int64)
+
+def same_kind(func):
+    # python min and max return one of the arguments as it is,
+    # numpy would turn integer winners into floats
+    def wrapped(x, y):
+        if x.dtype.kind != y.dtype.kind:
+            raise TypeError("integers and floats are mixed")
+        return func(x, y)
+    return wrapped
+
+# numpy versions of functions, used to process all numbers at once;
+# modes missing here are always processed by python functions
+numpy_func_dict = {
+    "SINE":        np.sin,
+    "COSINE":      np.cos,
+    "TANGENT":     np.tan,
+    "ARCSINE":     np.arcsin,
+    "ARCCOSINE":   np.arccos,
+    "ARCTANGENT":  np.arctan,
+    "ACOSH":       np.arccosh,
+    "ASINH":       np.arcsinh,
+    "ATANH":       np.arctanh,
+    "COSH":        np.cosh,
+    "SINH":        np.sinh,
+    "TANH":        np.tanh,
+    "DEGREES":     np.degrees,
+    "RADIANS":     np.radians,
+    "ADD":         np.add,
+    "SUB":         np.subtract,
+    "MUL":         np.multiply,
+    "DIV":         np.true_divide,
+    "INTDIV":      np.floor_divide,
+    "SQRT":        lambda x: np.sqrt(np.fabs(x)),
+    "EXP":         np.exp,
+    "POW":         np.power,
+    "POW2":        lambda x: x*x,
+    "LN":          np.log,
+    "LOG10":       np.log10,
+    "LOG1P":       np.log1p,
+    "ABS":         np.fabs,
+    "NEG":         np.negative,
+    "CEIL":        lambda x: to_int(np.ceil(x)) if x.dtype.kind == 'f' else x,
+    "FLOOR":       lambda x: to_int(np.floor(x)) if x.dtype.kind == 'f' else x,
+    "MIN":         same_kind(np.minimum),
+    "MAX":         same_kind(np.maximum),
+    "ROUND":       lambda x: to_int(np.round(x)) if x.dtype.kind == 'f' else x,
+    "FMOD":        lambda x, y: np.fmod(x, y, dtype=np.float64),
+    "MODULO":      np.mod,
+    "PI":          lambda x: pi * x,
+    "TAU":         lambda x: pi * 2 * x,
+    "E":           lambda x: e * x,
+    "PHI":         lambda x: 1.61803398875 * x,
+    "+1":          lambda x: x + 1,
+    "-1":          lambda x: x - 1,
+    "*2":          lambda x: x * 2,
+    "/2":          lambda x: x / 2,
+    "RECIP":       lambda x: 1 / x,
+    "THETA TAU":   lambda x: pi * 2 * ((x-1) / x)
+}
+
 def func_from_mode(mode):
     return func_dict[mode][1]
 
+def to_lists(data):
+    return payload_to_lists(data, copy=False) if is_array_payload(data) else data
+
 def generate_node_items():
     prefilter = {k: v for k, v in func_dict.items() if not k.startswith('---')}
     return [(k, descr, '', ident) for k, (ident, _, _, descr) in sorted(prefilter.items(), key=lambda k: k[1][0])]
@@ -110,6 +181,8 @@ class SvScalarMathNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvScalarMathNodeMK2'
     bl_label = 'Math MK2'
     sv_icon = 'SV_FUNCTION'
+    sv_thread_safe = True
+    sv_batchable = True
 
     def mode_change(self, context):
         self.update_sockets()
@@ -181,26 +254,45 @@ class SvScalarMathNodeMK2(bpy.types.Node, SverchCustomTreeNode):
 
 
     def process(self):
+        compute = self.sv_prepare()
+        if compute:
+            self.sv_apply(compute())
+
+    def sv_prepare(self):
         signature = (len(self.inputs), len(self.outputs))
 
-        x = self.inputs['x'].sv_get(deepcopy=False)
+        x = self.inputs['x'].sv_get(deepcopy=False, allow_arrays=True)
         if signature == (2, 1):
-            y = self.inputs['y'].sv_get(deepcopy=False)
+            y = self.inputs['y'].sv_get(deepcopy=False, allow_arrays=True)
 
-        if self.outputs[0].is_linked:
+        if not self.outputs[0].is_linked:
+            return None
+
+        names = [socket.name for socket in self.outputs]
+        current_func = func_from_mode(self.current_op)
+        numpy_func = numpy_func_dict.get(self.current_op)
+
+        def compute():
             result = []
-            current_func = func_from_mode(self.current_op)
             if signature == (1, 1):
-                result = recurse_fx(x, current_func)
+                result = numpy_func and numpy_fx(x, numpy_func)
+                if result is None:
+                    result = recurse_fx(to_lists(x), current_func)
             elif signature == (2, 1):
-                result = recurse_fxy(x, y, current_func)
+                result = numpy_func and numpy_fxy(x, y, numpy_func)
+                if result is None:
+                    result = recurse_fxy(to_lists(x), to_lists(y), current_func)
             elif signature == (1, 2):
                 # special case at the moment
-                result = recurse_fx(x, sin)
-                result2 = recurse_fx(x, cos)
-                self.outputs[1].sv_set(result2)
-
-            self.outputs[0].sv_set(result)
+                result = numpy_fx(x, np.sin)
+                result2 = numpy_fx(x, np.cos)
+                if result is None or result2 is None:
+                    result = recurse_fx(to_lists(x), sin)
+                    result2 = recurse_fx(to_lists(x), cos)
+                return {names[0]: result, names[1]: result2}
+            return {names[0]: result}
+
+        return compute
 
 
 
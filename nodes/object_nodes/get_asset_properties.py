@@ -66,6 +66,7 @@ class SvGetAssetProperties(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvGetAssetProperties'
     bl_label = 'Object ID Selector'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_uses_scene_data = True
 
     def pre_updateNode(self, context):
         ''' must rebuild for each update'''
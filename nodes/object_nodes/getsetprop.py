@@ -149,6 +149,7 @@ class SvGetPropNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvGetPropNode'
     bl_label = 'Get property'
     bl_icon = 'FORCE_VORTEX'
+    sv_incremental = False
 
     bad_prop = BoolProperty(default=False)
 
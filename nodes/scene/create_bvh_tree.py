@@ -29,6 +29,7 @@ class SvBVHtreeNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvBVHtreeNode'
     bl_label = 'BVH Tree In'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_uses_scene_data = True
 
     def mode_change(self, context):
         inputs = self.inputs
@@ -16,17 +16,17 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
-import math
 from random import random
 
 import bpy
 from bpy.props import StringProperty, BoolProperty, EnumProperty
 import bmesh
-from mathutils import Vector
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
-from sverchok.utils.sv_viewer_utils import matrix_sanitizer
+from sverchok.utils.sv_matrix_utils import matrices_to_array, sanitize_matrices, dupli_face_triangles
+from sverchok.utils.sv_mesh_utils import write_mesh_points, write_mesh_triangles
 
 
 def wipe_object(ob):
@@ -40,6 +40,7 @@ class SvDupliInstancesMK4(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvDupliInstancesMK4'
     bl_label = 'Dupli instancer mk4'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_uses_scene_data = True
 
     def set_child_quota(self, context):
         # was used for string child property
@@ -78,18 +79,16 @@ class SvDupliInstancesMK4(bpy.types.Node, SverchCustomTreeNode):
     def process(self):
         #objectsP = self.inputs['parent'].sv_get(default=None)
         objectsC = self.inputs['child'].sv_get()
-        transforms = self.inputs['matr/vert'].sv_get()
+        transforms = self.inputs['matr/vert'].sv_get(deepcopy=False, allow_arrays=True)
         objects = bpy.data.objects
         #if any([x.name == self.name_node_generated_parent for x in objects]):
         ob = objects.get(self.name_node_generated_parent)
         #self.name_node_generated_parent = ob.name
 
-        if ob:
-            wipe_object(ob)
-
         # minimum requirements.
-        if (not transforms) and (not objectsC):
+        if (not len(transforms)) and (not objectsC):
             if ob:
+                wipe_object(ob)
                 ob.dupli_type = 'NONE'
             return
 
@@ -99,50 +98,33 @@ class SvDupliInstancesMK4(bpy.types.Node, SverchCustomTreeNode):
             ob = bpy.data.objects.new(name, mesh)
             bpy.context.scene.objects.link(ob)
 
-        # at this point there's a reference to an ob, and the mesh is empty.
+        # at this point there's a reference to an ob; its mesh is rewritten
+        # as a whole, or only vertex locations are updated if the number
+        # of instances is the same as last time.
         child = self.inputs['child'].sv_get()[0]
-        #print('проверка',child)
-
 
-        if transforms and transforms[0]:
-            # -- this mode will face duplicate --
-            # i expect this can be done faster using numpy
-            # please view this only as exploratory
+        if len(transforms) and len(transforms[0]):
 
             if self.inputs['matr/vert'].links[0].from_socket.bl_idname == 'VerticesSocket':
-                transforms = transforms[0]
                 # -- this mode will vertex duplicate --
-                ob.data.from_pydata(transforms, [], [])
+                vertices = np.asarray(transforms[0], dtype=np.float64).reshape((-1, 3))
+                write_mesh_points(ob.data, vertices)
                 ob.dupli_type = 'VERTS'
                 child.parent = ob
 
             elif self.inputs['matr/vert'].links[0].from_socket.bl_idname == 'MatrixSocket':
-                sin, cos = math.sin, math.cos
-
-                theta = 2 * math.pi / 3
-                thetb = theta * 2
-                ofs = 0.5 * math.pi + theta
-
-                A = Vector((cos(0 + ofs), sin(0 + ofs), 0))
-                B = Vector((cos(theta + ofs), sin(theta + ofs), 0))
-                C = Vector((cos(thetb + ofs), sin(thetb + ofs), 0))
-
-                verts = []
-                add_verts = verts.extend
-
-                num_matrices = len(transforms)
-                for m in transforms:
-                    M = matrix_sanitizer(m)
-                    add_verts([(M * A)[:], (M * B)[:], (M * C)[:]])
-
-                strides = range(0, num_matrices * 3, 3)
-                faces = [[i, i + 1, i + 2] for i in strides]
-
-                ob.data.from_pydata(verts, [], faces)
+                # -- this mode will face duplicate --
+                matrices = sanitize_matrices(matrices_to_array(transforms))
+                write_mesh_triangles(ob.data, dupli_face_triangles(matrices))
                 ob.dupli_type = 'FACES'
                 ob.use_dupli_faces_scale = self.scale
                 child.parent = ob
 
+            else:
+                wipe_object(ob)
+        else:
+            wipe_object(ob)
+
 
 def register():
     bpy.utils.register_class(SvDupliInstancesMK4)
@@ -26,6 +26,7 @@ class SvFrameInfoNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvFrameInfoNodeMK2'
     bl_label = 'Frame info'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_incremental = False
 
     def sv_init(self, context):
         outputs = self.outputs
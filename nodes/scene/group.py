@@ -162,6 +162,7 @@ class SvGroupNode(bpy.types.Node, SverchCustomTreeNode, StoreSockets):
     bl_idname = 'SvGroupNode'
     bl_label = 'Group'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_uses_scene_data = True
 
     group_name = StringProperty()
 
@@ -242,6 +243,7 @@ class SvIterationNode(bpy.types.Node, SverchCustomTreeNode, StoreSockets):
     bl_idname = 'SvIterationNode'
     bl_label = 'Group Inputs'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_uses_scene_data = True
 
     iter_count = IntProperty(name="Count")
     group_name = StringProperty()
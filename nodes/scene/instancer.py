@@ -17,6 +17,7 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import random
+from math import sqrt
 
 import bpy
 import bmesh
@@ -26,6 +27,9 @@ from bpy.props import BoolProperty, FloatVectorProperty, StringProperty, EnumPro
 
 from sverchok.node_tree import SverchCustomTreeNode, MatrixSocket
 from sverchok.data_structure import dataCorrect, updateNode
+from sverchok.utils.sv_viewer_utils import register_child, forget_children, get_registered_children
+from sverchok.utils.sv_matrix_utils import matrices_to_array, sanitize_matrices, dupli_face_triangles
+from sverchok.utils.sv_mesh_utils import write_mesh_triangles
 
 
 def get_random_init():
@@ -39,12 +43,13 @@ def get_random_init():
     return random.choice(greek_alphabet)
 
 
-def make_or_update_instance(node, obj_name, matrix):
+def make_or_update_instance(node, obj_index, matrix):
     context = bpy.context
     scene = context.scene
     meshes = bpy.data.meshes
     objects = bpy.data.objects
     mesh_name = node.mesh_to_clone
+    obj_name = node.basemesh_name + "_" + str(obj_index)
 
     if not mesh_name:
         return
@@ -55,6 +60,7 @@ def make_or_update_instance(node, obj_name, matrix):
         mesh = meshes.get(mesh_name)
         sv_object = objects.new(obj_name, mesh)
         scene.objects.link(sv_object)
+    register_child(node, obj_index, sv_object)
 
     # apply matrices
     if matrix:
@@ -62,6 +68,62 @@ def make_or_update_instance(node, obj_name, matrix):
         sv_object.data.update()   # for some reason this _is_ necessary.
 
 
+def dupli_names(node):
+    """names of the carrier object (and its mesh) and of the instanced object"""
+    return node.basemesh_name + "_dupli", node.basemesh_name + "_dupli_instance"
+
+
+def make_or_update_dupli_faces(node, matrices):
+    """
+    Instance the mesh by faces of one carrier object, with one triangle
+    per matrix; all matrices are written into the carrier mesh at once.
+    Returns the carrier and the instanced object.
+    """
+    scene = bpy.context.scene
+    meshes = bpy.data.meshes
+    objects = bpy.data.objects
+    mesh = meshes.get(node.mesh_to_clone)
+
+    if not mesh:
+        return []
+
+    carrier_name, instance_name = dupli_names(node)
+    carrier = objects.get(carrier_name)
+    if not carrier:
+        carrier = objects.new(carrier_name, meshes.new(carrier_name))
+        scene.objects.link(carrier)
+        carrier.dupli_type = 'FACES'
+        carrier.use_dupli_faces_scale = True
+        # instances are scaled by sqrt of area of faces, which is 3*sqrt(3)/4 for unit scale
+        carrier.dupli_faces_scale = 1.0 / sqrt(3 * sqrt(3) / 4)
+
+    instance = objects.get(instance_name)
+    if not instance:
+        instance = objects.new(instance_name, mesh)
+        scene.objects.link(instance)
+    elif instance.data != mesh:
+        instance.data = mesh
+    if instance.parent != carrier:
+        instance.parent = carrier
+
+    matrices = sanitize_matrices(matrices_to_array(matrices))
+    write_mesh_triangles(carrier.data, dupli_face_triangles(matrices))
+    return [carrier, instance]
+
+
+def remove_dupli_faces(node):
+    objects = bpy.data.objects
+    scene = bpy.context.scene
+    for name in dupli_names(node):
+        obj = objects.get(name)
+        if obj:
+            scene.objects.unlink(obj)
+            objects.remove(obj)
+    carrier_mesh = bpy.data.meshes.get(dupli_names(node)[0])
+    if carrier_mesh and not carrier_mesh.users:
+        bpy.data.meshes.remove(carrier_mesh)
+
+
 class SvInstancerOp(bpy.types.Operator):
 
     bl_idname = "node.instancer_config"
@@ -89,6 +151,7 @@ class SvInstancerNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvInstancerNode'
     bl_label = 'Mesh instancer'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_uses_scene_data = True
 
     def obj_available(self, context):
         if not bpy.data.meshes:
@@ -107,6 +170,18 @@ class SvInstancerNode(bpy.types.Node, SverchCustomTreeNode):
 
     grouping = BoolProperty(default=False, update=updateNode)
 
+    instancing_options = [
+        ("OBJECTS", "Objects", "Make one object for each matrix", 0),
+        ("FACES", "Faces", "Duplicate one object by faces of a carrier mesh, "
+                           "much faster for many matrices; scale is uniform only", 1)
+    ]
+
+    instancing = EnumProperty(
+        items=instancing_options,
+        description="How to make instances",
+        default="OBJECTS",
+        update=updateNode)
+
     activate = BoolProperty(
         default=True,
         name='Show', description='Activate node?',
@@ -124,6 +199,8 @@ class SvInstancerNode(bpy.types.Node, SverchCustomTreeNode):
 
     has_instance = BoolProperty(default=False)
 
+    n_id = StringProperty(default='')
+
     def sv_init(self, context):
         self.inputs.new('MatrixSocket', 'matrix', 'matrix')
 
@@ -131,6 +208,8 @@ class SvInstancerNode(bpy.types.Node, SverchCustomTreeNode):
         row = layout.row(align=True)
         row.prop(self, "activate", text="Update")
         row.prop(self, "grouping", text="Grouped")
+        row = layout.row(align=True)
+        row.prop(self, "instancing", expand=True)
 
         cfg = "node.instancer_config"
         if not self.has_instance:
@@ -184,50 +263,60 @@ class SvInstancerNode(bpy.types.Node, SverchCustomTreeNode):
         if not matrices:
             return
 
-        # we have matrices, we can process, go go go!
-        for obj_index, matrix in enumerate(matrices):
-            obj_name = self.basemesh_name + "_" + str(obj_index)
-            make_or_update_instance(self, obj_name, matrix)
+        if self.instancing == 'FACES':
+            self.remove_non_updated_objects(-1, self.basemesh_name)
+            objs = make_or_update_dupli_faces(self, matrices)
+        else:
+            remove_dupli_faces(self)
+
+            # we have matrices, we can process, go go go!
+            for obj_index, matrix in enumerate(matrices):
+                make_or_update_instance(self, obj_index, matrix)
 
-        # obj_index is now the last index found in matrices
-        self.remove_non_updated_objects(obj_index, self.basemesh_name)
+            # obj_index is now the last index found in matrices
+            self.remove_non_updated_objects(obj_index, self.basemesh_name)
+            objs = get_registered_children(self, self.find_children).values()
 
         if self.grouping:
-            self.to_group()
+            self.to_group(objs)
         else:
             self.ungroup()
 
-    def remove_non_updated_objects(self, obj_index, _name):
-        meshes = bpy.data.meshes
-        objects = bpy.data.objects
+    def find_children(self):
+        prefix = self.basemesh_name + "_"
+        for obj in bpy.data.objects:
+            if obj.type == 'MESH' and obj.name.startswith(prefix):
+                suffix = obj.name[len(prefix):]
+                if suffix.isdigit():
+                    yield int(suffix), obj
 
-        objs = [obj for obj in objects if obj.type == 'MESH']
-        objs = [obj for obj in objs if obj.name.startswith(_name)]
-        objs = [obj.name for obj in objs if int(obj.name.split("_")[-1]) > obj_index]
-        if not objs:
+    def remove_non_updated_objects(self, obj_index, _name):
+        children = get_registered_children(self, self.find_children)
+        indices = [idx for idx in children if idx > obj_index]
+        if not indices:
             return
 
         # select and finally remove all excess objects
+        objects = bpy.data.objects
         scene = bpy.context.scene  # fix for render mode is needed?
 
-        for object_name in objs:
-            obj = objects[object_name]
+        for idx in indices:
+            obj = children[idx]
             obj.hide_select = False  # needed?
             scene.objects.unlink(obj)
             objects.remove(obj)
+        forget_children(self, indices)
 
-    def to_group(self):
+    def to_group(self, objs):
 
-        objs = bpy.data.objects
         if not (self.basemesh_name in bpy.data.groups):
             newgroup = bpy.data.groups.new(self.basemesh_name)
         else:
             newgroup = bpy.data.groups[self.basemesh_name]
 
         for obj in objs:
-            if self.basemesh_name in obj.name:
-                if obj.name not in newgroup.objects:
-                    newgroup.objects.link(obj)
+            if obj.name not in newgroup.objects:
+                newgroup.objects.link(obj)
 
     def ungroup(self):
         g = bpy.data.groups.get(self.basemesh_name)
@@ -237,9 +326,14 @@ class SvInstancerNode(bpy.types.Node, SverchCustomTreeNode):
     def update_socket(self, context):
         self.update()
 
+    def copy(self, node):
+        self.n_id = ''
+
     def free(self):
         self.remove_non_updated_objects(-1, self.basemesh_name)
+        remove_dupli_faces(self)
         self.ungroup()
+        forget_children(self)
 
 
 def register():
@@ -46,6 +46,7 @@ class SvObjInLite(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvObjInLite'
     bl_label = 'Objects in Lite'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_uses_scene_data = True
 
     modifiers = BoolProperty(
         description='Apply modifier geometry to import (original untouched)',
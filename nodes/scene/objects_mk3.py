@@ -17,14 +17,72 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+from bpy.app.handlers import persistent
 from bpy.props import BoolProperty, StringProperty
 import bmesh
+import numpy as np
 
 import sverchok
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import updateNode
+from sverchok.core.socket_data import sv_deep_copy
+from sverchok.data_structure import updateNode, node_id
 from sverchok.utils.context_managers import hard_freeze
 from sverchok.utils.sv_bmesh_utils import pydata_from_bmesh
+from sverchok.utils.sv_mesh_utils import read_mesh_arrays, split_by_offsets
+from sverchok.utils.sv_jagged_array import SvJaggedArray
+
+# geometry read from objects, {node id: {object name: (signature, mesh data)}}
+mesh_cache = {}
+
+# counts depsgraph updates of mesh datablocks read by nodes, {mesh name: version}
+mesh_versions = {}
+
+
+def tracked_mesh_names():
+    """Names of meshes which have geometry in mesh_cache,
+    its signatures are (node settings, mesh_signature())"""
+    return {signature[1][0] for cache in mesh_cache.values() for signature, _ in cache.values()}
+
+
+@persistent
+def track_updated_meshes(scene):
+    """Bump version of every cached mesh Blender flagged as updated in this tick"""
+    meshes = bpy.data.meshes
+    if not (meshes.is_updated or bpy.data.shape_keys.is_updated):
+        return
+    for name in tracked_mesh_names():
+        mesh = meshes.get(name)
+        if not mesh:
+            continue
+        keys = mesh.shape_keys
+        if mesh.is_updated or mesh.is_updated_data or (keys and keys.is_updated):
+            mesh_versions[name] = mesh_versions.get(name, 0) + 1
+
+
+def mesh_signature(obj):
+    """
+    Changes when the base mesh of the object changes. Only used without
+    modifiers: to_mesh() then returns the base mesh with shape keys applied,
+    so the update flags of the mesh datablock and values of the keys tell
+    whether it has to be read again. Sizes catch scripts that rebuild
+    a mesh without tagging it. None if the mesh should not be cached.
+    """
+    mesh = obj.data
+    if mesh.animation_data:
+        # animated properties of the mesh don't tag it as updated
+        return None
+    signature = (mesh.name, mesh_versions.get(mesh.name, 0),
+                 len(mesh.vertices), len(mesh.edges), len(mesh.loops), len(mesh.polygons))
+    keys = mesh.shape_keys
+    if keys:
+        signature += (obj.active_shape_key_index, obj.show_only_shape_key,
+                      tuple((k.value, k.mute) for k in keys.key_blocks))
+    return signature
+
+
+def copy_mesh_data(data):
+    """Lists are handed downstream, keep the cached ones untouched"""
+    return tuple(item if isinstance(item, np.ndarray) else sv_deep_copy(item) for item in data)
 
 
 class SvOB3Callback(bpy.types.Operator):
@@ -57,6 +115,7 @@ class SvObjectsNodeMK3(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvObjectsNodeMK3'
     bl_label = 'Objects in mk3'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_incremental = False
 
     def hide_show_versgroups(self, context):
         outs = self.outputs
@@ -86,6 +145,13 @@ class SvObjectsNodeMK3(bpy.types.Node, SverchCustomTreeNode):
         description='sorting inserted objects by names',
         default=True, update=updateNode)
 
+    output_numpy = BoolProperty(
+        name='NumPy',
+        description='Output vertices and edges as NumPy arrays',
+        default=False, update=updateNode)
+
+    n_id = StringProperty(default='')
+
     object_names = bpy.props.CollectionProperty(type=bpy.types.PropertyGroup)
 
 
@@ -172,6 +238,7 @@ class SvObjectsNodeMK3(bpy.types.Node, SverchCustomTreeNode):
         row.prop(self, 'sort', text='Sort', toggle=True)
         row.prop(self, "modifiers", text="Post", toggle=True)
         row.prop(self, "vergroups", text="VeGr", toggle=True)
+        row.prop(self, "output_numpy", text="NP", toggle=True)
 
         row = col.row(align=True)
         row.operator(callback, text="Select Objects").fn_name = 'select_objs'
@@ -191,15 +258,28 @@ class SvObjectsNodeMK3(bpy.types.Node, SverchCustomTreeNode):
         op.node_name = self.name
 
 
-    def get_verts_and_vertgroups(self, obj_data):
-        vers = []
-        vers_grouped = []
-        for k, v in enumerate(obj_data.vertices):
-            if self.vergroups and v.groups.values():
-                vers_grouped.append(k)
-            vers.append(list(v.co))
-        return vers, vers_grouped
+    def get_vertgroups(self, obj_data):
+        return [k for k, v in enumerate(obj_data.vertices) if v.groups.values()]
 
+    def read_mesh(self, obj_data):
+        """
+        Read geometry of mesh in bulk, returns vertices, edges,
+        polygons and indices of grouped vertices.
+        """
+        vertices, edges, loop_vertices, offsets = read_mesh_arrays(obj_data)
+        if self.output_numpy:
+            vers = vertices.astype(np.float64)
+        else:
+            vers, edges = vertices.tolist(), edges.tolist()
+        pols = split_by_offsets(loop_vertices, offsets)
+        vers_grouped = self.get_vertgroups(obj_data) if self.vergroups else []
+        return vers, edges, pols, vers_grouped
+
+    def copy(self, node):
+        self.n_id = ''
+
+    def free(self):
+        mesh_cache.pop(node_id(self), None)
 
     def process(self):
 
@@ -209,6 +289,8 @@ class SvObjectsNodeMK3(bpy.types.Node, SverchCustomTreeNode):
         scene = bpy.context.scene
         data_objects = bpy.data.objects
         outputs = self.outputs
+        old_cache = mesh_cache.get(node_id(self), {})
+        new_cache = {}
         
         edgs_out = []
         vers_out = []
@@ -242,12 +324,24 @@ class SvObjectsNodeMK3(bpy.types.Node, SverchCustomTreeNode):
                         bm = bmesh.from_edit_mesh(me)
                         vers, edgs, pols = pydata_from_bmesh(bm)
                         del bm
+                    elif obj.type == 'MESH' and not (self.modifiers and obj.modifiers):
+                        signature = mesh_signature(obj)
+                        if signature:
+                            signature = ((self.vergroups, self.output_numpy), signature)
+                        cached = old_cache.get(obj.name)
+                        if signature and cached and cached[0] == signature:
+                            mesh_data = cached[1]
+                        else:
+                            obj_data = obj.to_mesh(scene, False, 'PREVIEW')
+                            mesh_data = self.read_mesh(obj_data)
+                            bpy.data.meshes.remove(obj_data, do_unlink=True)
+                        if signature:
+                            new_cache[obj.name] = (signature, mesh_data)
+                            mesh_data = copy_mesh_data(mesh_data)
+                        vers, edgs, pols, vers_grouped = mesh_data
                     else:
                         obj_data = obj.to_mesh(scene, self.modifiers, 'PREVIEW')
-                        if obj_data.polygons:
-                            pols = [list(p.vertices) for p in obj_data.polygons]
-                        vers, vers_grouped = self.get_verts_and_vertgroups(obj_data)
-                        edgs = obj_data.edge_keys
+                        vers, edgs, pols, vers_grouped = self.read_mesh(obj_data)
                         bpy.data.meshes.remove(obj_data, do_unlink=True)
                 except:
                     print('failure in process between frozen area', self.name)
@@ -258,9 +352,15 @@ class SvObjectsNodeMK3(bpy.types.Node, SverchCustomTreeNode):
             mtrx_out.append(mtrx)
             vers_out_grouped.append(vers_grouped)
 
-        if vers_out and vers_out[0]:
-            outputs['Vertices'].sv_set(vers_out)
-            outputs['Edges'].sv_set(edgs_out)
+        mesh_cache[node_id(self)] = new_cache
+
+        if vers_out and len(vers_out[0]):
+            if self.output_numpy:
+                outputs['Vertices'].sv_set(self.to_payload(vers_out, 3, np.float64))
+                outputs['Edges'].sv_set(self.to_payload(edgs_out, 2, np.int32))
+            else:
+                outputs['Vertices'].sv_set(vers_out)
+                outputs['Edges'].sv_set(edgs_out)
             outputs['Polygons'].sv_set(pols_out)
 
             if 'Vers_grouped' in outputs and self.vergroups:
@@ -270,13 +370,22 @@ class SvObjectsNodeMK3(bpy.types.Node, SverchCustomTreeNode):
         outputs['Object'].sv_set([data_objects.get(o.name) for o in self.object_names])
 
 
+    def to_payload(self, arrays, width, dtype):
+        """Pack per object arrays into one array payload"""
+        arrays = [np.asarray(a, dtype=dtype).reshape((-1, width)) for a in arrays]
+        return SvJaggedArray.from_arrays(arrays)
+
+
 classes = [SvOB3Callback, SvObjectsNodeMK3]
 
 
 def register():
     _ = [bpy.utils.register_class(c) for c in classes]
+    bpy.app.handlers.scene_update_post.append(track_updated_meshes)
 
 
 def unregister():
+    if track_updated_meshes in bpy.app.handlers.scene_update_post:
+        bpy.app.handlers.scene_update_post.remove(track_updated_meshes)
     _ = [bpy.utils.unregister_class(c) for c in classes]
 
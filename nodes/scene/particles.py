@@ -27,6 +27,8 @@ class SvParticlesNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvParticlesNode'
     bl_label = 'Particles'
     bl_icon = 'PARTICLES'
+    sv_reads_inputs_later = True
+    sv_uses_scene_data = True
 
     def sv_init(self, context):
         self.inputs.new('SvObjectSocket', "Object", "Object")
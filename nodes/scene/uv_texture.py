@@ -30,6 +30,8 @@ class SvUVtextureNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvUVtextureNode'
     bl_label = 'UVtextures'
     bl_icon = 'MATERIAL'
+    sv_reads_inputs_later = True
+    sv_uses_scene_data = True
 
     def sv_init(self, context):
         self.inputs.new('SvObjectSocket', "Object", "Object")
@@ -68,6 +68,7 @@ class SvTextInNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvTextInNodeMK2'
     bl_label = 'Text in+'
     bl_icon = 'PASTEDOWN'
+    sv_uses_scene_data = True
 
     csv_data = {}
     list_data = {}
@@ -108,6 +108,7 @@ class SvTextOutNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvTextOutNodeMK2'
     bl_label = 'Text out+'
     bl_icon = 'COPYDOWN'
+    sv_uses_scene_data = True
 
     sv_modes = [
         ('compact',     'Compact',      'Using str()',        1),
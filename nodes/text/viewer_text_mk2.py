@@ -204,6 +204,7 @@ class ViewerNodeTextMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'ViewerNodeTextMK2'
     bl_label = 'Viewer text mk2'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_reads_inputs_later = True
 
     autoupdate = BoolProperty(name='update', default=False)
 
@@ -22,9 +22,12 @@ from itertools import zip_longest
 import bpy
 from bpy.props import EnumProperty, FloatProperty, FloatVectorProperty
 from mathutils import Vector
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import levelsOflist, updateNode
+from sverchok.utils.sv_vectorize import numpy_fxy, numpy_fx
+from sverchok.utils.sv_jagged_array import is_array_payload, payload_to_lists
 
 # pylint: disable=C0326
 
@@ -59,6 +62,57 @@ func_dict = {
 }
 
 
+def np_length(u):
+    return np.sqrt((u*u).sum(axis=-1))
+
+def np_angle(u, v):
+    lengths = np_length(u) * np_length(v)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos = np.clip((u*v).sum(axis=-1) / lengths, -1.0, 1.0)
+    # mathutils returns fallback value 0 for zero length vectors
+    return np.where(lengths > 0, np.arccos(np.where(lengths > 0, cos, 1.0)), 0.0)
+
+def np_normalize(u):
+    lengths = np_length(u)[..., np.newaxis]
+    safe = np.where(lengths > 0, lengths, 1.0)
+    return np.where(lengths > 0, u / safe, 0.0)
+
+def np_project(u, v):
+    return v * ((u*v).sum(axis=-1) / (v*v).sum(axis=-1))[..., np.newaxis]
+
+def np_reflect(u, v):
+    n = np_normalize(v)
+    return u - 2 * (u*n).sum(axis=-1)[..., np.newaxis] * n
+
+# numpy versions of functions, used to process all vectors at once:
+# (function, number of vector inputs); modes missing here
+# are always processed by python functions; modes done by mathutils
+# give floats for integer vectors as well
+numpy_func_dict = {
+    "DOT":            (lambda u, v: np.multiply(u, v, dtype=np.float64).sum(axis=-1), 2),
+    "DISTANCE":       (lambda u, v: np_length(u - v),                        2),
+    "ANGLE DEG":      (lambda u, v: np.degrees(np_angle(u, v)),              2),
+    "ANGLE RAD":      (np_angle,                                             2),
+    "LEN":            (np_length,                                            1),
+    "CROSS":          (lambda u, v: np.cross(u.astype(np.float64), v),       2),
+    "ADD":            (np.add,                                               2),
+    "SUB":            (np.subtract,                                          2),
+    "PROJECT":        (np_project,                                           2),
+    "REFLECT":        (np_reflect,                                           2),
+    "COMPONENT-WISE": (np.multiply,                                          2),
+    "SCALAR":         (np.multiply,                                          1),
+    "1/SCALAR":       (np.true_divide,                                       1),
+    "NORMALIZE":      (np_normalize,                                         1),
+    "NEG":            (lambda u: np.negative(u, dtype=np.float64),           1),
+    "SCALE XY":       (lambda u, s: u * np.concatenate([s, s, np.ones_like(s)], axis=-1), 1),
+    "SCALE XZ":       (lambda u, s: u * np.concatenate([s, np.ones_like(s), s], axis=-1), 1),
+    "SCALE YZ":       (lambda u, s: u * np.concatenate([np.ones_like(s), s, s], axis=-1), 1)
+}
+
+def to_lists(data):
+    return payload_to_lists(data, copy=False) if is_array_payload(data) else data
+
+
 mode_items = [(k, descr, '', ident) for k, (ident, _, _, descr) in sorted(func_dict.items(), key=lambda k: k[1][0])]
 
  
@@ -94,6 +148,8 @@ class SvVectorMathNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvVectorMathNodeMK2'
     bl_label = 'Vector Math'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_thread_safe = True
+    sv_batchable = True
 
     def mode_change(self, context):
         self.update_sockets()
@@ -146,25 +202,46 @@ class SvVectorMathNodeMK2(bpy.types.Node, SverchCustomTreeNode):
 
 
     def process(self):
+        compute = self.sv_prepare()
+        if compute:
+            self.sv_apply(compute())
+
+    def sv_prepare(self):
         inputs, outputs = self.inputs, self.outputs
 
         if not outputs[0].is_linked:
-            return
+            return None
 
         func = func_dict.get(self.current_op)[1]
         num_inputs = len(inputs)
+        name = outputs[0].name
 
         # get either input data, or socket default
-        input_one = inputs[0].sv_get(deepcopy=False)
-        
-        level = levelsOflist(input_one) - 1
-        if num_inputs == 1:
-            result = recurse_fx(input_one, func, level)
-        else:
-            input_two = inputs[1].sv_get(deepcopy=False)
-            result = recurse_fxy(input_one, input_two, func, level)
-
-        outputs[0].sv_set(result)
+        input_one = inputs[0].sv_get(deepcopy=False, allow_arrays=True)
+        input_two = None
+        if num_inputs == 2:
+            input_two = inputs[1].sv_get(deepcopy=False, allow_arrays=True)
+
+        numpy_func, vector_inputs = numpy_func_dict.get(self.current_op, (None, 0))
+
+        def compute():
+            result = None
+            if numpy_func:
+                if num_inputs == 1:
+                    result = numpy_fx(input_one, numpy_func, item_ndim=1)
+                else:
+                    result = numpy_fxy(input_one, input_two, numpy_func, item_ndim=(1, vector_inputs - 1))
+
+            if result is None:
+                data_one = to_lists(input_one)
+                level = levelsOflist(data_one) - 1
+                if num_inputs == 1:
+                    result = recurse_fx(data_one, func, level)
+                else:
+                    result = recurse_fxy(data_one, to_lists(input_two), func, level)
+            return {name: result}
+
+        return compute
 
 
 
@@ -45,6 +45,7 @@ class GenVectorsNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'GenVectorsNode'
     bl_label = 'Vector in'
     sv_icon = 'SV_COMBINE_IN'
+    sv_batchable = True
 
     x_ = FloatProperty(name='X', description='X',
                        default=0.0, precision=3,
@@ -27,6 +27,7 @@ class VectorsOutNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'VectorsOutNode'
     bl_label = 'Vector out'
     sv_icon = 'SV_COMBINE_OUT'
+    sv_batchable = True
 
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', "Vectors", "Vectors")
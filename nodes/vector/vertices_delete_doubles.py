@@ -17,9 +17,33 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+from bpy.props import FloatProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import levelsOflist
+from sverchok.data_structure import levelsOflist, updateNode
+from sverchok.utils.sv_mesh_utils import remove_doubles
+
+
+def item_key(item):
+    ''' hashable key, equal for equal (nested) lists and tuples '''
+    if isinstance(item, (list, tuple)):
+        return tuple(item_key(i) for i in item)
+    return item
+
+
+def remove_equal_items(items):
+    '''
+    Keep first occurrences of items, returns them and for each of items
+    index of its first occurrence in the result
+    '''
+    out, index, found = [], [], {}
+    for x in items:
+        key = item_key(x)
+        if key not in found:
+            found[key] = len(out)
+            out.append(x)
+        index.append(found[key])
+    return out, index
 
 
 class VertsDelDoublesNode(bpy.types.Node, SverchCustomTreeNode):
@@ -28,28 +52,45 @@ class VertsDelDoublesNode(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Vector X Doubles'
     bl_icon = 'OUTLINER_OB_EMPTY'
 
+    distance = FloatProperty(
+        name='Distance', description='Merge vertices closer than this distance, 0 means exactly equal',
+        default=0.0, min=0.0, precision=5, update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', "vers", "vers")
         self.outputs.new('VerticesSocket', "vers", "vers")
+        self.outputs.new('StringsSocket', "index", "index")
+
+    def draw_buttons(self, context, layout):
+        layout.prop(self, "distance")
 
     def process(self):
-        vers = self.inputs['vers'].sv_get()
+        vers = self.inputs['vers'].sv_get(deepcopy=False)
         # Process data
         levs = levelsOflist(vers)
-        result = self.remdou(vers, levs)
+        result, index = self.remdou(vers, levs)
         self.outputs[0].sv_set(result)
+        if 'index' in self.outputs and self.outputs['index'].is_linked:
+            self.outputs['index'].sv_set(index)
 
     def remdou(self, vers, levs):
-        out = []
+        '''
+        Returns vertices without doubles, and for each of input vertices,
+        its index in the result (to reindex edges and faces)
+        '''
         if levs >= 3:
             levs -= 1
+            out, index = [], []
             for x in vers:
-                out.append(self.remdou(x, levs))
-        else:
-            for x in vers:
-                if x not in out:
-                    out.append(x)
-        return out
+                out_x, index_x = self.remdou(x, levs)
+                out.append(out_x)
+                index.append(index_x)
+            return out, index
+        if levs < 2 or not all(isinstance(x, (list, tuple)) and len(x) == 3 for x in vers):
+            # not a list of 3d vertices, remove exactly equal items
+            return remove_equal_items(vers)
+        kept, index = remove_doubles(vers, self.distance)
+        return [vers[i] for i in kept.tolist()], index.tolist()
 
 
 def register():
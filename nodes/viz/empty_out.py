@@ -29,6 +29,7 @@ class SvEmptyOutNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvEmptyOutNode'
     bl_label = 'Empty out'
     bl_icon = 'OUTLINER_DATA_EMPTY'
+    sv_uses_scene_data = True
 
     def rename_empty(self, context):
         empty = self.find_empty()
@@ -178,6 +178,7 @@ class SvTextureViewerNode(bpy.types.Node, SverchCustomTreeNode):
     '''Texture Viewer node'''
     bl_idname = 'SvTextureViewerNode'
     bl_label = 'Texture viewer'
+    sv_reads_inputs_later = True
     texture = {}
 
     def wrapped_update(self, context):
@@ -98,6 +98,7 @@ class SvTextureViewerNodeLite(bpy.types.Node, SverchCustomTreeNode):
     '''Texture Viewer node Lite'''
     bl_idname = 'SvTextureViewerNodeLite'
     bl_label = 'Texture viewer lite'
+    sv_uses_scene_data = True
     texture = {}
 
     n_id = StringProperty(default='')
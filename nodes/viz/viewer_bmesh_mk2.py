@@ -21,17 +21,24 @@
 import itertools
 
 import bpy
+import numpy as np
 from bpy.props import BoolProperty, StringProperty, BoolVectorProperty
 from mathutils import Matrix, Vector
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import dataCorrect, fullList, updateNode
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
+from sverchok.utils.sv_mesh_utils import (
+    mesh_arrays_from_pydata, topology_hash, is_valid_topology,
+    write_mesh_arrays, write_mesh_vertices)
 from sverchok.utils.sv_viewer_utils import (
     matrix_sanitizer,
     natural_plus_one,
     get_random_init,
-    greek_alphabet
+    greek_alphabet,
+    register_child,
+    forget_children,
+    get_registered_children
 )
 
 
@@ -43,11 +50,9 @@ def default_mesh(name):
     return mesh_data
 
 
-def make_bmesh_geometry(node, idx, context, verts, *topology):
+def get_viewer_object(node, idx, context):
     scene = context.scene
-    meshes = bpy.data.meshes
     objects = bpy.data.objects
-    edges, faces, matrix = topology
     name = node.basemesh_name + "_" + str(idx)
 
     if name in objects:
@@ -57,36 +62,51 @@ def make_bmesh_geometry(node, idx, context, verts, *topology):
         sv_object = objects.new(name, temp_mesh)
         scene.objects.link(sv_object)
 
-    # book-keeping via ID-props!? even this is can be broken by renames
-    sv_object['idx'] = idx
+    # book-keeping via ID-props, and names remembered by node for fast lookup
     sv_object['madeby'] = node.name
-    sv_object['basename'] = node.basemesh_name
+    register_child(node, idx, sv_object)
+    return sv_object
+
 
+def write_geometry(node, sv_object, vertices, edges, loop_vertices, loop_totals):
+    """
+    Write flat geometry arrays into mesh of the object. If topology (edges
+    and faces) is the same as written last time, only vertex locations
+    are updated; topology checksum is stored in 'sv_topology' ID-property.
+    """
     mesh = sv_object.data
-    current_count = len(mesh.vertices)
-    propose_count = len(verts)
-    difference = (propose_count - current_count)
 
-    ''' With this mode you make a massive assumption about the
+    ''' With fixed_verts mode you make a massive assumption about the
         constant state of geometry. Assumes the count of verts
-        edges/faces stays the same, and only updates the locations
-
-        node.fixed_verts is not suitable for initial object creation
-        but if over time you find that the only change is going to be
-        vertices, this mode can be switched to to increase efficiency
+        edges/faces stays the same, and only updates the locations,
+        without even checking the topology.
     '''
-    if node.fixed_verts and difference == 0:
-        f_v = list(itertools.chain.from_iterable(verts))
-        mesh.vertices.foreach_set('co', f_v)
-        mesh.update()
+    if node.fixed_verts and len(mesh.vertices) == len(vertices):
+        write_mesh_vertices(mesh, vertices)
     else:
+        checksum = topology_hash(edges, loop_vertices, loop_totals)
+        if sv_object.get('sv_topology') == checksum and len(mesh.vertices) == len(vertices):
+            write_mesh_vertices(mesh, vertices)
+        elif is_valid_topology(len(vertices), edges, loop_vertices, loop_totals):
+            write_mesh_arrays(mesh, vertices, edges, loop_vertices, loop_totals)
+        else:
+            # let bmesh report (or fix) what is wrong with the data
+            faces = np.split(loop_vertices, np.cumsum(loop_totals)[:-1]) if len(loop_totals) else []
+            bm = bmesh_from_pydata(vertices.tolist(), edges.tolist(), [face.tolist() for face in faces])
+            bm.to_mesh(mesh)
+            bm.free()
+        sv_object['sv_topology'] = checksum
+        sv_object.hide_select = False
 
-        ''' get bmesh, write bmesh to obj, free bmesh'''
-        bm = bmesh_from_pydata(verts, edges, faces, normal_update=node.calc_normals)
-        bm.to_mesh(sv_object.data)
-        bm.free()
+    if node.calc_normals:
+        mesh.calc_normals()
 
-        sv_object.hide_select = False
+
+def make_bmesh_geometry(node, idx, context, verts, *topology):
+    edges, faces, matrix = topology
+    sv_object = get_viewer_object(node, idx, context)
+
+    write_geometry(node, sv_object, *mesh_arrays_from_pydata(verts, edges, faces))
 
     if matrix:
         matrix = matrix_sanitizer(matrix)
@@ -100,54 +120,37 @@ def make_bmesh_geometry(node, idx, context, verts, *topology):
 
 
 def make_bmesh_geometry_merged(node, idx, context, yielder_object):
-    scene = context.scene
-    meshes = bpy.data.meshes
-    objects = bpy.data.objects
-    name = node.basemesh_name + "_" + str(idx)
-
-    if name in objects:
-        sv_object = objects[name]
-    else:
-        temp_mesh = default_mesh(name)
-        sv_object = objects.new(name, temp_mesh)
-        scene.objects.link(sv_object)
-
-    # book-keeping via ID-props!
-    sv_object['idx'] = idx
-    sv_object['madeby'] = node.name
-    sv_object['basename'] = node.basemesh_name
+    sv_object = get_viewer_object(node, idx, context)
 
     vert_count = 0
     big_verts = []
     big_edges = []
-    big_faces = []
+    big_loop_vertices = []
+    big_loop_totals = []
 
     for result in yielder_object:
 
         verts, topology = result
         edges, faces, matrix = topology
+        verts, edges, loop_vertices, loop_totals = mesh_arrays_from_pydata(verts, edges, faces)
 
         if matrix:
-            matrix = matrix_sanitizer(matrix)
-            verts = [matrix * Vector(v) for v in verts]
+            matrix = np.array(matrix_sanitizer(matrix), dtype=np.float32)
+            verts = verts.dot(matrix[:3, :3].T) + matrix[:3, 3]
 
-        big_verts.extend(verts)
-        big_edges.extend([[a + vert_count, b + vert_count] for a, b in edges])
-        big_faces.extend([[j + vert_count for j in f] for f in faces])
+        big_verts.append(verts)
+        big_edges.append(edges + vert_count)
+        big_loop_vertices.append(loop_vertices + vert_count)
+        big_loop_totals.append(loop_totals)
 
         vert_count += len(verts)
 
-
-    if node.fixed_verts and len(sv_object.data.vertices) == len(big_verts):
-        mesh = sv_object.data
-        f_v = list(itertools.chain.from_iterable(big_verts))
-        mesh.vertices.foreach_set('co', f_v)
-        mesh.update()
+    if big_verts:
+        write_geometry(node, sv_object,
+                       np.concatenate(big_verts), np.concatenate(big_edges),
+                       np.concatenate(big_loop_vertices), np.concatenate(big_loop_totals))
     else:
-        ''' get bmesh, write bmesh to obj, free bmesh'''
-        bm = bmesh_from_pydata(big_verts, big_edges, big_faces, normal_update=node.calc_normals)
-        bm.to_mesh(sv_object.data)
-        bm.free()
+        write_geometry(node, sv_object, *mesh_arrays_from_pydata([], [], []))
 
     sv_object.hide_select = False
     sv_object.matrix_local = Matrix.Identity(4)
@@ -163,10 +166,7 @@ class SvBmeshViewOp2(bpy.types.Operator):
 
     def hide_unhide(self, context, type_op):
         n = context.node
-        k = n.basemesh_name + "_"
-
-        child = lambda obj: obj.type == "MESH" and obj.name.startswith(k)
-        objs = list(filter(child, bpy.data.objects))
+        objs = n.get_children()
 
         if type_op in {'hide', 'hide_render', 'hide_select'}:
             op_value = getattr(n, type_op)
@@ -213,6 +213,7 @@ class SvBmeshViewerNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvBmeshViewerNodeMK2'
     bl_label = 'Viewer BMesh'
     bl_icon = 'OUTLINER_OB_MESH'
+    sv_uses_scene_data = True
 
     # hints found at ba.org/forum/showthread.php?290106
     # - this will not allow objects on multiple layers, yet.
@@ -272,6 +273,8 @@ class SvBmeshViewerNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         default=False,
         description='Allows mesh.transform(matrix) operation, quite fast!')
 
+    n_id = StringProperty(default='')
+
     def sv_init(self, context):
         gai = bpy.context.scene.SvGreekAlphabet_index
         self.basemesh_name = greek_alphabet[gai]
@@ -428,32 +431,36 @@ class SvBmeshViewerNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         if self.outputs[0].is_linked:
             self.outputs[0].sv_set(objs)
 
-    def get_children(self):
+    def find_children(self):
         objects = bpy.data.objects
         objs = [obj for obj in objects if obj.type == 'MESH']
         # critera, basename must be in object.keys and the value must be self.basemesh_name
-        return [o for o in objs if o.get('basename') == self.basemesh_name]
+        return [(o['idx'], o) for o in objs if o.get('basename') == self.basemesh_name]
+
+    def get_children(self):
+        children = get_registered_children(self, self.find_children)
+        return [children[idx] for idx in sorted(children)]
 
     def remove_non_updated_objects(self, obj_index):
-        objs = self.get_children()
-        objs = [obj.name for obj in objs if obj['idx'] > obj_index]
-        if not objs:
+        children = get_registered_children(self, self.find_children)
+        indices = [idx for idx in children if idx > obj_index]
+        if not indices:
             return
 
         meshes = bpy.data.meshes
         objects = bpy.data.objects
         scene = bpy.context.scene
 
-        # remove excess objects
-        for object_name in objs:
-            obj = objects[object_name]
+        # remove excess objects and associated meshes
+        for idx in indices:
+            obj = children[idx]
+            mesh = obj.data
             obj.hide_select = False
             scene.objects.unlink(obj)
             objects.remove(obj, do_unlink=True)
-
-        # delete associated meshes
-        for object_name in objs:
-            meshes.remove(meshes[object_name])
+            if mesh.users == 0:
+                meshes.remove(mesh)
+        forget_children(self, indices)
 
     def to_group(self, objs):
         groups = bpy.data.groups
@@ -482,6 +489,12 @@ class SvBmeshViewerNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     def update_socket(self, context):
         self.update()
 
+    def copy(self, node):
+        self.n_id = ''
+
+    def free(self):
+        forget_children(self)
+
 
 def register():
     bpy.utils.register_class(SvBmeshViewerNodeMK2)
@@ -242,6 +242,7 @@ class SvCurveViewerNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvCurveViewerNode'
     bl_label = 'Curve Viewer'
     bl_icon = 'MOD_CURVE'
+    sv_uses_scene_data = True
 
     activate = BoolProperty(
         name='Show',
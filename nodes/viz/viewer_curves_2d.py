@@ -255,6 +255,7 @@ class SvCurveViewerNode2D(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvCurveViewerNodeAlt'
     bl_label = 'Curve Viewer 2D'
     bl_icon = 'MOD_CURVE'
+    sv_uses_scene_data = True
 
     activate = BoolProperty(
         name='Show',
@@ -170,6 +170,7 @@ class ViewerNode2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'ViewerNode2'
     bl_label = 'Viewer Draw'
     bl_icon = 'RETOPO'
+    sv_uses_scene_data = True
 
     n_id = StringProperty(default='')
 
@@ -181,6 +181,8 @@ class SvPolylineViewerNodeMK1(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvPolylineViewerNodeMK1'
     bl_label = 'Polyline Viewer MK1'
     bl_icon = 'MOD_CURVE'
+    sv_reads_inputs_later = True
+    sv_uses_scene_data = True
 
     activate = BoolProperty(
         name='Show',
@@ -212,6 +212,7 @@ class SvSkinViewerNodeMK1b(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvSkinViewerNodeMK1b'
     bl_label = 'Skin Mesher mk1b'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_uses_scene_data = True
 
     basemesh_name = StringProperty(
         default='Alpha',
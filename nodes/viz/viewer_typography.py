@@ -166,6 +166,7 @@ class SvTypeViewerNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvTypeViewerNode'
     bl_label = 'Typography Viewer'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_uses_scene_data = True
 
     # hints found at ba.org/forum/showthread.php?290106
     # - this will not allow objects on multiple layers, yet.
@@ -0,0 +1,19 @@
+#!/bin/bash
+
+# Evaluate node tree exported to JSON for a list of parameter sets
+# in background Blender. All arguments are passed to utils/sv_batch.py,
+# see its docstring for details, e.g.
+#
+# $ ./run_batch.sh --tree tree.json --params params.json --output "Box:Vertices" --result out.jsonl --jobs 8
+#
+# If your blender is not available as just "blender" command, then you need
+# to specify path to blender when running this script, e.g.
+#
+# $ BLENDER=~/soft/blender-2.79/blender ./run_batch.sh ...
+#
+
+set -e
+
+BLENDER=${BLENDER:-blender}
+
+$BLENDER -b --addons sverchok --python utils/sv_batch.py --python-exit-code 1 -- "$@"
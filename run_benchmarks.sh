@@ -0,0 +1,19 @@
+#!/bin/bash
+
+# Run performance benchmarks (tests/*_benchmarks.py) and compare results
+# with stored baseline. All arguments are passed to utils/benchmark.py, e.g.
+#
+# $ ./run_benchmarks.sh --save-baseline
+# $ ./run_benchmarks.sh --tolerance 0.2 --size 10000
+#
+# If your blender is not available as just "blender" command, then you need
+# to specify path to blender when running this script, e.g.
+#
+# $ BLENDER=~/soft/blender-2.79/blender ./run_benchmarks.sh
+#
+
+set -e
+
+BLENDER=${BLENDER:-blender}
+
+$BLENDER -b --addons sverchok --python utils/benchmark.py --python-exit-code 1 -- "$@"
@@ -21,6 +21,22 @@ class SverchokPreferences(AddonPreferences):
     def update_heat_map(self, context):
         data_structure.heat_map_state(self.heat_map)
 
+    def update_incremental(self, context):
+        data_structure.INCREMENTAL_UPDATE = self.incremental_update
+        update_system.reset_node_fingerprints()
+
+    def update_lazy_copy(self, context):
+        data_structure.LAZY_COPY = self.lazy_copy
+        data_structure.CHECK_INPUT_MUTATION = self.check_input_mutation
+
+    def update_cache_budget(self, context):
+        data_structure.SOCKET_CACHE_BUDGET = self.socket_cache_budget
+
+    def update_parallel(self, context):
+        data_structure.PARALLEL_UPDATE = self.parallel_update
+        data_structure.PARALLEL_WORKERS = self.parallel_workers
+        update_system.shutdown_update_executor()
+
     def set_frame_change(self, context):
         handlers.set_frame_change(self.frame_change_mode)
 
@@ -73,6 +89,42 @@ class SverchokPreferences(AddonPreferences):
         size=3, min=0.0, max=1.0,
         default=(1, 1, 1), subtype='COLOR')
 
+    incremental_update = BoolProperty(
+        name="Incremental update",
+        description="Skip processing of nodes whose inputs and settings did not change since last update",
+        default=False, subtype='NONE',
+        update=update_incremental)
+
+    lazy_copy = BoolProperty(
+        name="Lazy copy",
+        description="Copy nested lists of socket data only when nodes first read them, parts never read are not copied",
+        default=False, subtype='NONE',
+        update=update_lazy_copy)
+
+    check_input_mutation = BoolProperty(
+        name="Check input mutation",
+        description="Warn about nodes that modify input data without copying it (slow)",
+        default=False, subtype='NONE',
+        update=update_lazy_copy)
+
+    socket_cache_budget = IntProperty(
+        name="Cache budget (MB)",
+        description="Memory budget for data passed between nodes of one tree. When exceeded, data already consumed by all nodes is dropped and recalculated when needed. 0 means unlimited",
+        default=0, min=0,
+        update=update_cache_budget)
+
+    parallel_update = BoolProperty(
+        name="Parallel update",
+        description="Compute independent parts of the tree at the same time (only nodes marked as thread safe run in worker threads)",
+        default=False, subtype='NONE',
+        update=update_parallel)
+
+    parallel_workers = IntProperty(
+        name="Worker threads",
+        description="Number of worker threads for parallel update, 0 means number of CPUs",
+        default=0, min=0, max=64,
+        update=update_parallel)
+
     # Profiling settings
     profiling_sections = [
         ("NONE", "Disable", "Disable profiling", 0),
@@ -85,6 +137,14 @@ class SverchokPreferences(AddonPreferences):
             default = "NONE",
             description = "Performance profiling mode")
 
+    stats_buffer_size = IntProperty(name = "Statistics buffer",
+            description = "Number of node processing samples kept for statistics",
+            default = 10000, min = 100)
+
+    stats_trace_memory = BoolProperty(name = "Trace memory",
+            description = "Measure peak memory allocated by each node when collecting statistics (slow)",
+            default = False)
+
     developer_mode = BoolProperty(name = "Developer mode",
             description = "Show some additional panels or features useful for Sverchok developers only",
             default = False)
@@ -228,6 +288,14 @@ class SverchokPreferences(AddonPreferences):
             col2 = col_split.split().column()
             col2.label(text="Frame change handler:")
             col2.row().prop(self, "frame_change_mode", expand=True)
+            col2.prop(self, "incremental_update")
+            col2.prop(self, "lazy_copy")
+            col2.prop(self, "socket_cache_budget")
+            row = col2.row(align=True)
+            row.prop(self, "parallel_update")
+            sub = row.row(align=True)
+            sub.active = self.parallel_update
+            sub.prop(self, "parallel_workers")
             col2.separator()
 
             col2box = col2.box()
@@ -235,7 +303,12 @@ class SverchokPreferences(AddonPreferences):
             col2box.prop(self, "profile_mode")
             col2box.prop(self, "show_debug")
             col2box.prop(self, "heat_map")
+            col2box.prop(self, "check_input_mutation")
             col2box.prop(self, "developer_mode")
+            if self.developer_mode:
+                row = col2box.row(align=True)
+                row.prop(self, "stats_buffer_size")
+                row.prop(self, "stats_trace_memory")
 
             log_box = col2.box()
             log_box.label(text="Logging:")
@@ -0,0 +1,60 @@
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.csg_core import CSG
+from sverchok.utils.csg_array import boolean, boolean_balanced
+
+def box(size=1.0, shift=(0, 0, 0)):
+    r = size / 2.0
+    vertices = [(x * r + shift[0], y * r + shift[1], z * r + shift[2])
+                for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+    faces = [[0, 1, 3, 2], [4, 6, 7, 5], [0, 4, 5, 1], [2, 3, 7, 6], [0, 2, 6, 4], [1, 5, 7, 3]]
+    return vertices, faces
+
+def volume(vertices, faces):
+    vertices = np.array(vertices)
+    result = 0.0
+    for face in faces:
+        for i in range(1, len(face) - 1):
+            a, b, c = vertices[face[0]], vertices[face[i]], vertices[face[i + 1]]
+            result += np.dot(a, np.cross(b, c)) / 6.0
+    return result
+
+def old_volume(mesh_a, mesh_b, operation):
+    a = CSG.Obj_from_pydata(*mesh_a)
+    b = CSG.Obj_from_pydata(*mesh_b)
+    result = {'ITX': a.intersect, 'JOIN': a.union, 'DIFF': a.subtract}[operation](b)
+    vertices, faces = [], []
+    for polygon in result.toPolygons():
+        faces.append(list(range(len(vertices), len(vertices) + len(polygon.vertices))))
+        vertices.extend((v.pos.x, v.pos.y, v.pos.z) for v in polygon.vertices)
+    return volume(vertices, faces)
+
+class CSGArrayTests(SverchokTestCase):
+
+    def test_boxes(self):
+        a = box(1.0)
+        b = box(1.0, shift=(0.5, 0.25, 0.0))
+        expected = {'ITX': 0.375, 'JOIN': 1.625, 'DIFF': 0.625}
+        for operation, value in expected.items():
+            with self.subTest(operation=operation):
+                vertices, faces = boolean(a[0], a[1], b[0], b[1], operation)
+                self.assertAlmostEqual(volume(vertices, faces), value, places=6)
+                self.assertAlmostEqual(old_volume(a, b, operation), value, places=6)
+
+    def test_no_duplicate_vertices(self):
+        a = box(1.0)
+        b = box(0.5, shift=(0.5, 0.5, 0.5))
+        vertices, faces = boolean(a[0], a[1], b[0], b[1], 'JOIN')
+        self.assertEqual(len(set(map(tuple, vertices))), len(vertices))
+
+    def test_balanced(self):
+        meshes = [box(1.0, shift=(0.3 * i, 0.1 * i, 0.0)) for i in range(5)]
+        for operation in ['ITX', 'JOIN', 'DIFF']:
+            with self.subTest(operation=operation):
+                result = meshes[0]
+                for mesh in meshes[1:]:
+                    result = boolean(result[0], result[1], mesh[0], mesh[1], operation)
+                balanced = boolean_balanced(meshes, operation)
+                self.assertAlmostEqual(volume(*balanced), volume(*result), places=6)
+
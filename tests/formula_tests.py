@@ -0,0 +1,61 @@
+
+from math import *
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.sv_formula import compile_formula
+
+class FormulaTests(SverchokTestCase):
+
+    def assert_same_as_eval(self, formula, xs, ns):
+        vector_formula = compile_formula(formula)
+        self.assertIsNotNone(vector_formula)
+        result = vector_formula(np.array(xs), [np.array(n) for n in ns]).tolist()
+        for i, x in enumerate(xs):
+            n = [items[i] for items in ns]
+            expected = eval(formula, globals(), {'x': x, 'X': x, 'n': n, 'N': n})
+            self.assertAlmostEqual(result[i], expected, places=10)
+            self.assertEqual(type(result[i]), type(expected))
+
+    def test_arithmetic(self):
+        self.assert_same_as_eval("x*2 + n[0]/3 - n[1]**2", [0.1, 0.5, 2.0], [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+
+    def test_functions(self):
+        self.assert_same_as_eval("sin(x)*cos(N[0]) + log(x, 2) + atan2(x, n[0])", [0.1, 0.5, 2.0], [[1.0, 2.0, 3.0]])
+
+    def test_int_functions(self):
+        self.assert_same_as_eval("floor(x*3) + int(x)", [0.1, 0.5, 2.7], [])
+
+    def test_conditional(self):
+        self.assert_same_as_eval("x if x > n[0] else n[0] - x", [0.1, 0.5, 2.7], [[0.3, 0.3, 0.3]])
+
+    def test_constant(self):
+        result = compile_formula("pi")(np.array([1.0, 2.0]), [])
+        self.assertEqual(result.tolist(), [pi, pi])
+
+    def test_not_vectorized(self):
+        self.assertIsNone(compile_formula("sum(n)"))
+        self.assertIsNone(compile_formula("x.real"))
+        self.assertIsNone(compile_formula("factorial(x)"))
+        self.assertIsNone(compile_formula("n[int(x)]"))
+        self.assertIsNone(compile_formula("x +"))
+
+    def test_errors(self):
+        # these are left to eval(), which raises proper exceptions
+        with self.assertRaises(FloatingPointError):
+            compile_formula("sqrt(x)")(np.array([-1.0]), [])
+        with self.assertRaises(FloatingPointError):
+            compile_formula("1/x")(np.array([0.0]), [])
+        with self.assertRaises(IndexError):
+            compile_formula("x + n[1]")(np.array([0.0]), [np.array([0.0])])
+        with self.assertRaises(OverflowError):
+            compile_formula("x**n[0]")(np.array([2]), [np.array([100])])
+        with self.assertRaises(OverflowError):
+            compile_formula("x*n[0]*n[0]")(np.array([2]), [np.array([2**40])])
+        with self.assertRaises(OverflowError):
+            compile_formula("floor(x)")(np.array([1e30]), [])
+
+    def test_small_integers(self):
+        self.assert_same_as_eval("x*n[0] + x**2", [1, 2, 3], [[4, 5, 6]])
+
@@ -0,0 +1,31 @@
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.sv_jagged_array import SvJaggedArray, payload_to_lists
+
+class JaggedArrayTests(SverchokTestCase):
+
+    def test_from_lists(self):
+        arr = SvJaggedArray.from_lists([[(0,0,0), (1,0,0)], [(0,1,0)]])
+        self.assertEqual(len(arr), 2)
+        self.assertEqual(arr.lengths.tolist(), [2, 1])
+        self.assertEqual(arr[1].tolist(), [[0.0, 1.0, 0.0]])
+        self.assertFalse(arr.is_regular())
+
+    def test_readonly(self):
+        arr = SvJaggedArray.from_lists([[1, 2, 3], [4]])
+        with self.assertRaises(ValueError):
+            arr[0][0] = 10
+
+    def test_to_lists(self):
+        arr = SvJaggedArray.from_lists([[1, 2, 3], [4]])
+        self.assertEqual(payload_to_lists(arr), [[1.0, 2.0, 3.0], [4.0]])
+        # copy must not be shared with cached conversion
+        lists = payload_to_lists(arr, copy=True)
+        lists[0].append(5)
+        self.assertEqual(payload_to_lists(arr, copy=False), [[1.0, 2.0, 3.0], [4.0]])
+
+    def test_invalid_offsets(self):
+        with self.assertRaises(ValueError):
+            SvJaggedArray(np.arange(5), [0, 2, 4])
+
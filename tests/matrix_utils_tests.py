@@ -0,0 +1,71 @@
+import numpy as np
+from mathutils import Matrix, Vector
+
+from sverchok.data_structure import Matrix_generate, Matrix_listing
+from sverchok.utils.testing import *
+from sverchok.utils.sv_matrix_utils import (
+    matrices_to_array, multiply_matrices, invert_matrices,
+    apply_matrices, apply_matrices_to_objects,
+    decompose_matrices, compose_matrices, dupli_face_triangles, sanitize_matrices)
+
+class MatrixUtilsTests(SverchokTestCase):
+
+    def setUp(self):
+        self.matrices = [
+            Matrix.Translation((1, 2, 3)) * Matrix.Rotation(0.5, 4, 'Z'),
+            Matrix.Rotation(-0.3, 4, 'X') * Matrix.Scale(2.0, 4),
+            Matrix.Scale(-1.0, 4, (0, 1, 0)) * Matrix.Translation((0, 0, 5))]
+        self.array = matrices_to_array(Matrix_listing(self.matrices))
+
+    def test_round_trip(self):
+        self.assertEqual(self.array.shape, (3, 4, 4))
+        matrices = Matrix_generate(self.array)
+        for expected, matrix in zip(self.matrices, matrices):
+            self.assertEqual(expected, matrix)
+
+    def test_multiply(self):
+        result = multiply_matrices([self.array, self.array[:1]])
+        for i, m in enumerate(self.matrices):
+            expected = np.array(m * self.matrices[0])
+            self.assert_numpy_arrays_equal(result[i], expected, precision=5)
+
+    def test_invert(self):
+        result = invert_matrices(self.array)
+        for i, m in enumerate(self.matrices):
+            self.assert_numpy_arrays_equal(result[i], np.array(m.inverted()), precision=5)
+        with self.assertRaises(ValueError):
+            invert_matrices(np.zeros((1, 4, 4)))
+
+    def test_apply(self):
+        vertices = [(1, 0, 0), (0, 1, 0), (1, 2, 3)]
+        result = apply_matrices(self.array, vertices)
+        for i, m in enumerate(self.matrices):
+            expected = np.array([(m * Vector(v))[:] for v in vertices])
+            self.assert_numpy_arrays_equal(result[i], expected, precision=5)
+
+    def test_apply_to_objects(self):
+        vertices_s = [[(1, 0, 0)], [(0, 1, 0), (0, 0, 1)]]
+        result = apply_matrices_to_objects(self.array, vertices_s)
+        self.assertEqual(list(result.lengths), [1, 2, 1])
+        expected = np.array([(self.matrices[2] * Vector((1, 0, 0)))[:]])
+        self.assert_numpy_arrays_equal(result[2], expected, precision=5)
+
+    def test_decompose(self):
+        translation, rotation, scale = decompose_matrices(self.array)
+        for i, m in enumerate(self.matrices):
+            T, R, S = m.decompose()
+            self.assert_numpy_arrays_equal(translation[i], np.array(T[:]), precision=5)
+            self.assert_numpy_arrays_equal(rotation[i], np.array(R.to_matrix()), precision=5)
+            self.assert_numpy_arrays_equal(scale[i], np.array(S[:]), precision=5)
+        composed = compose_matrices(translation, rotation, scale)
+        self.assert_numpy_arrays_equal(composed, self.array, precision=5)
+
+    def test_dupli_face_triangles(self):
+        triangles = dupli_face_triangles(self.array)
+        self.assertEqual(triangles.shape, (9, 3))
+        centers = triangles.reshape((3, 3, 3)).mean(axis=1)
+        self.assert_numpy_arrays_equal(centers, self.array[:, :3, 3], precision=5)
+
+    def test_sanitize_matrices(self):
+        matrices = np.array([[[1.0, 1e-6, 0], [-1e-6, 1, 0], [0, 0, 1]]])
+        self.assert_numpy_arrays_equal(sanitize_matrices(matrices), np.eye(3)[np.newaxis])
@@ -0,0 +1,29 @@
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.sv_mesh_utils import mesh_arrays_from_pydata, is_valid_topology
+
+class TopologyTests(SverchokTestCase):
+
+    def is_valid(self, vertices, edges, faces):
+        vertices, edges, loop_vertices, loop_totals = mesh_arrays_from_pydata(vertices, edges, faces)
+        return is_valid_topology(len(vertices), edges, loop_vertices, loop_totals)
+
+    def test_valid(self):
+        vertices = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+        self.assertTrue(self.is_valid(vertices, [], [[0, 1, 2], [0, 2, 3]]))
+        self.assertTrue(self.is_valid(vertices, [[0, 1]], [[0, 1, 2, 3]]))
+
+    def test_out_of_range(self):
+        vertices = [(0, 0, 0), (1, 0, 0), (1, 1, 0)]
+        self.assertFalse(self.is_valid(vertices, [[0, 3]], []))
+        self.assertFalse(self.is_valid(vertices, [], [[0, 1, 3]]))
+
+    def test_repeated_index(self):
+        vertices = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+        self.assertFalse(self.is_valid(vertices, [], [[0, 1, 2], [0, 2, 3, 2]]))
+        self.assertFalse(self.is_valid(vertices, [[1, 1]], []))
+
+    def test_short_face(self):
+        vertices = [(0, 0, 0), (1, 0, 0), (1, 1, 0)]
+        self.assertFalse(self.is_valid(vertices, [], [[0, 1]]))
@@ -0,0 +1,29 @@
+import bpy
+
+from sverchok.utils.testing import *
+from sverchok.utils.monad import monad_make
+
+class MonadInputTests(EmptyTreeTestCase):
+
+    def test_color_input(self):
+        # sockets without array payloads must be read as usual
+        monad = monad_make("ColorMonad")
+        try:
+            color_out = monad.nodes.new('SvColorsOutNodeMK1')
+            monad.links.new(monad.input_node.outputs[0], color_out.inputs[0])
+            monad.input_node.update()
+            monad.links.new(color_out.outputs['R'], monad.output_node.inputs[0])
+            monad.output_node.update()
+            cls_ref = monad.update_cls()
+            self.assertEqual(cls_ref.input_template[0][1], 'SvColorSocket')
+
+            color_in = self.tree.nodes.new('SvColorsInNodeMK1')
+            instance = self.tree.nodes.new(cls_ref.bl_idname)
+            reroute = self.tree.nodes.new('NodeReroute')
+            self.tree.links.new(color_in.outputs[0], instance.inputs[0])
+            self.tree.links.new(instance.outputs[0], reroute.inputs[0])
+            color_in.process()
+            instance.process()
+            self.assertEqual(len(instance.outputs[0].sv_get()), 1)
+        finally:
+            bpy.data.node_groups.remove(monad)
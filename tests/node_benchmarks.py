@@ -0,0 +1,101 @@
+from sverchok.utils.benchmark import *
+from sverchok.core.update_system import build_update_list, process_tree
+
+class NodeBenchmark(SverchokBenchmark):
+    """
+    Base for benchmarks of single nodes: the tree is processed once,
+    so that inputs of the node are in socket cache, and then only
+    the node's process() is timed.
+    """
+
+    def setUp(self):
+        self.tree = create_node_tree(self.tree_name)
+        self.tree.freeze(True)
+
+    def box(self, divisions, size=1.0):
+        node = create_node("SvBoxNode", self.tree.name)
+        node.Divx = node.Divy = node.Divz = divisions
+        node.Size = size
+        return node
+
+    def measure_node(self, node):
+        self.tree.unfreeze(True)
+        build_update_list(self.tree)
+        process_tree(self.tree)
+        self.measure(node.process)
+
+    @property
+    def divisions(self):
+        # box with n divisions has about 6 * n^2 vertices
+        return max(1, int((self.size / 6) ** 0.5))
+
+class KDTreeBenchmark(NodeBenchmark):
+
+    def bench_kdtree_closest(self):
+        box = self.box(self.divisions)
+        kdtree = create_node("SvKDTreeNodeMK2", self.tree.name)
+        link(self.tree, box, "Vers", kdtree, "insert")
+        link(self.tree, box, "Vers", kdtree, "find")
+        self.measure_node(kdtree)
+
+    def bench_kdtree_rebuild(self):
+        # the same, but without reusing cached trees
+        from sverchok.nodes.analyzer.kd_tree_MK2 import kdtree_cache
+        box = self.box(self.divisions)
+        kdtree = create_node("SvKDTreeNodeMK2", self.tree.name)
+        link(self.tree, box, "Vers", kdtree, "insert")
+        link(self.tree, box, "Vers", kdtree, "find")
+        self.tree.unfreeze(True)
+        build_update_list(self.tree)
+        process_tree(self.tree)
+
+        def rebuild():
+            kdtree_cache.clear()
+            kdtree.process()
+
+        self.measure(rebuild)
+
+class NoiseBenchmark(NodeBenchmark):
+
+    def bench_noise(self):
+        box = self.box(self.divisions)
+        noise = create_node("SvNoiseNodeMK2", self.tree.name)
+        link(self.tree, box, "Vers", noise, "Vertices")
+        self.measure_node(noise)
+
+class DeleteDoublesBenchmark(NodeBenchmark):
+
+    def bench_delete_doubles(self):
+        box = self.box(self.divisions)
+        doubles = create_node("VertsDelDoublesNode", self.tree.name)
+        doubles.distance = 0.001
+        link(self.tree, box, "Vers", doubles, "vers")
+        self.measure_node(doubles)
+
+class MatrixApplyBenchmark(NodeBenchmark):
+
+    def bench_matrix_apply_join(self):
+        mesh = self.box(self.divisions)
+        locations = self.box(4)
+        matrix = create_node("SvMatrixGenNodeMK2", self.tree.name)
+        link(self.tree, locations, "Vers", matrix, "Location")
+        apply = create_node("SvMatrixApplyJoinNode", self.tree.name)
+        link(self.tree, mesh, "Vers", apply, "Vertices")
+        link(self.tree, mesh, "Pols", apply, "Faces")
+        link(self.tree, matrix, "Matrix", apply, "Matrices")
+        self.measure_node(apply)
+
+class CSGBenchmark(NodeBenchmark):
+
+    repeat = 1
+
+    def bench_csg_difference(self):
+        divisions = max(1, self.divisions // 4)
+        box_a = self.box(divisions, size=1.0)
+        box_b = self.box(divisions, size=0.7)
+        csg = create_node("SvCSGBooleanNodeMK2", self.tree.name)
+        link(self.tree, box_a, "Vers", csg, "Verts A")
+        link(self.tree, box_a, "Pols", csg, "Polys A")
+        link(self.tree, box_b, "Vers", csg, "Verts B")
+        link(self.tree, box_b, "Pols", csg, "Polys B")
+        self.measure_node(csg)
@@ -0,0 +1,61 @@
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils import sv_mesh_utils
+from sverchok.utils.sv_mesh_utils import remove_doubles
+from sverchok.nodes.vector.vertices_delete_doubles import remove_equal_items
+
+def remove_doubles_naive(vertices, distance):
+    kept, index = [], []
+    for vertex in vertices:
+        for i, k in enumerate(kept):
+            if sum((a - b)**2 for a, b in zip(vertex, vertices[k])) <= distance**2:
+                index.append(i)
+                break
+        else:
+            index.append(len(kept))
+            kept.append(vertices.index(vertex))
+    return kept, index
+
+class RemoveDoublesTests(SverchokTestCase):
+
+    def assert_same_as_naive(self, vertices, distance):
+        kept, index = remove_doubles(vertices, distance)
+        expected_kept, expected_index = remove_doubles_naive(vertices, distance)
+        self.assertEqual(kept.tolist(), expected_kept)
+        self.assertEqual(index.tolist(), expected_index)
+
+    def test_exact(self):
+        vertices = [(1, 0, 0), (0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 0), (-0.0, 0, 0)]
+        kept, index = remove_doubles(vertices)
+        self.assertEqual(kept.tolist(), [0, 1, 3])
+        self.assertEqual(index.tolist(), [0, 1, 0, 2, 1, 1])
+
+    def test_empty(self):
+        kept, index = remove_doubles([])
+        self.assertEqual(len(kept), 0)
+        self.assertEqual(len(index), 0)
+
+    def test_distance(self):
+        random = np.random.RandomState(0)
+        for distance in [0.05, 0.1, 0.3, 2.0]:
+            vertices = np.round(random.rand(50, 3), 1)[random.randint(0, 50, 100)].tolist()
+            self.assert_same_as_naive(vertices, distance)
+
+    def test_distance_dense(self):
+        # the same, but comparing with kept points one by one
+        saved = sv_mesh_utils.MAX_NEIGHBOUR_PAIRS
+        sv_mesh_utils.MAX_NEIGHBOUR_PAIRS = 0
+        try:
+            self.test_distance()
+        finally:
+            sv_mesh_utils.MAX_NEIGHBOUR_PAIRS = saved
+
+    def test_equal_items(self):
+        # anything but 3d vertices keeps the old behaviour
+        out, index = remove_equal_items([3, 1, 3, 1.0, 2])
+        self.assertEqual(out, [3, 1, 2])
+        self.assertEqual(index, [0, 1, 0, 1, 2])
+        out, index = remove_equal_items([[0, 1], (0, 1), [1, 0]])
+        self.assertEqual(out, [[0, 1], [1, 0]])
+        self.assertEqual(index, [0, 0, 1])
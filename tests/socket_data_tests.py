@@ -0,0 +1,27 @@
+from sverchok.utils.testing import *
+from sverchok.core.socket_data import lazy_copy
+
+class LazyCopyTests(SverchokTestCase):
+
+    def assert_not_shared(self, data):
+        expected = [item[:] if isinstance(item, list) else item for item in data]
+        copy = lazy_copy(data)
+        self.assertEqual(copy, data)
+        for item in copy:
+            if isinstance(item, list):
+                item.append(None)
+        self.assertEqual(data, expected)
+
+    def test_nested(self):
+        self.assert_not_shared([[1, 2], [3]])
+
+    def test_mixed(self):
+        self.assert_not_shared([[1, 2], 5])
+        self.assert_not_shared([5, [1, 2]])
+
+    def test_concatenation(self):
+        data = [[1, 2], [3]]
+        for joined in ([[0]] + lazy_copy(data), lazy_copy(data) + [[0]]):
+            for item in joined:
+                item.append(None)
+        self.assertEqual(data, [[1, 2], [3]])
@@ -0,0 +1,38 @@
+from sverchok.utils.benchmark import *
+from sverchok.core.update_system import (
+        build_update_list, make_update_list, process_tree, process_from_node)
+
+class UpdateSystemBenchmark(SverchokBenchmark):
+    """
+    Core update path on synthetic tree of independent chains of math nodes.
+    """
+
+    width = 10
+    depth = 30
+
+    def setUp(self):
+        self.tree, self.heads = make_synthetic_tree(self.tree_name,
+                                    width=self.width, depth=self.depth, size=self.size)
+
+    def bench_build_update_list(self):
+        self.measure(lambda: build_update_list(self.tree))
+
+    def bench_make_update_list(self):
+        self.measure(lambda: make_update_list(self.tree))
+
+    def bench_process_tree(self):
+        build_update_list(self.tree)
+        self.measure(lambda: process_tree(self.tree))
+
+    def bench_process_from_node(self):
+        build_update_list(self.tree)
+        process_tree(self.tree)
+        self.measure(lambda: process_from_node(self.heads[0]))
+
+class WideTreeBenchmark(UpdateSystemBenchmark):
+    """
+    The same on a wide and shallow tree, where topological sort dominates.
+    """
+
+    width = 200
+    depth = 3
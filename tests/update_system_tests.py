@@ -4,7 +4,10 @@ import unittest
 
 from sverchok.utils.testing import *
 from sverchok.utils.logging import debug, info
-from sverchok.core.update_system import make_dep_dict, make_update_list
+from sverchok.core.update_system import (
+        make_dep_dict, make_update_list, make_update_levels,
+        sort_nodes, sort_nodes_by_levels, SvCyclicTreeError,
+        do_update_parallel)
 #from sverchok.tests.mocks import *
 
 class UpdateSystemTests(ReferenceTreeTestCase):
@@ -35,3 +38,49 @@ class UpdateSystemTests(ReferenceTreeTestCase):
                 dep_idx = result.index(dep)
                 self.assertTrue(dep_idx < node_idx)
 
+    def test_make_update_levels(self):
+        tree = get_node_tree()
+        levels = make_update_levels(tree)
+        level_of = {name: idx for idx, level in enumerate(levels) for name in level}
+
+        self.assertEqual(set(level_of.keys()), set(tree.nodes.keys()))
+        for node, deps in make_dep_dict(tree).items():
+            for dep in deps:
+                self.assertTrue(level_of[dep] < level_of[node])
+
+    def test_update_parallel(self):
+        tree = get_node_tree()
+        graph = do_update_parallel([make_update_list(tree)], tree.nodes)
+        processed = [item["name"] for item in graph]
+        for node, deps in make_dep_dict(tree).items():
+            for dep in deps:
+                self.assertTrue(processed.index(dep) < processed.index(node))
+
+class SortNodesTests(SverchokTestCase):
+
+    deps = {'B': {'A'}, 'C': {'A', 'B'}, 'D': {'X'}, 'E': {'C', 'D'}}
+    nodes = {'A', 'B', 'C', 'D', 'E', 'X'}
+
+    def test_sort_nodes(self):
+        result = sort_nodes(self.nodes, self.deps)
+        self.assertEqual(set(result), self.nodes)
+        for node, deps in self.deps.items():
+            for dep in deps:
+                self.assertTrue(result.index(dep) < result.index(node))
+
+    def test_sort_nodes_by_levels(self):
+        result = sort_nodes_by_levels(self.nodes, self.deps)
+        self.assertEqual(result, [['A', 'X'], ['B', 'D'], ['C'], ['E']])
+
+    def test_sort_subset(self):
+        result = sort_nodes({'C', 'E'}, self.deps)
+        self.assertEqual(result, ['C', 'E'])
+
+    def test_cycle(self):
+        deps = dict(self.deps, A={'C'})
+        for sort in (sort_nodes, sort_nodes_by_levels):
+            with self.assertRaises(SvCyclicTreeError) as ctx:
+                sort(self.nodes, deps)
+            cycle = ctx.exception.cycle
+            self.assertEqual(cycle[0], cycle[-1])
+            self.assertTrue(set(cycle) <= {'A', 'B', 'C'})
@@ -0,0 +1,100 @@
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.sv_itertools import recurse_fx, recurse_fxy
+from sverchok.utils.sv_jagged_array import SvJaggedArray
+from sverchok.utils.sv_vectorize import numpy_fx, numpy_fxy
+from sverchok.nodes.number.scalar_mk2 import func_dict, numpy_func_dict
+
+class VectorizeTests(SverchokTestCase):
+
+    def assert_nested_equal(self, data1, data2):
+        if isinstance(data1, (list, tuple)):
+            self.assertEqual(len(data1), len(data2))
+            for item1, item2 in zip(data1, data2):
+                self.assert_nested_equal(item1, item2)
+        else:
+            self.assertAlmostEqual(data1, data2, places=8)
+
+    def assert_same_as_python(self, x, y, numpy_func, python_func):
+        result = numpy_fxy(x, y, numpy_func)
+        self.assertIsNotNone(result)
+        self.assert_nested_equal(result, recurse_fxy(x, y, python_func))
+
+    def test_regular(self):
+        self.assert_same_as_python([[1, 2, 3], [4, 5, 6]], [[10, 20, 30]], np.add, lambda x, y: x+y)
+
+    def test_repeat_last(self):
+        self.assert_same_as_python([[1, 2, 3, 4]], [[1, 2]], np.multiply, lambda x, y: x*y)
+
+    def test_deeper_nesting(self):
+        self.assert_same_as_python([[[1, 2], [3, 4]]], [[1, 2]], np.subtract, lambda x, y: x-y)
+
+    def test_jagged(self):
+        self.assert_same_as_python([[1.0, 2.0, 3.0], [4.0]], [[2.0], [1.0, 3.0]],
+                                   np.true_divide, lambda x, y: x/y)
+
+    def test_jagged_and_scalar_per_object(self):
+        self.assert_same_as_python([[1, 2, 3], [4]], [5, 6], np.add, lambda x, y: x+y)
+
+    def test_fx(self):
+        x = [[0.0, 0.5], [1.0]]
+        self.assert_nested_equal(numpy_fx(x, np.sin), recurse_fx(x, np.sin))
+
+    def test_int_result(self):
+        result = numpy_fxy([[1, 2]], [[3]], np.add)
+        self.assertEqual(result, [[4, 5]])
+        self.assertIsInstance(result[0][0], int)
+
+    def test_vectors(self):
+        vertices = [[(1, 2, 3), (4, 5, 6)], [(7, 8, 9)]]
+        result = numpy_fxy(vertices, [[2, 3]], np.multiply, item_ndim=(1, 0))
+        self.assertEqual(result, [[(2, 4, 6), (12, 15, 18)], [(14, 16, 18), (21, 24, 27)]])
+
+    def test_jagged_vectors(self):
+        vertices = [[(1, 2, 3), (4, 5, 6)], [(7, 8, 9)]]
+        result = numpy_fx(vertices, np.negative, item_ndim=1)
+        self.assertEqual(result, [[(-1, -2, -3), (-4, -5, -6)], [(-7, -8, -9)]])
+
+    def test_payload(self):
+        x = SvJaggedArray.from_lists([[1, 2, 3], [4]])
+        result = numpy_fx(x, lambda a: a * 2)
+        self.assertIsInstance(result, SvJaggedArray)
+        self.assertEqual(result.tolist(), [[2.0, 4.0, 6.0], [8.0]])
+
+    def test_fallback(self):
+        # division by zero and empty lists are left to python implementation
+        self.assertIsNone(numpy_fxy([[1.0]], [[0.0]], np.true_divide))
+        self.assertIsNone(numpy_fx([[]], np.sin))
+        self.assertIsNone(numpy_fx([["a"]], np.sin))
+
+    def test_integer_overflow(self):
+        # numpy integers would wrap around, python ones grow
+        self.assertIsNone(numpy_fxy([[10, 2]], [[30]], np.power))
+        self.assertIsNone(numpy_fxy([[2**40]], [[2**40]], np.multiply))
+        self.assertEqual(numpy_fxy([[10, 2]], [[3]], np.power), [[1000, 8]])
+
+    def test_mixed_int_float(self):
+        self.assertIsNone(numpy_fxy([[1, 2.5]], [[1]], np.add))
+        self.assertIsNone(numpy_fx([[1, 2], [2.5]], np.negative))
+        result = numpy_fxy([[1.0, 2.5]], [[1]], np.add)
+        self.assertEqual(result, [[2.0, 3.5]])
+
+    def assert_same_types(self, x, y, mode):
+        result = numpy_fxy(x, y, numpy_func_dict[mode])
+        expected = recurse_fxy(x, y, func_dict[mode][1])
+        if result is not None:
+            self.assertEqual(repr(result), repr(expected))
+
+    def test_min_max_mixed(self):
+        # python returns integer winners as they are
+        for mode in ["MIN", "MAX"]:
+            with self.subTest(mode=mode):
+                self.assertIsNone(numpy_fxy([[3, 1, 7]], [[2.0, 5.5]], numpy_func_dict[mode]))
+                self.assert_same_types([[3, 1, 7]], [[2.0, 5.5]], mode)
+                self.assert_same_types([[3, 1, 7]], [[2, 5]], mode)
+
+    def test_fmod(self):
+        # math.fmod returns floats for integers too
+        self.assertEqual(numpy_fxy([[7, -7]], [[3]], numpy_func_dict["FMOD"]), [[1.0, -1.0]])
+        self.assert_same_types([[7, -7]], [[3]], "FMOD")
@@ -0,0 +1,47 @@
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.voronoi import Site, computeDelaunayTriangulation
+from sverchok.utils.voronoi_array import delaunay_triangles, voronoi_cells, bounding_box
+
+def polygon_areas(vertices, loops, offsets):
+    x, y = vertices[loops, 0], vertices[loops, 1]
+    following = np.arange(1, len(loops) + 1)
+    following[offsets[1:] - 1] = offsets[:-1]
+    return np.add.reduceat(x * y[following] - x[following] * y, offsets[:-1]) / 2.0
+
+class VoronoiArrayTests(SverchokTestCase):
+
+    def setUp(self):
+        self.points = np.random.RandomState(0).rand(200, 2)
+
+    def test_delaunay_same_as_old(self):
+        expected = computeDelaunayTriangulation([Site(x, y) for x, y in self.points])
+        expected = set(tuple(sorted(triangle)) for triangle in expected if -1 not in triangle)
+        triangles = delaunay_triangles(self.points)
+        self.assertEqual(set(tuple(sorted(triangle)) for triangle in triangles.tolist()), expected)
+
+    def test_delaunay_grid(self):
+        grid = [(x, y, 0) for x in range(5) for y in range(5)]
+        triangles = delaunay_triangles(grid)
+        self.assertEqual(len(triangles), 32)
+        self.assertEqual(len(delaunay_triangles(grid[:2])), 0)
+
+    def test_cells(self):
+        bounds = bounding_box(self.points, 0.1)
+        vertices, loops, offsets, sites = voronoi_cells(self.points, bounds)
+        self.assertEqual(sorted(sites.tolist()), list(range(len(self.points))))
+        areas = polygon_areas(vertices, loops, offsets)
+        self.assertTrue((areas > 0).all())
+        self.assertAlmostEqual(areas.sum(), np.prod(bounds[2] - bounds[0]), places=9)
+        # each cell is the closest to its own point
+        counts = np.diff(offsets)
+        centers = np.stack([np.add.reduceat(vertices[loops, i], offsets[:-1]) / counts for i in range(2)], axis=1)
+        distances = ((centers[:, np.newaxis] - self.points[np.newaxis]) ** 2).sum(axis=2)
+        self.assertEqual(distances.argmin(axis=1).tolist(), sites.tolist())
+
+    def test_cells_convex_bounds(self):
+        diamond = [(0.5, -0.5), (1.5, 0.5), (0.5, 1.5), (-0.5, 0.5)]
+        vertices, loops, offsets, sites = voronoi_cells(self.points, diamond[::-1])
+        self.assertAlmostEqual(polygon_areas(vertices, loops, offsets).sum(), 2.0, places=9)
+
@@ -23,7 +23,7 @@ from bpy.props import StringProperty, BoolProperty, FloatProperty
 import sverchok
 from sverchok.utils.sv_update_utils import version_and_sha
 from sverchok.core.update_system import process_from_nodes
-from sverchok.utils import profile
+from sverchok.utils import profile, sv_stats
 
 objects_nodes_set = {'ObjectsNode', 'ObjectsNodeMK2', 'SvObjectsNodeMK3'}
 
@@ -288,6 +288,18 @@ class SverchokToolsMenu(bpy.types.Panel):
                 row.operator("node.sverchok_profile_save", text="Save data", icon="SAVE_AS")
                 profile_col.operator("node.sverchok_profile_reset", text="Reset data", icon="X")
 
+        if addon.preferences.developer_mode:
+            stats_col = layout.column(align=True)
+            if sv_stats.is_currently_enabled:
+                stats_col.operator("node.sverchok_stats_toggle", text="Stop node statistics", icon="CANCEL")
+            else:
+                stats_col.operator("node.sverchok_stats_toggle", text="Collect node statistics", icon="TIME")
+            if sv_stats.have_gathered_stats():
+                row = stats_col.row(align=True)
+                row.operator("node.sverchok_stats_dump", text="Dump stats", icon="TEXT").tree_name = ng_name
+                row.operator("node.sverchok_stats_save_trace", text="Save trace", icon="SAVE_AS")
+                stats_col.operator("node.sverchok_stats_reset", text="Reset stats", icon="X")
+
         row = layout.row(align=True)
         col = row.column(align=True)
         col.scale_y = 3.0
@@ -0,0 +1,249 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Performance benchmarks support.
+
+Benchmarks are looked up in tests/ directory, in files named *_benchmarks.py,
+as subclasses of SverchokBenchmark. Each method named bench_* is one
+benchmark; it prepares what it needs and calls self.measure() with
+a callable to be timed. Run them with run_benchmarks.sh, e.g.
+
+    $ ./run_benchmarks.sh --save-baseline
+    $ ./run_benchmarks.sh --tolerance 0.2
+
+Results are compared with stored baseline, and benchmarks which became
+slower than baseline by more than tolerance are reported as regressions.
+"""
+
+import importlib
+import inspect
+import json
+import statistics
+import sys
+import time
+from glob import glob
+from os.path import join, basename, exists
+
+from sverchok.utils.logging import info, error
+from sverchok.utils.testing import (
+    get_tests_path, create_node_tree, remove_node_tree, create_node)
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+##########################################
+# Synthetic trees
+##########################################
+
+def link(tree, from_node, from_socket, to_node, to_socket):
+    tree.links.new(from_node.outputs[from_socket], to_node.inputs[to_socket])
+
+def make_synthetic_tree(name, width=4, depth=10, size=1000):
+    """
+    Create tree of `width' independent chains, each of them consisting of
+    a Range Float node generating `size' numbers, followed by `depth'
+    Math nodes. Returns (tree, list of first nodes of chains).
+    """
+    tree = create_node_tree(name)
+    tree.freeze(True)
+    heads = []
+    for chain in range(width):
+        source = create_node("SvGenFloatRange", tree.name)
+        source.stop_ = size
+        source.location = (0, -200 * chain)
+        heads.append(source)
+        previous = source
+        for step in range(depth):
+            math = create_node("SvScalarMathNodeMK2", tree.name)
+            math.location = (200 * (step + 1), -200 * chain)
+            link(tree, previous, 0, math, 0)
+            previous = math
+    tree.unfreeze(True)
+    return tree, heads
+
+##########################################
+# Benchmark base class
+##########################################
+
+class SverchokBenchmark(object):
+    """
+    Base class for benchmarks.
+    Class attributes `repeat' and `size' can be overriden
+    by command line options of run_benchmarks.sh.
+    """
+
+    repeat = 5
+    size = 1000
+    tree_name = "BenchmarkTree"
+
+    def __init__(self):
+        self.results = {}
+        self.failures = []
+        self.current = None
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        remove_node_tree(self.tree_name)
+
+    def measure(self, func, name=None):
+        """
+        Call func `repeat' times, store median time under name
+        (by default, the name of running bench_* method).
+        """
+        if name is None:
+            name = self.current
+        times = []
+        for i in range(self.repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        result = statistics.median(times)
+        self.results["{}.{}".format(type(self).__name__, name)] = result
+        info("%s.%s: %.6f s", type(self).__name__, name, result)
+        return result
+
+    def run(self):
+        for name, method in inspect.getmembers(self, inspect.ismethod):
+            if not name.startswith("bench_"):
+                continue
+            self.current = name
+            self.setUp()
+            try:
+                method()
+            except Exception as e:
+                error("Benchmark %s.%s failed: %s", type(self).__name__, name, e)
+                self.failures.append("{}.{}".format(type(self).__name__, name))
+            finally:
+                self.tearDown()
+        return self.results
+
+##########################################
+# Running and baselines
+##########################################
+
+def discover_benchmarks(pattern="*_benchmarks.py"):
+    tests_path = get_tests_path()
+    if tests_path not in sys.path:
+        sys.path.append(tests_path)
+    classes = []
+    for path in sorted(glob(join(tests_path, pattern))):
+        module = importlib.import_module(basename(path)[:-3])
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if issubclass(cls, SverchokBenchmark) and cls is not SverchokBenchmark:
+                classes.append(cls)
+    return classes
+
+def run_all_benchmarks(size=None, repeat=None, name_filter=None):
+    """
+    Returns dictionary of results, list of names of failed benchmarks
+    and set of names of benchmark classes that were run.
+    """
+    results = {}
+    failures = []
+    class_names = set()
+    for cls in discover_benchmarks():
+        if name_filter and name_filter not in cls.__name__:
+            continue
+        benchmark = cls()
+        if size is not None:
+            benchmark.size = size
+        if repeat is not None:
+            benchmark.repeat = repeat
+        results.update(benchmark.run())
+        failures.extend(benchmark.failures)
+        class_names.add(cls.__name__)
+    return results, failures, class_names
+
+def load_baseline(path):
+    if not exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_baseline(path, results):
+    with open(path, 'w') as f:
+        json.dump(results, f, sort_keys=True, indent=2)
+    info("Benchmark baseline saved to %s", path)
+
+def find_regressions(results, baseline, tolerance=0.25):
+    """
+    Returns list of (name, baseline time, current time)
+    for benchmarks slower than baseline by more than tolerance.
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        expected = baseline.get(name)
+        if expected is not None and current > expected * (1.0 + tolerance):
+            regressions.append((name, expected, current))
+    return regressions
+
+def find_missing(results, failures, baseline, class_names):
+    """
+    Returns names of benchmarks present in baseline which belong to classes
+    that were run, but did not produce a result and did not fail either
+    (for example, bench_* method was renamed or removed).
+    """
+    missing = []
+    for name in sorted(baseline):
+        class_name = name.partition('.')[0]
+        if class_name in class_names and name not in results and name not in failures:
+            missing.append(name)
+    return missing
+
+def main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Run Sverchok benchmarks")
+    parser.add_argument("--baseline", default=join(get_tests_path(), DEFAULT_BASELINE),
+                        help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store results as new baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown relative to baseline, 0.25 means 25%%")
+    parser.add_argument("--size", type=int, help="Override data size of benchmarks")
+    parser.add_argument("--repeat", type=int, help="Override number of repetitions")
+    parser.add_argument("--filter", help="Run only benchmark classes containing this string")
+    args = parser.parse_args(argv)
+
+    results, failures, class_names = run_all_benchmarks(args.size, args.repeat, args.filter)
+    for name in failures:
+        error("Failed: %s", name)
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        return not failures
+
+    baseline = load_baseline(args.baseline)
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for name, expected, current in regressions:
+        error("Regression: %s took %.6f s, baseline is %.6f s", name, current, expected)
+    missing = find_missing(results, failures, baseline, class_names)
+    for name in missing:
+        error("Missing: %s is in baseline, but was not run", name)
+    return not (regressions or failures or missing)
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    try:
+        if not main(argv):
+            # We have to raise an exception for Blender to exit with specified exit code.
+            raise Exception("Some benchmarks regressed, failed or are missing")
+        sys.exit(0)
+    except Exception as e:
+        print(e)
+        sys.exit(1)
@@ -0,0 +1,441 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+BSP tree CSG (the same algorithm as csg_core / csg_geom, by Evan Wallace),
+with polygons and planes stored in numpy arrays.
+
+Polygons are not objects: a set of polygons is a flat array of vertex
+indices with offsets, plus (P, 4) array of planes (normal, w) and an
+array of integer tags, which are inherited by pieces of split polygons.
+All polygons are split by a plane at once; only polygons spanning the
+plane are cut in python. The BSP tree is stored as arrays of node
+planes and child indices, and is built and traversed with explicit
+stacks, so there is no recursion.
+"""
+
+import numpy as np
+
+from sverchok.utils.sv_mesh_utils import remove_doubles, split_by_offsets
+
+# Tolerance used to decide if a point is on the plane
+EPSILON = 1e-5
+
+COPLANAR = 0
+FRONT = 1
+BACK = 2
+SPANNING = 3
+
+
+class CSGVertices(object):
+    """Growable array of vertex positions, shared by all polygons of one operation"""
+
+    def __init__(self, capacity=1024):
+        self.data = np.zeros((capacity, 3))
+        self.count = 0
+
+    @property
+    def positions(self):
+        return self.data[:self.count]
+
+    def add(self, positions):
+        """Append (N, 3) positions, returns index of the first one"""
+        positions = np.asarray(positions, dtype=np.float64).reshape((-1, 3))
+        start = self.count
+        end = start + len(positions)
+        if end > len(self.data):
+            data = np.zeros((max(end, 2 * len(self.data)), 3))
+            data[:start] = self.data[:start]
+            self.data = data
+        self.data[start:end] = positions
+        self.count = end
+        return start
+
+
+class CSGPolygons(object):
+    """
+    Set of convex polygons: polygon i consists of vertices
+    loops[offsets[i]:offsets[i+1]], lies in planes[i] and has tag tags[i].
+    """
+
+    def __init__(self, loops, offsets, planes, tags):
+        self.loops = loops
+        self.offsets = offsets
+        self.planes = planes
+        self.tags = tags
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64),
+                   np.zeros((0, 4)), np.zeros(0, dtype=np.int64))
+
+    @classmethod
+    def from_lists(cls, loops_list, planes, tags):
+        if not loops_list:
+            return cls.empty()
+        offsets = np.zeros(len(loops_list) + 1, dtype=np.int64)
+        np.cumsum([len(loop) for loop in loops_list], out=offsets[1:])
+        loops = np.fromiter((i for loop in loops_list for i in loop), dtype=np.int64, count=offsets[-1])
+        return cls(loops, offsets, planes, tags)
+
+    @classmethod
+    def from_pydata(cls, vertices, verts, faces, tag=0):
+        """
+        Add verts to CSGVertices vertices and make polygons of faces.
+        Faces with less than 3 vertices or zero area are skipped.
+        """
+        faces = [face for face in faces if len(face) >= 3]
+        if not faces:
+            return cls.empty()
+        start = vertices.add(verts)
+        polygons = cls.from_lists([[start + i for i in face] for face in faces],
+                                  np.zeros((len(faces), 4)), np.full(len(faces), tag, dtype=np.int64))
+
+        # Newell's method, robust for any planar polygon
+        positions = vertices.positions
+        current = positions[polygons.loops]
+        following = positions[polygons.loops[polygons.next_in_loop()]]
+        normals = np.add.reduceat(np.cross(current, following), polygons.offsets[:-1])
+        lengths = np.linalg.norm(normals, axis=1)
+        good = np.nonzero(lengths > 1e-12)[0]
+        polygons = polygons.take(good)
+        normals = normals[good] / lengths[good, np.newaxis]
+        polygons.planes[:, :3] = normals
+        polygons.planes[:, 3] = (normals * positions[polygons.loops[polygons.offsets[:-1]]]).sum(axis=1)
+        return polygons
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def next_in_loop(self):
+        """For each item of loops, index of the next one in the same polygon"""
+        following = np.arange(1, len(self.loops) + 1)
+        following[self.offsets[1:] - 1] = self.offsets[:-1]
+        return following
+
+    def select(self, mask):
+        """Subset of polygons for which mask is True"""
+        return self.take(np.nonzero(mask)[0])
+
+    def take(self, indices):
+        """Subset of polygons with given indices"""
+        lengths = self.offsets[indices + 1] - self.offsets[indices]
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.repeat(self.offsets[indices] - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return CSGPolygons(self.loops[positions], offsets, self.planes[indices], self.tags[indices])
+
+    @staticmethod
+    def concatenate(sets):
+        sets = [s for s in sets if len(s)]
+        if not sets:
+            return CSGPolygons.empty()
+        if len(sets) == 1:
+            return sets[0]
+        offsets = [np.zeros(1, dtype=np.int64)]
+        shift = 0
+        for s in sets:
+            offsets.append(s.offsets[1:] + shift)
+            shift += s.offsets[-1]
+        return CSGPolygons(np.concatenate([s.loops for s in sets]), np.concatenate(offsets),
+                           np.concatenate([s.planes for s in sets]),
+                           np.concatenate([s.tags for s in sets]))
+
+    def flipped(self):
+        """The same polygons facing the other direction"""
+        lengths = self.lengths
+        ends = np.repeat(self.offsets[1:] - 1, lengths)
+        starts = np.repeat(self.offsets[:-1], lengths)
+        reverse = ends - (np.arange(len(self.loops)) - starts)
+        return CSGPolygons(self.loops[reverse], self.offsets, -self.planes, self.tags)
+
+    def split(self, vertices, plane):
+        """
+        Split polygons by plane. Returns polygons (coplanar facing the same
+        direction as the plane, coplanar facing the other direction, in front
+        of the plane, in back of the plane); polygons spanning the plane are
+        cut into front and back pieces, new vertices are added to vertices.
+        """
+        if not len(self):
+            return (self, self, self, self)
+        normal, w = plane[:3], plane[3]
+        distances = vertices.positions[self.loops].dot(normal) - w
+        types = (distances > EPSILON).astype(np.int8) | ((distances < -EPSILON).astype(np.int8) << 1)
+        polygon_types = np.bitwise_or.reduceat(types, self.offsets[:-1])
+
+        counts = np.bincount(polygon_types, minlength=4)
+        if counts[FRONT] == len(self):
+            return (self.EMPTY, self.EMPTY, self, self.EMPTY)
+        if counts[BACK] == len(self):
+            return (self.EMPTY, self.EMPTY, self.EMPTY, self)
+
+        coplanar_front = coplanar_back = front = back = self.EMPTY
+        if counts[COPLANAR]:
+            coplanar = polygon_types == COPLANAR
+            facing = self.planes[:, :3].dot(normal) > 0
+            coplanar_front = self.select(coplanar & facing)
+            coplanar_back = self.select(coplanar & ~facing)
+        if counts[FRONT]:
+            front = self.select(polygon_types == FRONT)
+        if counts[BACK]:
+            back = self.select(polygon_types == BACK)
+
+        if counts[SPANNING]:
+            spanning = np.nonzero(polygon_types == SPANNING)[0]
+            front_pieces, back_pieces = self.split_spanning(vertices, spanning, types, distances)
+            front = CSGPolygons.concatenate([front, front_pieces])
+            back = CSGPolygons.concatenate([back, back_pieces])
+        return coplanar_front, coplanar_back, front, back
+
+    def split_spanning(self, vertices, spanning, types, distances):
+        """Cut polygons spanning the plane into front and back pieces"""
+        offsets = self.offsets.tolist()
+        loops = self.loops.tolist()
+        types = types.tolist()
+        distances = distances.tolist()
+
+        first_new = vertices.count
+        new_from, new_to, new_t = [], [], []
+        front_loops, front_source = [], []
+        back_loops, back_source = [], []
+        for p in spanning.tolist():
+            start, end = offsets[p], offsets[p + 1]
+            n = end - start
+            f, b = [], []
+            for i in range(start, end):
+                j = start + (i - start + 1) % n
+                ti, tj = types[i], types[j]
+                vi = loops[i]
+                if ti != BACK:
+                    f.append(vi)
+                if ti != FRONT:
+                    b.append(vi)
+                if (ti | tj) == SPANNING:
+                    new_index = first_new + len(new_t)
+                    new_from.append(vi)
+                    new_to.append(loops[j])
+                    new_t.append(distances[i] / (distances[i] - distances[j]))
+                    f.append(new_index)
+                    b.append(new_index)
+            if len(f) >= 3:
+                front_loops.append(f)
+                front_source.append(p)
+            if len(b) >= 3:
+                back_loops.append(b)
+                back_source.append(p)
+
+        if new_t:
+            positions = vertices.positions
+            start, end = positions[new_from], positions[new_to]
+            vertices.add(start + (end - start) * np.array(new_t)[:, np.newaxis])
+
+        front = CSGPolygons.from_lists(front_loops, self.planes[front_source], self.tags[front_source])
+        back = CSGPolygons.from_lists(back_loops, self.planes[back_source], self.tags[back_source])
+        return front, back
+
+
+CSGPolygons.EMPTY = CSGPolygons.empty()
+
+
+class BSPTree(object):
+    """
+    BSP tree of polygons. Node i has plane planes[i], polygons lying in
+    that plane polygons[i], and child nodes front[i] and back[i] (-1 if none).
+    Node 0 is the root; the tree is empty if there are no nodes.
+    """
+
+    def __init__(self, vertices, polygons=None):
+        self.vertices = vertices
+        self.planes = np.zeros((16, 4))
+        self.front = np.full(16, -1, dtype=np.int64)
+        self.back = np.full(16, -1, dtype=np.int64)
+        self.polygons = []
+        if polygons is not None:
+            self.build(polygons)
+
+    @property
+    def count(self):
+        return len(self.polygons)
+
+    def new_node(self, plane):
+        idx = self.count
+        if idx == len(self.planes):
+            size = 2 * idx
+            self.planes = np.resize(self.planes, (size, 4))
+            self.front = np.concatenate([self.front, np.full(idx, -1, dtype=np.int64)])
+            self.back = np.concatenate([self.back, np.full(idx, -1, dtype=np.int64)])
+        self.planes[idx] = plane
+        self.polygons.append(CSGPolygons.empty())
+        return idx
+
+    def build(self, polygons):
+        """Add polygons to the tree, splitting them by planes of nodes"""
+        if not len(polygons):
+            return
+        if not self.count:
+            self.new_node(polygons.planes[0])
+        stack = [(0, polygons)]
+        while stack:
+            node, polygons = stack.pop()
+            coplanar_front, coplanar_back, front, back = polygons.split(self.vertices, self.planes[node])
+            self.polygons[node] = CSGPolygons.concatenate([self.polygons[node], coplanar_front, coplanar_back])
+            for side, pieces in (('back', back), ('front', front)):
+                if len(pieces):
+                    child = getattr(self, side)[node]
+                    if child < 0:
+                        child = self.new_node(pieces.planes[0])
+                        # arrays can be reallocated by new_node()
+                        getattr(self, side)[node] = child
+                    stack.append((child, pieces))
+
+    def invert(self):
+        """Convert solid space to empty space and empty space to solid space"""
+        count = self.count
+        self.planes[:count] *= -1
+        front = self.front[:count].copy()
+        self.front[:count] = self.back[:count]
+        self.back[:count] = front
+        self.polygons = [polygons.flipped() for polygons in self.polygons]
+
+    def clip_polygons(self, polygons):
+        """Remove all parts of polygons that are inside this tree"""
+        if not self.count or not len(polygons):
+            return polygons
+        result = []
+        # None instead of node means that polygons are kept
+        stack = [(0, polygons)]
+        while stack:
+            node, polygons = stack.pop()
+            if node is None:
+                result.append(polygons)
+                continue
+            coplanar_front, coplanar_back, front, back = polygons.split(self.vertices, self.planes[node])
+            front = CSGPolygons.concatenate([coplanar_front, front])
+            back = CSGPolygons.concatenate([coplanar_back, back])
+            # polygons in back of a leaf are inside and dropped
+            if self.back[node] >= 0 and len(back):
+                stack.append((self.back[node], back))
+            if len(front):
+                stack.append((self.front[node] if self.front[node] >= 0 else None, front))
+        return CSGPolygons.concatenate(result)
+
+    def clip_to(self, other):
+        """Remove all polygons in this tree that are inside the other tree"""
+        if not self.count:
+            return
+        # clip polygons of all nodes at once, tagged with their node index
+        polygons = CSGPolygons.concatenate([
+            CSGPolygons(p.loops, p.offsets, p.planes, np.full(len(p), node, dtype=np.int64))
+            for node, p in enumerate(self.polygons)])
+        clipped = other.clip_polygons(polygons)
+        order = np.argsort(clipped.tags, kind='stable')
+        bounds = np.searchsorted(clipped.tags[order], np.arange(self.count + 1))
+        self.polygons = [clipped.take(order[bounds[node]:bounds[node + 1]]) for node in range(self.count)]
+
+    def all_polygons(self):
+        """All polygons of the tree: of the node, then of front and back subtrees"""
+        if not self.count:
+            return CSGPolygons.empty()
+        result = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            result.append(self.polygons[node])
+            if self.back[node] >= 0:
+                stack.append(self.back[node])
+            if self.front[node] >= 0:
+                stack.append(self.front[node])
+        return CSGPolygons.concatenate(result)
+
+
+def csg_union(a, b):
+    a.clip_to(b)
+    b.clip_to(a)
+    b.invert()
+    b.clip_to(a)
+    b.invert()
+    a.build(b.all_polygons())
+    return a.all_polygons()
+
+
+def csg_subtract(a, b):
+    a.invert()
+    a.clip_to(b)
+    b.clip_to(a)
+    b.invert()
+    b.clip_to(a)
+    b.invert()
+    a.build(b.all_polygons())
+    a.invert()
+    return a.all_polygons()
+
+
+def csg_intersect(a, b):
+    a.invert()
+    b.clip_to(a)
+    b.invert()
+    a.clip_to(b)
+    b.clip_to(a)
+    a.build(b.all_polygons())
+    a.invert()
+    return a.all_polygons()
+
+
+operations = {'JOIN': csg_union, 'DIFF': csg_subtract, 'ITX': csg_intersect}
+
+
+def to_pydata(vertices, polygons):
+    """Vertices and faces of polygons, with coincident vertices merged"""
+    positions = vertices.positions[polygons.loops]
+    kept, index = remove_doubles(positions)
+    return positions[kept].tolist(), split_by_offsets(index, polygons.offsets)
+
+
+def boolean(verts_a, faces_a, verts_b, faces_b, operation):
+    """
+    Boolean operation ('ITX', 'JOIN' or 'DIFF') on two meshes.
+    Returns [vertices, faces] of the result.
+    """
+    vertices = CSGVertices(max(1024, 2 * (len(verts_a) + len(verts_b))))
+    a = BSPTree(vertices, CSGPolygons.from_pydata(vertices, verts_a, faces_a))
+    b = BSPTree(vertices, CSGPolygons.from_pydata(vertices, verts_b, faces_b))
+    return list(to_pydata(vertices, operations[operation](a, b)))
+
+
+def boolean_balanced(meshes, operation):
+    """
+    The same as applying operation to list of (vertices, faces) meshes one
+    by one, (((m0 op m1) op m2) op m3)..., but combining meshes pairwise,
+    ((m0 op m1) op (m2 op m3))..., so that intermediate results stay small.
+    Difference m0 - m1 - m2 - ... is computed as m0 - (m1 + m2 + ...).
+    """
+    if operation == 'DIFF':
+        if len(meshes) == 1:
+            return list(meshes[0])
+        return boolean(*meshes[0], *boolean_balanced(meshes[1:], 'JOIN'), operation)
+    meshes = list(meshes)
+    while len(meshes) > 1:
+        paired = [boolean(*meshes[i], *meshes[i + 1], operation) for i in range(0, len(meshes) - 1, 2)]
+        if len(meshes) % 2:
+            paired.append(meshes[-1])
+        meshes = paired
+    return list(meshes[0])
@@ -0,0 +1,244 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Headless batch evaluation of node trees.
+
+Load a tree exported to JSON, evaluate it once for each set of node
+property values from parameters file, and write data of selected output
+sockets into JSON lines file, one line per parameter set.
+
+Usage (see also run_batch.sh):
+
+    blender -b --addons sverchok --python utils/sv_batch.py -- \\
+        --tree tree.json --params params.json \\
+        --output "Box:Vertices" --output "Box:Edges" \\
+        --result result.jsonl --jobs 8
+
+Parameters file contains a list of parameter sets, each of which
+maps node names to dictionaries of property values:
+
+    [{"Box": {"Size": 1.0, "Divx": 2}}, {"Box": {"Size": 2.0, "Divx": 4}}]
+
+With --jobs N > 1, parameter sets are split into N chunks, which are
+evaluated by separate Blender processes; results are merged in order.
+
+Most nodes compute only outputs that are linked, so requested output
+sockets are linked to reroute nodes before evaluation. An output is
+still null in results if its node did not produce any data.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+
+from sverchok.core.update_system import build_update_list, process_tree
+from sverchok.core.socket_data import get_output_socket_data
+from sverchok.utils.logging import info, error, exception
+from sverchok.utils.sv_IO_panel_tools import import_tree
+
+BATCH_TREE_NAME = "BatchTree"
+
+
+def load_tree(tree_path, tree_name=BATCH_TREE_NAME):
+    """
+    Create node tree and import the layout from JSON file into it.
+    """
+    old_tree = bpy.data.node_groups.get(tree_name)
+    if old_tree is not None:
+        bpy.data.node_groups.remove(old_tree)
+    ng = bpy.data.node_groups.new(name=tree_name, type="SverchCustomTreeType")
+    import_tree(ng, tree_path)
+    return ng
+
+
+def link_outputs(ng, outputs):
+    """
+    Link requested output sockets which are not linked to reroute nodes,
+    so that nodes compute data for them.
+    """
+    for spec in outputs:
+        node_name, socket_name = parse_output_spec(spec)
+        socket = ng.nodes[node_name].outputs[socket_name]
+        if not socket.is_linked:
+            reroute = ng.nodes.new('NodeReroute')
+            ng.links.new(socket, reroute.inputs[0])
+
+
+def apply_parameters(ng, parameters):
+    """
+    Set node properties, parameters is a dictionary
+    {node name: {property name: value}}.
+    """
+    for node_name, props in parameters.items():
+        node = ng.nodes.get(node_name)
+        if node is None:
+            raise KeyError("There is no node named `{}' in tree `{}'".format(node_name, ng.name))
+        for prop_name, value in props.items():
+            setattr(node, prop_name, value)
+
+
+def parse_output_spec(spec):
+    """
+    "Node name:Socket name" -> ("Node name", "Socket name")
+    """
+    node_name, sep, socket_name = spec.rpartition(':')
+    if not sep or not node_name or not socket_name:
+        raise ValueError("Output must be specified as `node name:socket name', got `{}'".format(spec))
+    return node_name, socket_name
+
+
+def to_json_data(data):
+    """Convert socket data (mathutils objects, numpy arrays) to JSON-compatible lists."""
+    if hasattr(data, "tolist"):
+        return data.tolist()
+    if isinstance(data, (str, int, float, bool)) or data is None:
+        return data
+    if hasattr(data, "__iter__"):
+        return [to_json_data(item) for item in data]
+    return str(data)
+
+
+def evaluate(ng, parameters, outputs):
+    """
+    Evaluate tree with given parameters.
+    Returns dictionary {output spec: data}.
+    """
+    ng.freeze(True)
+    try:
+        apply_parameters(ng, parameters)
+    finally:
+        ng.unfreeze(True)
+    build_update_list(ng)
+    process_tree(ng)
+
+    result = {}
+    for spec in outputs:
+        node_name, socket_name = parse_output_spec(spec)
+        socket = ng.nodes[node_name].outputs[socket_name]
+        result[spec] = to_json_data(get_output_socket_data(socket, default=None))
+    return result
+
+
+def run_chunk(tree_path, param_sets, outputs, result_path, start_index=0):
+    """
+    Evaluate the tree for each parameter set in this process,
+    writing results to result_path as they are ready.
+    """
+    ng = load_tree(tree_path)
+    link_outputs(ng, outputs)
+    failed = 0
+    with open(result_path, 'w') as f:
+        for idx, parameters in enumerate(param_sets, start_index):
+            record = {"index": idx, "parameters": parameters}
+            try:
+                record["outputs"] = evaluate(ng, parameters, outputs)
+            except Exception as e:
+                exception("Parameter set #%s failed: %s", idx, e)
+                record["error"] = str(e)
+                failed += 1
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+    info("Evaluated %s parameter sets, %s failed", len(param_sets), failed)
+    return failed
+
+
+def split_chunks(count, n_chunks):
+    """Split range(count) into n_chunks contiguous (start, end) ranges."""
+    n_chunks = max(1, min(n_chunks, count))
+    size, rest = divmod(count, n_chunks)
+    chunks = []
+    start = 0
+    for i in range(n_chunks):
+        end = start + size + (1 if i < rest else 0)
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+
+def run_parallel(args, param_count):
+    """
+    Run one Blender process per chunk of parameter sets and merge results.
+    """
+    chunks = split_chunks(param_count, args.jobs)
+    script = os.path.abspath(__file__)
+
+    def run(chunk_idx):
+        start, end = chunks[chunk_idx]
+        command = [bpy.app.binary_path, "-b", "--addons", "sverchok",
+                   "--python", script, "--python-exit-code", "1", "--",
+                   "--tree", args.tree, "--params", args.params,
+                   "--result", "{}.{}".format(args.result, chunk_idx),
+                   "--range", str(start), str(end)]
+        for spec in args.output:
+            command.extend(["--output", spec])
+        return subprocess.call(command)
+
+    with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        codes = list(executor.map(run, range(len(chunks))))
+
+    with open(args.result, 'w') as result:
+        for chunk_idx in range(len(chunks)):
+            part_path = "{}.{}".format(args.result, chunk_idx)
+            if os.path.exists(part_path):
+                with open(part_path) as part:
+                    for line in part:
+                        result.write(line)
+                os.remove(part_path)
+    return sum(1 for code in codes if code != 0)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Evaluate Sverchok node tree for sets of parameters")
+    parser.add_argument("--tree", required=True, help="Node tree exported to JSON")
+    parser.add_argument("--params", required=True, help="JSON file with list of parameter sets")
+    parser.add_argument("--output", action="append", default=[],
+                        help="Output socket to store, as `node name:socket name'. Can be repeated")
+    parser.add_argument("--result", required=True, help="Path of JSON lines file to write results to")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of Blender processes to run")
+    parser.add_argument("--range", type=int, nargs=2, metavar=("START", "END"),
+                        help="Evaluate only parameter sets START..END-1 (used internally)")
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_args(argv)
+    with open(args.params) as f:
+        param_sets = json.load(f)
+
+    if args.range:
+        start, end = args.range
+        return run_chunk(args.tree, param_sets[start:end], args.output, args.result, start)
+    if args.jobs > 1 and len(param_sets) > 1:
+        return run_parallel(args, len(param_sets))
+    return run_chunk(args.tree, param_sets, args.output, args.result)
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    try:
+        failed = main(argv)
+        sys.exit(1 if failed else 0)
+    except Exception as e:
+        error(e)
+        sys.exit(1)
@@ -0,0 +1,208 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Compilation of scalar formulas (like "sin(x) * n[0] + 1") into
+functions evaluated over whole numpy arrays at once.
+
+Only expressions built of numbers, variables x / X, items of n / N
+with constant index, arithmetic operators, comparisons, conditional
+expressions and whitelisted math functions can be vectorized;
+compile_formula() returns None for anything else, then the formula
+should be evaluated item by item with eval().
+
+Vectorized formula raises FloatingPointError where math module would
+raise an exception (division by zero, domain errors), so that the
+caller can re-evaluate with eval() and get the proper exception.
+"""
+
+import ast
+
+import numpy as np
+
+# numpy integers wrap around silently, larger results are left to python
+int_limit = 2.0 ** 62
+
+def _to_int(func):
+    def call(a):
+        a = func(a)
+        if not np.isfinite(a).all():
+            raise FloatingPointError("Can not convert infinity or NaN to integer")
+        if a.dtype.kind == 'f' and not (np.abs(a) < int_limit).all():
+            raise OverflowError("Integer is too large for numpy")
+        return a.astype(np.int64)
+    return call
+
+def _log(a, base=None):
+    if base is None:
+        return np.log(a)
+    return np.log(a) / np.log(base)
+
+def _round(a, ndigits=None):
+    if ndigits is None:
+        return _to_int(np.round)(a)
+    return np.round(a, ndigits)
+
+def _reduce(func):
+    def call(*args):
+        if len(args) < 2:
+            raise TypeError("Only two or more arguments are supported")
+        result = args[0]
+        for arg in args[1:]:
+            result = func(result, arg)
+        return result
+    return call
+
+# math module (and builtin) function -> numpy function with the same semantics
+numpy_functions = {
+    'acos': np.arccos, 'acosh': np.arccosh, 'asin': np.arcsin, 'asinh': np.arcsinh,
+    'atan': np.arctan, 'atan2': np.arctan2, 'atanh': np.arctanh,
+    'cos': np.cos, 'cosh': np.cosh, 'sin': np.sin, 'sinh': np.sinh,
+    'tan': np.tan, 'tanh': np.tanh,
+    'degrees': np.degrees, 'radians': np.radians,
+    'exp': np.exp, 'expm1': np.expm1, 'log': _log, 'log10': np.log10,
+    'log1p': np.log1p, 'log2': np.log2, 'sqrt': np.sqrt, 'pow': np.power,
+    'hypot': np.hypot, 'fabs': np.fabs, 'fmod': np.fmod, 'copysign': np.copysign,
+    'ceil': _to_int(np.ceil), 'floor': _to_int(np.floor), 'trunc': _to_int(np.trunc),
+    'isfinite': np.isfinite, 'isinf': np.isinf, 'isnan': np.isnan,
+    'abs': np.abs, 'int': _to_int(np.trunc), 'float': lambda a: np.asarray(a, dtype=np.float64),
+    'round': _round, 'min': _reduce(np.minimum), 'max': _reduce(np.maximum),
+}
+
+constants = {'e': np.e, 'pi': np.pi}
+
+# Expression syntax which can be vectorized; Index and Num are
+# only produced by older python versions.
+allowed_nodes = tuple(getattr(ast, name) for name in [
+    'Expression', 'BinOp', 'UnaryOp', 'Compare', 'IfExp',
+    'Call', 'Name', 'Load', 'Subscript', 'Index', 'Num', 'Constant',
+    'Add', 'Sub', 'Mult', 'Div', 'FloorDiv', 'Mod', 'Pow', 'USub', 'UAdd',
+    'Eq', 'NotEq', 'Lt', 'LtE', 'Gt', 'GtE'] if hasattr(ast, name))
+
+number_nodes = tuple(getattr(ast, name) for name in ['Num', 'Constant'] if hasattr(ast, name))
+
+def _index_value(node):
+    """Constant integer index of n[...] subscript, or None"""
+    if type(node).__name__ == 'Index':
+        node = node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = _index_value(node.operand)
+        return None if value is None else -value
+    value = getattr(node, 'n', getattr(node, 'value', None))
+    if isinstance(node, number_nodes) and type(value) is int:
+        return value
+    return None
+
+def _check(tree):
+    """
+    Returns set of used n indices,
+    or None if expression can not be vectorized.
+    """
+    indices = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, allowed_nodes):
+            return None
+        if isinstance(node, number_nodes) and type(getattr(node, 'n', getattr(node, 'value', None))) not in (int, float):
+            return None
+        if isinstance(node, ast.Compare) and len(node.ops) != 1:
+            return None
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in numpy_functions:
+                return None
+            if node.keywords or getattr(node, 'starargs', None) or getattr(node, 'kwargs', None):
+                return None
+        if isinstance(node, ast.Subscript):
+            if not isinstance(node.value, ast.Name) or node.value.id not in ('n', 'N'):
+                return None
+            index = _index_value(node.slice)
+            if index is None:
+                return None
+            indices.add(index)
+        if isinstance(node, ast.Name):
+            if node.id in ('n', 'N'):
+                continue
+            if node.id not in ('x', 'X') and node.id not in constants and node.id not in numpy_functions:
+                return None
+    # bare n / N (e.g. as function argument) is not supported
+    subscripted = {id(node.value) for node in ast.walk(tree) if isinstance(node, ast.Subscript)}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id in ('n', 'N') and id(node) not in subscripted:
+            return None
+    return indices
+
+class _IfToWhere(ast.NodeTransformer):
+    """a if cond else b -> _where(cond, a, b)"""
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        call = ast.Call(func=ast.Name(id='_where', ctx=ast.Load()),
+                        args=[node.test, node.body, node.orelse], keywords=[])
+        return ast.copy_location(call, node)
+
+class VectorFormula(object):
+    """
+    Formula compiled for evaluation over arrays.
+    Call it with array of x values and list of arrays of n values.
+    """
+
+    def __init__(self, formula, code, indices):
+        self.formula = formula
+        self.code = code
+        self.indices = indices
+
+    def __call__(self, x, ns):
+        """
+        Returns array of results of the same shape as x.
+        Raises FloatingPointError, ValueError, TypeError, IndexError
+        or OverflowError if formula can not be evaluated for these values
+        with numpy.
+        """
+        for index in self.indices:
+            # IndexError, as eval() would raise
+            ns[index]
+        result = self.evaluate(x, ns)
+        if result.dtype.kind not in 'biuf':
+            raise TypeError("Formula result is not numeric")
+        if result.dtype.kind in 'iu' and any(a.dtype.kind in 'iu' for a in [x] + list(ns)):
+            # integer products and powers can wrap around, check them in floats
+            check = self.evaluate(x.astype(np.float64), [a.astype(np.float64) for a in ns])
+            if not (np.abs(check) < int_limit).all():
+                raise OverflowError("Integer result is too large for numpy")
+        return np.broadcast_to(result, x.shape)
+
+    def evaluate(self, x, ns):
+        namespace = dict(numpy_functions)
+        namespace.update(constants)
+        namespace.update(x=x, X=x, n=ns, N=ns, _where=np.where, __builtins__={})
+        with np.errstate(divide='raise', over='raise', invalid='raise'):
+            return np.asarray(eval(self.code, namespace))
+
+def compile_formula(formula):
+    """
+    Returns VectorFormula, or None if formula can not be vectorized
+    (or is not a valid expression at all).
+    """
+    try:
+        tree = ast.parse(formula.strip(), mode='eval')
+    except SyntaxError:
+        return None
+    indices = _check(tree)
+    if indices is None:
+        return None
+    tree = ast.fix_missing_locations(_IfToWhere().visit(tree))
+    code = compile(tree, "<formula>", 'eval')
+    return VectorFormula(formula, code, indices)
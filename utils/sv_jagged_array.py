@@ -0,0 +1,147 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Array payloads that can be passed through sockets instead of nested lists.
+
+A socket can carry either a plain numpy array (for regular data, for example
+(N, M, 3) for N objects with M vertices each, or (N, 4, 4) for matrices)
+or SvJaggedArray, which packs lists of different lengths into one flat
+array plus offsets. Both are stored read-only, so consumers can use views
+without copying. Nodes that do not know about arrays get nested lists,
+converted on demand by SvGetSocket.
+"""
+
+import numpy as np
+
+
+def make_readonly(array):
+    """Return read-only view of numpy array"""
+    if not array.flags.writeable:
+        return array
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class SvJaggedArray(object):
+    """
+    List of arrays of different length, stored as one flat array.
+    Item i is data[offsets[i]:offsets[i+1]].
+
+    >>> arr = SvJaggedArray.from_lists([[(0,0,0), (1,0,0)], [(0,1,0)]])
+    >>> len(arr), arr.lengths
+    (2, array([2, 1]))
+    """
+
+    def __init__(self, data, offsets):
+        self.data = make_readonly(np.asarray(data))
+        self.offsets = make_readonly(np.asarray(offsets, dtype=np.int64))
+        if len(self.offsets) == 0 or self.offsets[0] != 0 or self.offsets[-1] != len(self.data):
+            raise ValueError("Offsets do not match data of length {}".format(len(self.data)))
+        self._lists = None
+
+    @classmethod
+    def from_lists(cls, lists, dtype=np.float64):
+        lengths = [len(item) for item in lists]
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        if offsets[-1]:
+            data = np.concatenate([np.asarray(item, dtype=dtype) for item in lists if len(item)])
+        else:
+            data = np.zeros((0,), dtype=dtype)
+        return cls(data, offsets)
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        lengths = [len(item) for item in arrays]
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(np.concatenate(arrays), offsets)
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def is_regular(self):
+        """True if all items have the same length"""
+        lengths = self.lengths
+        return len(lengths) == 0 or bool((lengths == lengths[0]).all())
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("SvJaggedArray index out of range")
+        return self.data[self.offsets[idx]:self.offsets[idx + 1]]
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __eq__(self, other):
+        if not isinstance(other, SvJaggedArray):
+            return NotImplemented
+        return (np.array_equal(self.offsets, other.offsets)
+                and np.array_equal(self.data, other.data))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __repr__(self):
+        return "<SvJaggedArray of {} items, {} values>".format(len(self), len(self.data))
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.offsets.nbytes
+
+    def tolist(self, cached=True):
+        """
+        Convert to nested lists. If cached is True, the conversion
+        is done only once and shared, so it must not be modified by caller.
+        """
+        if cached and self._lists is not None:
+            return self._lists
+        flat = self.data.tolist()
+        offsets = self.offsets.tolist()
+        lists = [flat[start:end] for start, end in zip(offsets, offsets[1:])]
+        if cached:
+            self._lists = lists
+        return lists
+
+
+def is_array_payload(data):
+    return isinstance(data, (np.ndarray, SvJaggedArray))
+
+
+def payload_to_lists(data, copy=True):
+    """
+    Convert array payload to nested python lists.
+    If copy is False, shared cached conversion can be returned.
+    """
+    if isinstance(data, SvJaggedArray):
+        return data.tolist(cached=not copy)
+    return data.tolist()
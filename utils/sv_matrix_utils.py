@@ -0,0 +1,183 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Batched operations on matrices stored as (N, 4, 4) numpy arrays.
+
+MatrixSocket can carry such an array as array payload (see
+sv_jagged_array); nodes which do not ask for arrays get the usual list
+of 4x4 nested lists. Matrices follow mathutils conventions: rows are
+the first index, translation is the last column, and the product
+a * b of Blender 2.7x is np.matmul(a, b).
+"""
+
+import numpy as np
+
+from sverchok.utils.sv_jagged_array import SvJaggedArray
+
+
+def matrices_to_array(data):
+    """
+    (N, 4, 4) float array from matrix socket data: array payload,
+    list of nested lists or list of mathutils.Matrix.
+    """
+    if isinstance(data, np.ndarray):
+        array = data
+    elif len(data) == 0:
+        return np.zeros((0, 4, 4))
+    else:
+        array = np.array([[tuple(row) for row in matrix] for matrix in data], dtype=np.float64)
+    if array.ndim == 2:
+        array = array[np.newaxis]
+    if array.shape[1:] != (4, 4):
+        raise ValueError("Matrices must be 4x4, got array of shape {}".format(array.shape))
+    return array
+
+
+def sanitize_matrices(matrices):
+    """Set values close to zero to exactly zero, as matrix_sanitizer does"""
+    return np.where(np.abs(matrices) <= 1.6e-5, 0.0, matrices)
+
+
+def repeat_last(array, count):
+    """Extend array to count items by repeating its last item, as match_long_repeat does"""
+    if len(array) >= count:
+        return array
+    return array[np.minimum(np.arange(count), len(array) - 1)]
+
+
+def repeat_cyclic(array, count):
+    """Take count items of array, starting again from the first item if it is shorter"""
+    if len(array) == count:
+        return array
+    return array[np.arange(count) % len(array)]
+
+
+def multiply_matrices(arrays):
+    """
+    Products of matrices: arrays is a list of (N_i, 4, 4) arrays, which
+    are matched by repeating the last matrix. Returns (max N_i, 4, 4).
+    """
+    count = max(len(array) for array in arrays)
+    result = repeat_last(arrays[0], count)
+    for array in arrays[1:]:
+        result = np.matmul(result, repeat_last(array, count))
+    return result
+
+
+def invert_matrices(matrices):
+    try:
+        return np.linalg.inv(matrices)
+    except np.linalg.LinAlgError:
+        raise ValueError("Matrix does not have an inverse")
+
+
+def apply_matrices(matrices, vertices):
+    """
+    Transform vertices by each of matrices.
+    matrices is (N, 4, 4), vertices is (M, 3) for the same vertices
+    for all matrices, or (N, M, 3). Returns (N, M, 3) array.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    rotation = np.swapaxes(matrices[:, :3, :3], 1, 2)
+    translation = matrices[:, np.newaxis, :3, 3]
+    return np.matmul(vertices, rotation) + translation
+
+
+def apply_matrices_to_objects(matrices, vertices_s):
+    """
+    Transform i-th object of vertices_s by i-th matrix; objects are
+    repeated cyclically if there are less objects than matrices.
+    vertices_s is (K, M, 3) array, SvJaggedArray or list of lists of vertices.
+    Returns (N, M, 3) array if all objects have the same number
+    of vertices, otherwise SvJaggedArray of N objects.
+    """
+    count = len(matrices)
+    if isinstance(vertices_s, SvJaggedArray) and vertices_s.is_regular() and len(vertices_s.data):
+        vertices_s = vertices_s.data.reshape((len(vertices_s), -1, 3))
+    elif not isinstance(vertices_s, (np.ndarray, SvJaggedArray)):
+        lengths = set(len(vertices) for vertices in vertices_s)
+        if len(lengths) == 1 and 0 not in lengths:
+            vertices_s = np.array(vertices_s, dtype=np.float64)
+
+    if isinstance(vertices_s, np.ndarray):
+        vertices_s = vertices_s.reshape((len(vertices_s), -1, 3))
+        if len(vertices_s) == 1:
+            return apply_matrices(matrices, vertices_s[0])
+        return apply_matrices(matrices, repeat_cyclic(vertices_s, count))
+
+    n_objects = len(vertices_s)
+    objects = []
+    for i in range(count):
+        vertices = np.asarray(vertices_s[i % n_objects], dtype=np.float64).reshape((-1, 3))
+        objects.append(apply_matrices(matrices[i:i+1], vertices)[0])
+    if not objects:
+        return np.zeros((0, 0, 3))
+    return SvJaggedArray.from_arrays(objects)
+
+
+def decompose_matrices(matrices):
+    """
+    Split matrices into translation (N, 3), rotation (N, 3, 3) and
+    scale (N, 3), the same way as Matrix.decompose() does: scale is
+    the length of basis vectors, negated if the matrix flips the space.
+    Matrices are supposed to have no shear.
+    """
+    basis = matrices[:, :3, :3]
+    translation = matrices[:, :3, 3].copy()
+    scale = np.linalg.norm(basis, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rotation = basis / scale[:, np.newaxis, :]
+    rotation[~np.isfinite(rotation)] = 0.0
+    negative = np.linalg.det(basis) < 0
+    rotation[negative] *= -1
+    scale[negative] *= -1
+    return translation, rotation, scale
+
+
+def compose_matrices(translation=None, rotation=None, scale=None, count=None):
+    """
+    Matrices translation * rotation * scale; any of components
+    can be None, which means identity.
+    """
+    if count is None:
+        count = max(len(c) for c in (translation, rotation, scale) if c is not None)
+    result = np.zeros((count, 4, 4))
+    result[:, 3, 3] = 1.0
+    if rotation is None:
+        result[:, :3, :3] = np.identity(3)
+    else:
+        result[:, :3, :3] = rotation
+    if scale is not None:
+        result[:, :3, :3] *= scale[:, np.newaxis, :]
+    if translation is not None:
+        result[:, :3, 3] = translation
+    return result
+
+
+def dupli_face_triangles(matrices):
+    """
+    Vertices (3N, 3) of N triangles, one per matrix, such that duplicating
+    an object by faces of these triangles places it by the matrices:
+    triangle i is the equilateral triangle inscribed in the unit circle
+    in XY plane, with vertices at 210, 330 and 90 degrees, transformed
+    by matrices[i].
+    """
+    angles = 0.5 * np.pi + 2 * np.pi / 3 * np.arange(1, 4)
+    triangle = np.stack((np.cos(angles), np.sin(angles), np.zeros(3)), axis=1)
+    return apply_matrices(matrices, triangle).reshape((-1, 3))
@@ -16,6 +16,13 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import itertools
+import zlib
+
+import bmesh
+import numpy as np
+
+
 def mesh_join(vertices_s, edges_s, faces_s):
     '''Given list of meshes represented by lists of vertices, edges and faces,
     produce one joined mesh.'''
@@ -34,3 +41,282 @@ def mesh_join(vertices_s, edges_s, faces_s):
         result_faces.extend(new_faces)
         offset += len(vertices)
     return result_vertices, result_edges, result_faces
+
+
+def read_mesh_arrays(mesh):
+    '''Read geometry of blender mesh in bulk with foreach_get.
+    Returns numpy arrays: vertices (N x 3, float32), edge keys (E x 2,
+    each sorted as in mesh.edge_keys), vertex indices of all polygons
+    joined together and offsets of polygons in it (P + 1 items).'''
+
+    vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", vertices)
+
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    edges = np.sort(edges.reshape((-1, 2)), axis=1)
+
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    n_polygons = len(mesh.polygons)
+    loop_starts = np.empty(n_polygons, dtype=np.int32)
+    loop_totals = np.empty(n_polygons, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+
+    offsets = np.zeros(n_polygons + 1, dtype=np.int64)
+    np.cumsum(loop_totals, out=offsets[1:])
+    if not np.array_equal(loop_starts, offsets[:-1]):
+        # polygons are not stored in order of their loops
+        loop_vertices = np.concatenate(
+            [loop_vertices[start:start + total] for start, total in zip(loop_starts, loop_totals)]
+            or [loop_vertices[:0]])
+
+    return vertices.reshape((-1, 3)), edges, loop_vertices, offsets
+
+
+def split_by_offsets(data, offsets):
+    '''Split flat list into lists by offsets, as returned by read_mesh_arrays().'''
+
+    flat = data.tolist() if hasattr(data, 'tolist') else data
+    offsets = offsets.tolist() if hasattr(offsets, 'tolist') else offsets
+    return [flat[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+def mesh_arrays_from_pydata(vertices, edges, faces):
+    '''Convert sverchok mesh data into flat numpy arrays, as used by
+    write_mesh_arrays(): vertices (N x 3), edges (E x 2), vertex indices
+    of all faces joined together and number of vertices of each face.'''
+
+    vertices = np.asarray(vertices, dtype=np.float32).reshape((-1, 3))
+    try:
+        edges = np.asarray(edges, dtype=np.int32).reshape((-1, 2))
+    except ValueError:
+        # skip anything that is not a pair of indices
+        edges = np.array([edge for edge in edges if len(edge) == 2], dtype=np.int32).reshape((-1, 2))
+    loop_totals = np.fromiter((len(face) for face in faces), dtype=np.int32, count=len(faces))
+    loop_vertices = np.fromiter(itertools.chain.from_iterable(faces), dtype=np.int32,
+                                count=int(loop_totals.sum()))
+    return vertices, edges, loop_vertices, loop_totals
+
+
+def topology_hash(edges, loop_vertices, loop_totals):
+    '''Checksum of mesh topology, to detect if only vertex locations changed.'''
+
+    checksum = zlib.crc32(np.ascontiguousarray(edges).tobytes())
+    checksum = zlib.crc32(np.ascontiguousarray(loop_vertices).tobytes(), checksum)
+    checksum = zlib.crc32(np.ascontiguousarray(loop_totals).tobytes(), checksum)
+    return "{:08x}_{}_{}_{}".format(checksum, len(edges), len(loop_vertices), len(loop_totals))
+
+
+def is_valid_topology(n_vertices, edges, loop_vertices, loop_totals):
+    '''Check that indices refer to existing vertices, edges join two different
+    vertices and faces have at least 3 vertices, none of them repeated.'''
+
+    for indices in (edges, loop_vertices):
+        if len(indices) and (indices.min() < 0 or indices.max() >= n_vertices):
+            return False
+    if len(edges) and np.any(edges[:, 0] == edges[:, 1]):
+        return False
+    if not len(loop_totals):
+        return True
+    if loop_totals.min() < 3:
+        return False
+    # sort indices within each face, repeated ones become neighbours
+    face_ids = np.repeat(np.arange(len(loop_totals)), loop_totals)
+    order = np.lexsort((loop_vertices, face_ids))
+    same_face = face_ids[order][1:] == face_ids[order][:-1]
+    same_vertex = loop_vertices[order][1:] == loop_vertices[order][:-1]
+    return not np.any(same_face & same_vertex)
+
+
+def write_mesh_arrays(mesh, vertices, edges, loop_vertices, loop_totals):
+    '''Replace geometry of blender mesh with geometry given by flat arrays,
+    as returned by mesh_arrays_from_pydata(). Edges of faces are created
+    automatically, so edges may contain only loose ones.'''
+
+    # writing empty bmesh is the fastest way to remove all geometry
+    bm = bmesh.new()
+    bm.to_mesh(mesh)
+    bm.free()
+
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(vertices, dtype=np.float32).ravel())
+    if len(edges):
+        mesh.edges.add(len(edges))
+        mesh.edges.foreach_set("vertices", np.ascontiguousarray(edges, dtype=np.int32).ravel())
+    if len(loop_totals):
+        loop_starts = np.zeros(len(loop_totals), dtype=np.int32)
+        np.cumsum(loop_totals[:-1], out=loop_starts[1:])
+        mesh.loops.add(len(loop_vertices))
+        mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(loop_vertices, dtype=np.int32))
+        mesh.polygons.add(len(loop_totals))
+        mesh.polygons.foreach_set("loop_start", loop_starts)
+        mesh.polygons.foreach_set("loop_total", np.ascontiguousarray(loop_totals, dtype=np.int32))
+    mesh.update(calc_edges=True)
+
+
+def write_mesh_vertices(mesh, vertices):
+    '''Update locations of vertices of blender mesh, topology stays the same.'''
+
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(vertices, dtype=np.float32).ravel())
+    mesh.update()
+
+
+def write_mesh_points(mesh, vertices):
+    '''Make blender mesh consist of loose vertices only (as for duplication
+    by vertices); if it already has the same number of them, only
+    their locations are written.'''
+
+    if len(mesh.vertices) == len(vertices) and not len(mesh.edges) and not len(mesh.polygons):
+        write_mesh_vertices(mesh, vertices)
+    else:
+        no_indices = np.zeros(0, dtype=np.int32)
+        write_mesh_arrays(mesh, vertices, no_indices.reshape((0, 2)), no_indices, no_indices)
+
+
+def write_mesh_triangles(mesh, vertices):
+    '''Make blender mesh consist of separate triangles, each 3 of vertices
+    being one triangle (as for duplication by faces); if it already has
+    the same number of them, only locations of vertices are written.'''
+
+    count = len(vertices) // 3
+    if len(mesh.vertices) == len(vertices) and len(mesh.polygons) == count and len(mesh.loops) == len(vertices):
+        write_mesh_vertices(mesh, vertices)
+    else:
+        write_mesh_arrays(mesh, vertices, np.zeros((0, 2), dtype=np.int32),
+                          np.arange(len(vertices), dtype=np.int32), np.full(count, 3, dtype=np.int32))
+
+
+# Above this number of pairs of points in neighbouring grid cells,
+# close points are searched for one by one instead of all at once
+MAX_NEIGHBOUR_PAIRS = 10000000
+
+
+def _merge_by_pairs(count, earlier, later):
+    '''Merge points given all pairs of close points (earlier[k] < later[k]).'''
+    target = np.arange(count)
+    order = np.lexsort((earlier, later))
+    target_list = target.tolist()
+    current, merged = -1, False
+    for i, j in zip(later[order].tolist(), earlier[order].tolist()):
+        if i != current:
+            current, merged = i, False
+        if not merged and target_list[j] == j:
+            target_list[i] = j
+            merged = True
+    return np.array(target_list)
+
+
+def _merge_by_grid(points, cells, candidates, distance, neighbour_offsets):
+    '''Merge points comparing each one with kept points of neighbouring cells.'''
+    target = np.arange(len(points))
+    distance2 = distance * distance
+    grid = {}
+    for idx, cell, point in zip(candidates.tolist(), cells[candidates].tolist(), points[candidates].tolist()):
+        x, y, z = point
+        found = None
+        for dx, dy, dz in neighbour_offsets:
+            for kept, kx, ky, kz in grid.get((cell[0] + dx, cell[1] + dy, cell[2] + dz), ()):
+                if (found is None or kept < found) and (x-kx)**2 + (y-ky)**2 + (z-kz)**2 <= distance2:
+                    found = kept
+        if found is None:
+            grid.setdefault(tuple(cell), []).append((idx, x, y, z))
+        else:
+            target[idx] = found
+    return target
+
+
+def _merge_close_points(points, distance):
+    '''For points (all different, in order of first occurrence) return
+    array target: index of the point each point is merged into. Each point
+    is merged into the first preceding kept point within distance, or kept
+    (target[i] == i). Points are bucketed into grid cells of size distance,
+    so only points of neighbouring cells are compared.'''
+
+    count = len(points)
+    cells = np.floor(points / distance).astype(np.int64)
+    cells -= cells.min(axis=0)
+    dims = cells.max(axis=0) + 3
+    neighbour_offsets = list(itertools.product((-1, 0, 1), repeat=3))
+
+    if float(dims[0]) * float(dims[1]) * float(dims[2]) >= 2**62:
+        # too fine grid to number the cells
+        return _merge_by_grid(points, cells, np.arange(count), distance, neighbour_offsets)
+
+    keys = ((cells[:, 0] + 1) * dims[1] + cells[:, 1] + 1) * dims[2] + cells[:, 2] + 1
+    # searching for sorted keys is much faster
+    by_key = np.argsort(keys, kind='stable')
+    sorted_keys = keys[by_key]
+    is_first = np.ones(count, dtype=bool)
+    is_first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    cell_keys = sorted_keys[is_first]
+    cell_starts = np.nonzero(is_first)[0]
+    cell_counts = np.diff(np.append(cell_starts, count))
+
+    # for each neighbour cell offset: position of the cell in cell_keys
+    # and number of points in it, for each point in sorted order
+    neighbour_cells = []
+    for dx, dy, dz in neighbour_offsets:
+        shifted = sorted_keys + (dx * dims[1] + dy) * dims[2] + dz
+        pos = np.minimum(np.searchsorted(cell_keys, shifted), len(cell_keys) - 1)
+        neighbour_cells.append((pos, np.where(cell_keys[pos] == shifted, cell_counts[pos], 0)))
+
+    if sum(int(n.sum()) for _, n in neighbour_cells) > MAX_NEIGHBOUR_PAIRS:
+        # dense points; kept points are sparse, so comparing with them is cheaper
+        neighbours = np.zeros(count, dtype=np.int64)
+        for _, n in neighbour_cells:
+            neighbours[by_key] += n
+        candidates = np.nonzero(neighbours > 1)[0]
+        return _merge_by_grid(points, cells, candidates, distance, neighbour_offsets)
+
+    distance2 = distance * distance
+    earlier, later = [], []
+    for pos, n in neighbour_cells:
+        # all pairs (point, point of neighbour cell)
+        src = np.repeat(np.arange(count), n)
+        first_pair = np.cumsum(n) - n
+        dst = np.repeat(cell_starts[pos], n) + np.arange(len(src)) - np.repeat(first_pair, n)
+        i, j = by_key[src], by_key[dst]
+        close = (j < i) & (((points[i] - points[j]) ** 2).sum(axis=1) <= distance2)
+        later.append(i[close])
+        earlier.append(j[close])
+    return _merge_by_pairs(count, np.concatenate(earlier), np.concatenate(later))
+
+
+def remove_doubles(vertices, distance=0.0):
+    '''Find duplicated vertices without comparing all pairs of them: exactly
+    equal ones if distance is 0, otherwise ones closer than distance to
+    a preceding kept vertex.
+    Returns (indices of kept vertices, in order of first occurrence;
+    array with new index of each vertex).'''
+
+    vertices = np.asarray(vertices, dtype=np.float64).reshape((-1, 3)) + 0.0  # -0.0 == 0.0
+    if not len(vertices):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # exact duplicates: sort lexicographically (stable, so the first
+    # vertex of each group of equal ones is its first occurrence)
+    by_value = np.lexsort(vertices.T[::-1])
+    sorted_vertices = vertices[by_value]
+    is_first = np.ones(len(vertices), dtype=bool)
+    is_first[1:] = (sorted_vertices[1:] != sorted_vertices[:-1]).any(axis=1)
+    group = np.cumsum(is_first) - 1
+    inverse = np.empty_like(group)
+    inverse[by_value] = group
+    first = by_value[is_first]
+
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    # unique points in order of first occurrence
+    kept = first[order]
+
+    if distance > 0 and len(kept) > 1:
+        target = _merge_close_points(vertices[kept], distance)
+        is_kept = target == np.arange(len(target))
+        new_index = np.cumsum(is_kept) - 1
+        rank = new_index[target][rank]
+        kept = kept[is_kept]
+
+    return kept, rank[inverse]
@@ -0,0 +1,292 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Evaluation of vectorized monads in background Blender processes.
+
+Workers are headless Blenders which run this file as a script:
+
+    blender -b --addons sverchok --python utils/sv_monad_pool.py -- --serve
+
+and stay alive, evaluating chunks of elements of vectorized inputs on
+request, so that Blender startup (a few seconds) is paid only once.
+Workers of a monad are started explicitly with the 'Start workers' button
+of a monad instance; when Blender itself runs in background (batch
+evaluation, see sv_batch), they are started on first use.
+
+Requests are JSON lines on stdin of a worker; input and output data are
+passed in pickle files, so tuples, numpy arrays and mathutils Matrix and
+Vector objects keep their types. Monads containing nodes which read
+scene objects, texts, images and such (see sv_uses_scene_data and
+sv_incremental) are not evaluated in workers, since those are not
+available there.
+"""
+
+import copyreg
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import bpy
+from mathutils import Matrix, Vector
+
+from sverchok.core.monad import MonadPlan, evaluate_elements, get_monad_plan
+from sverchok.core.socket_data import get_socket_cache
+from sverchok.utils.logging import info, warning, error, exception
+from sverchok.utils.sv_batch import split_chunks
+from sverchok.utils.sv_IO_panel_tools import create_dict_of_tree, import_tree
+from sverchok.utils.sv_operator_mixins import SvGenericCallbackWithParams
+
+# worker prints this before status of each request,
+# everything else it prints (blender and sverchok messages) is skipped
+STATUS_MARKER = "SV_MONAD_WORKER:"
+
+# monad name -> MonadWorkerPool
+worker_pools = {}
+
+copyreg.pickle(Matrix, lambda m: (Matrix, ([tuple(row) for row in m],)))
+copyreg.pickle(Vector, lambda v: (Vector, (tuple(v),)))
+
+
+def export_monad(monad):
+    """Monad layout as JSON-compatible dictionary"""
+    monad_dict = create_dict_of_tree(monad)
+    monad_dict['bl_idname'] = monad.bl_idname
+    monad_dict['cls_bl_idname'] = monad.cls_bl_idname
+    return {"name": monad.name, "layout": monad_dict}
+
+
+def load_monad(monad_json):
+    """Create monad node tree from export_monad() result"""
+    monad = bpy.data.node_groups.new(monad_json["name"], 'SverchGroupTreeType')
+    import_tree(monad, nodes_json=monad_json["layout"])
+    return monad
+
+
+def scene_dependent_nodes(monad):
+    """Names of nodes of monad which need blender data not available in workers"""
+    _, nodes = get_monad_plan(monad)
+    return [node.name for node in nodes
+            if getattr(node, "sv_uses_scene_data", False) or not getattr(node, "sv_incremental", True)]
+
+
+class MonadWorkerPool(object):
+    """
+    Background Blender processes evaluating one monad.
+    """
+
+    def __init__(self, monad_name, count):
+        self.monad_name = monad_name
+        self.work_dir = tempfile.mkdtemp(prefix="sv_monad_")
+        self.monad_path = os.path.join(self.work_dir, "monad.json")
+        # layout last sent to workers, as JSON string
+        self.layout = None
+        command = [bpy.app.binary_path, "-b", "--addons", "sverchok",
+                   "--python", os.path.abspath(__file__), "--", "--serve"]
+        self.workers = [subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         universal_newlines=True)
+                        for idx in range(count)]
+        info("Monad %s: started %s workers", monad_name, count)
+
+    def is_alive(self):
+        return all(worker.poll() is None for worker in self.workers)
+
+    def request(self, worker, **request):
+        worker.stdin.write(json.dumps(request) + "\n")
+        worker.stdin.flush()
+
+    def wait_status(self, worker):
+        for line in worker.stdout:
+            if line.startswith(STATUS_MARKER):
+                return line[len(STATUS_MARKER):].strip()
+        return None
+
+    def evaluate(self, monad, data_in, n_outputs):
+        """
+        Evaluate monad for each element of vectorized inputs data_in,
+        returns list of joined results per output.
+        Raises RuntimeError if some of workers failed.
+        """
+        layout = json.dumps(export_monad(monad), sort_keys=True)
+        send_layout = layout != self.layout
+        if send_layout:
+            with open(self.monad_path, 'w') as f:
+                f.write(layout)
+            self.layout = layout
+
+        total = len(data_in[0])
+        chunks = split_chunks(total, len(self.workers))
+        result_paths = []
+        for idx, (start, end) in enumerate(chunks):
+            data_path = os.path.join(self.work_dir, "data_{}.pickle".format(idx))
+            result_path = os.path.join(self.work_dir, "result_{}.pickle".format(idx))
+            with open(data_path, 'wb') as f:
+                pickle.dump({"start": start, "total": total, "n_outputs": n_outputs,
+                             "data": [data[start:end] for data in data_in]}, f)
+            self.request(self.workers[idx], monad=self.monad_path if send_layout else None,
+                         data=data_path, result=result_path)
+            result_paths.append(result_path)
+        if send_layout:
+            # workers that got no chunk this time still need the new layout
+            for worker in self.workers[len(chunks):]:
+                self.request(worker, monad=self.monad_path, data=None, result=None)
+            chunks_workers = self.workers
+        else:
+            chunks_workers = self.workers[:len(chunks)]
+
+        statuses = [self.wait_status(worker) for worker in chunks_workers]
+        if any(status != "ok" for status in statuses):
+            # layout has to be sent again to restarted or failed workers
+            self.layout = None
+            raise RuntimeError("Monad {}: some of workers failed".format(self.monad_name))
+
+        data_out = [[] for idx in range(n_outputs)]
+        for result_path in result_paths:
+            with open(result_path, 'rb') as f:
+                result = pickle.load(f)
+            for idx, data in enumerate(result):
+                data_out[idx].extend(data)
+        return data_out
+
+    def close(self):
+        for worker in self.workers:
+            try:
+                worker.stdin.close()
+                worker.wait(timeout=10)
+            except Exception:
+                worker.kill()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        info("Monad %s: stopped workers", self.monad_name)
+
+
+def start_pool(monad, count):
+    """
+    Start workers for monad, unless it contains nodes depending on scene data.
+    Returns the pool or None.
+    """
+    stop_pool(monad.name)
+    rejected = scene_dependent_nodes(monad)
+    if rejected:
+        warning("Monad %s can not be evaluated in workers, since these nodes use scene data: %s",
+                monad.name, ", ".join(rejected))
+        return None
+    pool = worker_pools[monad.name] = MonadWorkerPool(monad.name, count)
+    return pool
+
+
+def stop_pool(monad_name):
+    pool = worker_pools.pop(monad_name, None)
+    if pool is not None:
+        pool.close()
+
+
+def stop_all_pools():
+    for monad_name in list(worker_pools):
+        stop_pool(monad_name)
+
+
+def has_pool(monad):
+    return monad.name in worker_pools
+
+
+def evaluate_in_processes(monad, data_in, n_outputs, processes):
+    """
+    Evaluate monad for each element of vectorized inputs data_in in workers.
+    Returns list of joined results per output, or None if there are no
+    workers for the monad or they failed, in which case the caller should
+    evaluate the monad itself.
+    """
+    pool = worker_pools.get(monad.name)
+    if pool is not None and not pool.is_alive():
+        stop_pool(monad.name)
+        pool = None
+    if pool is None:
+        if not bpy.app.background:
+            return None
+        pool = start_pool(monad, processes)
+        if pool is None:
+            return None
+    elif scene_dependent_nodes(monad):
+        warning("Monad %s uses scene data, evaluating in this process", monad.name)
+        stop_pool(monad.name)
+        return None
+
+    try:
+        return pool.evaluate(monad, data_in, n_outputs)
+    except Exception as e:
+        exception("Monad %s: evaluation in workers failed: %s", monad.name, e)
+        stop_pool(monad.name)
+        return None
+
+
+def serve():
+    """Worker loop, this runs in background Blender"""
+    monad = None
+    for line in sys.stdin:
+        request = json.loads(line)
+        status = "ok"
+        try:
+            if request["monad"]:
+                if monad is not None:
+                    bpy.data.node_groups.remove(monad)
+                with open(request["monad"]) as f:
+                    monad = load_monad(json.load(f))
+                plan = MonadPlan(monad, 0)
+                nodes = plan.bind(monad)
+                cache = get_socket_cache(monad.name)
+            if request["data"]:
+                with open(request["data"], 'rb') as f:
+                    chunk = pickle.load(f)
+                monad["current_total"] = chunk["total"]
+                data_out = evaluate_elements(monad, plan, nodes, cache, chunk["data"],
+                                             chunk["n_outputs"], chunk["start"])
+                with open(request["result"], 'wb') as f:
+                    pickle.dump(data_out, f)
+        except Exception as e:
+            exception("Monad worker request failed: %s", e)
+            status = "error"
+        sys.stdout.write(STATUS_MARKER + status + "\n")
+        sys.stdout.flush()
+
+
+class SvMonadWorkersCallback(bpy.types.Operator, SvGenericCallbackWithParams):
+    """ Start or stop background Blender processes evaluating the monad """
+    bl_idname = "node.sv_monad_workers_callback"
+    bl_label = "Start or stop monad workers"
+
+
+def register():
+    bpy.utils.register_class(SvMonadWorkersCallback)
+
+
+def unregister():
+    stop_all_pools()
+    bpy.utils.unregister_class(SvMonadWorkersCallback)
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if "--serve" not in argv:
+        error("Monad worker is to be started with --serve argument")
+        sys.exit(1)
+    serve()
+    sys.exit(0)
@@ -0,0 +1,289 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import collections
+import json
+import tracemalloc
+
+import bpy
+from bpy.props import StringProperty
+
+from sverchok.core.socket_data import get_output_data_stats
+from sverchok.utils.logging import info
+from sverchok.utils.context_managers import sv_preferences
+
+NodeSample = collections.namedtuple("NodeSample",
+        ["tree", "node", "bl_idname", "start", "duration",
+         "output_items", "output_bytes", "peak_memory", "cache_hit"])
+NodeSample.__doc__ = """
+One processing of one node.
+start and duration are in seconds (time.perf_counter() scale),
+output_items is total length of data in output sockets,
+output_bytes is its estimated size, peak_memory is peak of memory
+allocated by python during processing (None if memory tracing is off),
+cache_hit is True if node was skipped by incremental update.
+"""
+
+# Whether statistics are being collected, set by "Start collecting" toggle
+is_currently_enabled = False
+# Whether python memory allocations are traced
+is_memory_tracing = False
+# tracemalloc.reset_peak() appeared in python 3.9
+has_reset_peak = hasattr(tracemalloc, "reset_peak")
+
+_samples = collections.deque(maxlen=10000)
+
+
+def set_buffer_size(size):
+    """Change ring buffer size, keeping the most recent samples."""
+    global _samples
+    _samples = collections.deque(_samples, maxlen=max(1, size))
+
+
+def start_collecting(trace_memory=False):
+    global is_currently_enabled
+    global is_memory_tracing
+    is_currently_enabled = True
+    is_memory_tracing = trace_memory
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def stop_collecting():
+    global is_currently_enabled
+    global is_memory_tracing
+    is_currently_enabled = False
+    if is_memory_tracing and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    is_memory_tracing = False
+
+
+def reset():
+    _samples.clear()
+
+
+def begin_node():
+    """
+    Call before node processing, returns value to pass into record_node()
+    """
+    if not is_memory_tracing:
+        return None
+    if has_reset_peak:
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+    # Older pythons can reset the peak only together with traces. Freeing
+    # memory allocated before is then not counted, so traced memory starts
+    # from zero and its peak is what the node allocated on top.
+    tracemalloc.clear_traces()
+    return 0
+
+
+def record_node(node, start, duration, memory_before=None, cache_hit=False):
+    """
+    Store one sample for node after it was processed (or skipped).
+    """
+    items, nbytes = get_output_data_stats(node)
+    peak = None
+    if memory_before is not None:
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(0, peak - memory_before)
+    _samples.append(NodeSample(node.id_data.name, node.name, node.bl_idname,
+                               start, duration, items, nbytes, peak, cache_hit))
+
+
+def get_samples(tree_name=None):
+    """Samples from ring buffer, oldest first, optionally for one tree only."""
+    if tree_name is None:
+        return list(_samples)
+    return [s for s in _samples if s.tree == tree_name]
+
+
+def have_gathered_stats():
+    return bool(_samples)
+
+
+def node_statistics(tree_name=None):
+    """
+    Aggregate samples per node.
+    Returns dictionary {(tree name, node name): dictionary of statistics}.
+    """
+    result = {}
+    for sample in get_samples(tree_name):
+        key = (sample.tree, sample.node)
+        stats = result.get(key)
+        if stats is None:
+            stats = result[key] = {
+                "bl_idname": sample.bl_idname,
+                "count": 0, "cache_hits": 0,
+                "total_time": 0.0, "min_time": None, "max_time": 0.0,
+                "output_items": 0, "output_bytes": 0, "peak_memory": None}
+        stats["count"] += 1
+        stats["output_items"] = sample.output_items
+        stats["output_bytes"] = sample.output_bytes
+        if sample.cache_hit:
+            stats["cache_hits"] += 1
+            continue
+        stats["total_time"] += sample.duration
+        stats["max_time"] = max(stats["max_time"], sample.duration)
+        if stats["min_time"] is None or sample.duration < stats["min_time"]:
+            stats["min_time"] = sample.duration
+        if sample.peak_memory is not None:
+            stats["peak_memory"] = max(stats["peak_memory"] or 0, sample.peak_memory)
+    for stats in result.values():
+        processed = stats["count"] - stats["cache_hits"]
+        stats["mean_time"] = stats["total_time"] / processed if processed else 0.0
+    return result
+
+
+def tree_statistics():
+    """
+    Aggregate samples per tree.
+    Returns dictionary {tree name: dictionary of statistics}.
+    """
+    result = {}
+    for (tree, _), stats in node_statistics().items():
+        tree_stats = result.setdefault(tree, {"nodes": 0, "total_time": 0.0,
+                                              "cache_hits": 0, "output_bytes": 0})
+        tree_stats["nodes"] += 1
+        tree_stats["total_time"] += stats["total_time"]
+        tree_stats["cache_hits"] += stats["cache_hits"]
+        tree_stats["output_bytes"] += stats["output_bytes"]
+    return result
+
+
+def format_statistics(tree_name=None):
+    lines = ["{:<30} {:<30} {:>6} {:>6} {:>10} {:>10} {:>12}".format(
+                "Tree", "Node", "Count", "Hits", "Mean, ms", "Max, ms", "Output, KB")]
+    stats = sorted(node_statistics(tree_name).items(), key=lambda item: -item[1]["total_time"])
+    for (tree, node), s in stats:
+        lines.append("{:<30} {:<30} {:>6} {:>6} {:>10.3f} {:>10.3f} {:>12.1f}".format(
+                tree, node, s["count"], s["cache_hits"],
+                s["mean_time"] * 1000, s["max_time"] * 1000, s["output_bytes"] / 1024))
+    return "\n".join(lines)
+
+
+def make_chrome_trace(tree_name=None):
+    """
+    Samples in Chrome trace event format,
+    which can be opened in chrome://tracing or Perfetto.
+    """
+    events = []
+    tree_ids = {}
+    # end times of last events in each track of each tree; events overlapping
+    # in time (nodes inside of monads) are put into separate tracks
+    track_ends = collections.defaultdict(list)
+    for sample in sorted(get_samples(tree_name), key=lambda s: s.start):
+        pid = tree_ids.setdefault(sample.tree, len(tree_ids) + 1)
+        ends = track_ends[pid]
+        for tid, end in enumerate(ends):
+            if end <= sample.start:
+                break
+        else:
+            tid = len(ends)
+            ends.append(0.0)
+        ends[tid] = sample.start + sample.duration
+        args = {"bl_idname": sample.bl_idname,
+                "output_items": sample.output_items,
+                "output_bytes": sample.output_bytes,
+                "cache_hit": sample.cache_hit}
+        if sample.peak_memory is not None:
+            args["peak_memory"] = sample.peak_memory
+        events.append({"name": sample.node, "cat": sample.bl_idname, "ph": "X",
+                       "ts": sample.start * 1e6, "dur": sample.duration * 1e6,
+                       "pid": pid, "tid": tid + 1, "args": args})
+    for tree, pid in tree_ids.items():
+        events.append({"name": "process_name", "ph": "M", "pid": pid,
+                       "args": {"name": tree}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def save_chrome_trace(path, tree_name=None):
+    with open(path, 'w') as f:
+        json.dump(make_chrome_trace(tree_name), f)
+    info("Node statistics trace saved to %s.", path)
+
+
+class SvStatsToggle(bpy.types.Operator):
+    """Toggle collecting of node statistics on/off"""
+    bl_idname = "node.sverchok_stats_toggle"
+    bl_label = "Toggle node statistics"
+    bl_options = {'INTERNAL'}
+
+    def execute(self, context):
+        if is_currently_enabled:
+            stop_collecting()
+        else:
+            with sv_preferences() as prefs:
+                set_buffer_size(prefs.stats_buffer_size)
+                start_collecting(prefs.stats_trace_memory)
+        info("Collecting node statistics is set to %s", is_currently_enabled)
+        return {'FINISHED'}
+
+
+class SvStatsDump(bpy.types.Operator):
+    """Dump aggregated node statistics to log"""
+    bl_idname = "node.sverchok_stats_dump"
+    bl_label = "Dump node statistics to log"
+    bl_options = {'INTERNAL'}
+
+    tree_name = StringProperty(default='')
+
+    def execute(self, context):
+        info("Node statistics:\n" + format_statistics(self.tree_name or None))
+        return {'FINISHED'}
+
+
+class SvStatsSaveTrace(bpy.types.Operator):
+    """Save node statistics as Chrome trace event JSON file"""
+    bl_idname = "node.sverchok_stats_save_trace"
+    bl_label = "Save node statistics trace"
+    bl_options = {'INTERNAL'}
+
+    filepath = StringProperty(subtype="FILE_PATH")
+
+    def execute(self, context):
+        save_chrome_trace(self.filepath)
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "sverchok_trace.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+
+class SvStatsReset(bpy.types.Operator):
+    """Reset node statistics"""
+    bl_idname = "node.sverchok_stats_reset"
+    bl_label = "Reset node statistics"
+    bl_options = {'INTERNAL'}
+
+    def execute(self, context):
+        reset()
+        info("Node statistics data cleared.")
+        return {'FINISHED'}
+
+classes = [SvStatsToggle, SvStatsDump, SvStatsSaveTrace, SvStatsReset]
+
+def register():
+    for class_name in classes:
+        bpy.utils.register_class(class_name)
+
+def unregister():
+    for class_name in reversed(classes):
+        bpy.utils.unregister_class(class_name)
@@ -0,0 +1,302 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Vectorized counterparts of recurse_fx / recurse_fxy.
+
+Nested input lists are packed into numpy arrays: either regular ones
+(all lists at each level have the same length), or jagged ones (list
+of objects of different length, each being a list of items), the
+function is applied to all items at once as numpy operation, and the
+result is unpacked into the same nesting. Lists of unequal length are
+matched the same way as recurse_fxy does it, by repeating the last item
+of the shorter one.
+
+Items are numbers (item_ndim=0) or vectors (item_ndim=1). Functions
+receive arrays of shape (..., ) or (..., 3) and must return arrays
+with the same leading dimensions.
+
+numpy_fx and numpy_fxy return None if data can not be vectorized
+(irregular nesting, empty lists, lists mixing integers and floats,
+numeric errors like division by zero or integer overflow),
+then the caller should use the plain python implementation, which
+produces the same result or raises the proper exception.
+"""
+
+import threading
+import warnings
+
+import numpy as np
+
+from sverchok.utils.sv_jagged_array import SvJaggedArray
+
+warnings_lock = threading.Lock()
+
+
+class Packed(object):
+    """
+    Numeric data with structure: data is array of items (each of
+    item_ndim dimensions); if offsets is None, data is regular array
+    and all leading dimensions are structure, otherwise data is flat
+    array of items of all objects, object i being data[offsets[i]:offsets[i+1]].
+    """
+
+    def __init__(self, data, item_ndim, offsets=None):
+        self.data = data
+        self.item_ndim = item_ndim
+        self.offsets = offsets
+
+    @property
+    def structure_ndim(self):
+        if self.offsets is not None:
+            return 2
+        return self.data.ndim - self.item_ndim
+
+    def to_jagged(self):
+        """Represent regular data of up to 2 structure levels as jagged"""
+        if self.offsets is not None:
+            return self
+        item_shape = self.data.shape[self.data.ndim - self.item_ndim:]
+        ndim = self.structure_ndim
+        if ndim == 0:
+            data, step, count = self.data.reshape((1,) + item_shape), 1, 1
+        elif ndim == 1:
+            data, step, count = self.data, 1, len(self.data)
+        elif ndim == 2:
+            count, step = self.data.shape[:2]
+            data = self.data.reshape((count * step,) + item_shape)
+        else:
+            return None
+        return Packed(data, self.item_ndim, np.arange(count + 1, dtype=np.int64) * step)
+
+
+def as_numeric(data):
+    """numpy array from nested lists, or None if data is not a regular array of numbers"""
+    # catch_warnings() changes global state, nodes may run in worker threads
+    with warnings_lock, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            array = np.array(data)
+        except (ValueError, TypeError):
+            return None
+    if array.dtype.kind == 'b':
+        return array.astype(np.int64)
+    if array.dtype.kind not in 'iuf':
+        return None
+    if array.dtype.kind == 'f' and has_integers(data, array):
+        # python would keep integers as integers
+        return None
+    return array
+
+
+def has_integers(data, array):
+    """True if float array was made of nested lists with some integers in them"""
+    whole = array == np.floor(array)
+    if not whole.any():
+        return False
+    items = np.array(data, dtype=object)
+    return any(isinstance(item, (int, np.integer)) for item in items[whole])
+
+
+def pack(data, item_ndim=0, item_size=None):
+    """Pack nested list (or array payload) into Packed, or return None"""
+    if isinstance(data, SvJaggedArray):
+        return pack_jagged(data.data, data.offsets, item_ndim, item_size)
+
+    array = data if isinstance(data, np.ndarray) else as_numeric(data)
+    if array is not None:
+        if array.ndim < item_ndim or 0 in array.shape:
+            return None
+        if item_ndim and array.shape[-1] != item_size:
+            return None
+        return Packed(array, item_ndim)
+
+    # list of objects of different length
+    if not isinstance(data, (list, tuple)) or not data:
+        return None
+    objects = []
+    for item in data:
+        array = as_numeric(item)
+        if array is None or array.ndim != item_ndim + 1 or not len(array):
+            return None
+        objects.append(array)
+    if len(set(array.dtype.kind for array in objects)) > 1:
+        # integers would turn into floats
+        return None
+    offsets = np.zeros(len(objects) + 1, dtype=np.int64)
+    np.cumsum([len(a) for a in objects], out=offsets[1:])
+    return pack_jagged(np.concatenate(objects), offsets, item_ndim, item_size)
+
+
+def pack_jagged(data, offsets, item_ndim, item_size):
+    if data.ndim != item_ndim + 1 or (item_ndim and data.shape[-1] != item_size):
+        return None
+    if data.dtype.kind not in 'iuf' or len(offsets) < 2 or (np.diff(offsets) == 0).any():
+        return None
+    return Packed(data, item_ndim, offsets)
+
+
+def unpack(packed, as_payload=False):
+    """
+    Convert Packed back to nested lists (or array payload),
+    vectors become tuples as python functions return them
+    """
+    if packed.offsets is None:
+        if as_payload:
+            return packed.data
+        return items_to_tuples(packed.data.tolist(), packed.structure_ndim, packed.item_ndim)
+    if as_payload:
+        return SvJaggedArray(packed.data, packed.offsets)
+    flat = items_to_tuples(packed.data.tolist(), 1, packed.item_ndim)
+    offsets = packed.offsets.tolist()
+    return [flat[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+def items_to_tuples(data, structure_ndim, item_ndim):
+    if not item_ndim:
+        return data
+    if not structure_ndim:
+        return tuple(data)
+    return [items_to_tuples(item, structure_ndim - 1, item_ndim) for item in data]
+
+
+def result_packed(result, structure_ndim, offsets=None):
+    """Packed for function result, its items are what is left after structure"""
+    if offsets is not None:
+        structure_ndim = 1
+    return Packed(result, result.ndim - structure_ndim, offsets)
+
+
+def repeat_last(array, axis, size):
+    """Extend array along axis to size by repeating its last item"""
+    if array.shape[axis] == size:
+        return array
+    indices = np.minimum(np.arange(size), array.shape[axis] - 1)
+    return np.take(array, indices, axis=axis)
+
+
+def match_regular(x, y):
+    """
+    Match two regular Packed the way recurse_fxy does: nesting levels
+    are matched from the top, lists of different length are extended
+    by their last item. Returns two arrays ready for broadcasting.
+    """
+    nx, ny = x.structure_ndim, y.structure_ndim
+    ndim = max(nx, ny)
+
+    def expand(p, n):
+        shape = p.data.shape
+        return p.data.reshape(shape[:n] + (1,) * (ndim - n) + shape[n:])
+
+    a, b = expand(x, nx), expand(y, ny)
+    for axis in range(ndim):
+        size_a, size_b = a.shape[axis], b.shape[axis]
+        if size_a == size_b or size_a == 1 or size_b == 1:
+            continue
+        if size_a < size_b:
+            a = repeat_last(a, axis, size_b)
+        else:
+            b = repeat_last(b, axis, size_a)
+    if x.item_ndim > y.item_ndim:
+        b = b[..., np.newaxis]
+    elif y.item_ndim > x.item_ndim:
+        a = a[..., np.newaxis]
+    return a, b
+
+
+def match_jagged(x, y):
+    """
+    Match two jagged Packed: objects and items within each pair of objects
+    are matched by repeating the last one of the shorter list.
+    Returns (items of x, items of y, offsets of result).
+    """
+    starts_x, lengths_x = x.offsets[:-1], np.diff(x.offsets)
+    starts_y, lengths_y = y.offsets[:-1], np.diff(y.offsets)
+    n_objects = max(len(lengths_x), len(lengths_y))
+    obj_x = np.minimum(np.arange(n_objects), len(lengths_x) - 1)
+    obj_y = np.minimum(np.arange(n_objects), len(lengths_y) - 1)
+    len_x, len_y = lengths_x[obj_x], lengths_y[obj_y]
+    lengths = np.maximum(len_x, len_y)
+
+    offsets = np.zeros(n_objects + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    obj_ids = np.repeat(np.arange(n_objects), lengths)
+    positions = np.arange(offsets[-1]) - offsets[:-1][obj_ids]
+    idx_x = starts_x[obj_x][obj_ids] + np.minimum(positions, len_x[obj_ids] - 1)
+    idx_y = starts_y[obj_y][obj_ids] + np.minimum(positions, len_y[obj_ids] - 1)
+    a, b = x.data[idx_x], y.data[idx_y]
+    if x.item_ndim > y.item_ndim:
+        b = b[..., np.newaxis]
+    elif y.item_ndim > x.item_ndim:
+        a = a[..., np.newaxis]
+    return a, b, offsets
+
+
+def apply(func, *args):
+    with np.errstate(divide='raise', over='raise', invalid='raise'):
+        result = np.asarray(func(*args))
+        if result.dtype.kind in 'iu' and all(arg.dtype.kind in 'iu' for arg in args):
+            # integers wrap around silently, check magnitude of results in floats
+            check = np.asarray(func(*(arg.astype(np.float64) for arg in args)))
+            if not (np.abs(check) < np.iinfo(result.dtype).max // 2).all():
+                raise OverflowError
+        return result
+
+
+def is_payload(data):
+    return isinstance(data, (np.ndarray, SvJaggedArray))
+
+
+def numpy_fx(data, func, item_ndim=0, item_size=3):
+    """Vectorized recurse_fx: apply func to all items of data"""
+    x = pack(data, item_ndim, item_size)
+    if x is None:
+        return None
+    try:
+        result = apply(func, x.data)
+    except (FloatingPointError, ValueError, TypeError, OverflowError):
+        return None
+    return unpack(result_packed(result, x.structure_ndim, x.offsets), is_payload(data))
+
+
+def numpy_fxy(data1, data2, func, item_ndim=(0, 0), item_size=3):
+    """Vectorized recurse_fxy: apply func to all matched pairs of items"""
+    x = pack(data1, item_ndim[0], item_size)
+    y = pack(data2, item_ndim[1], item_size)
+    if x is None or y is None:
+        return None
+    if (x.item_ndim or y.item_ndim) and x.structure_ndim != y.structure_ndim:
+        # recurse_fxy would pair vectors with numbers of other level
+        return None
+    as_payload = is_payload(data1) or is_payload(data2)
+
+    try:
+        if x.offsets is None and y.offsets is None:
+            matched = match_regular(x, y)
+            if matched is None:
+                return None
+            ndim = max(x.structure_ndim, y.structure_ndim)
+            return unpack(result_packed(apply(func, *matched), ndim), as_payload)
+
+        x, y = x.to_jagged(), y.to_jagged()
+        if x is None or y is None:
+            return None
+        a, b, offsets = match_jagged(x, y)
+        return unpack(result_packed(apply(func, a, b), 1, offsets), as_payload)
+    except (FloatingPointError, ValueError, TypeError, OverflowError):
+        return None
@@ -100,3 +100,53 @@ def remove_non_updated_objects(node, obj_index, kind='MESH'):
     # delete associated meshes
     for object_name in objs:
         kinds.remove(kinds[object_name])        
+
+
+# node_id -> {idx: (object name, object pointer)}, objects made by viewer nodes which use
+# register_child / get_registered_children instead of get_children
+node_children = {}
+
+
+def register_child(node, idx, obj):
+    ''' remember that node made obj as its idx-th object '''
+    obj['idx'] = idx
+    obj['basename'] = node.basemesh_name
+    # until all objects of node are known (see get_registered_children) they are found by ID-props
+    if node.node_id in node_children:
+        node_children[node.node_id][idx] = (obj.name, obj.as_pointer())
+
+
+def forget_children(node, indices=None):
+    ''' forget objects with given indices (or all objects) of node '''
+    if indices is None:
+        node_children.pop(node.node_id, None)
+        return
+    children = node_children.get(node.node_id, {})
+    for idx in indices:
+        children.pop(idx, None)
+
+
+def get_registered_children(node, find_children):
+    '''
+    {idx: object} of objects made by node. Only the remembered names
+    are looked up, and each object found must be the same one as was
+    remembered; if any of them is not there any more (renamed, deleted,
+    undo, file reloaded), all objects are searched once by
+    find_children(), which should yield (idx, object) pairs.
+    '''
+    objects = bpy.data.objects
+    remembered = node_children.get(node.node_id)
+    if remembered is not None:
+        children = {}
+        for idx, (name, pointer) in remembered.items():
+            obj = objects.get(name)
+            if (obj is None or obj.as_pointer() != pointer
+                    or obj.get('idx') != idx or obj.get('basename') != node.basemesh_name):
+                break
+            children[idx] = obj
+        else:
+            return children
+
+    children = dict(find_children())
+    node_children[node.node_id] = {idx: (obj.name, obj.as_pointer()) for idx, obj in children.items()}
+    return children
@@ -0,0 +1,493 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+2D Delaunay triangulation and Voronoi diagram with numpy input and output.
+
+The triangulation is computed by Fortune's sweep (the same algorithm as
+in voronoi.py), written over plain lists of numbers instead of Site /
+Edge / Halfedge objects, with a binary heap as the event queue. The
+sweep only produces Delaunay triangles; Voronoi vertices (circumcenters
+of triangles), edges and cells are derived from them with numpy.
+
+Cells are returned as closed polygons, clipped to a convex bounding
+polygon. To make cells of the sites on the convex hull finite, four
+far away points are added to the sites before the sweep; they are far
+enough not to change the cells inside of the bounding polygon.
+"""
+
+from heapq import heappush, heappop
+from math import sqrt
+
+import numpy as np
+
+from sverchok.utils.sv_mesh_utils import remove_doubles
+
+# how far helper points for finite cells are, relative to the size of the scene
+FAR_POINTS_DISTANCE = 10.0
+
+
+def _sweep(xs, ys, xmin, xmax):
+    """
+    Fortune's sweep over sites sorted by (y, x), without duplicates.
+    Returns list of triangles, as triples of indices of sites.
+    xmin and xmax are used for the hash of the beach line only.
+    """
+    n = len(xs)
+    triangles = []
+    if n < 3:
+        return triangles
+
+    # bisectors: a * x + b * y = c between sites reg0 and reg1
+    edge_a, edge_b, edge_c, edge_reg0, edge_reg1 = [], [], [], [], []
+
+    # halfedges of the beach line (a doubly linked list):
+    # edge index (NONE for the ends, DELETED when removed), side,
+    # and stamp of the current circle event (0 if there is none)
+    NONE, DELETED = -1, -2
+    he_left, he_right, he_edge, he_pm, he_stamp = [], [], [], [], []
+
+    def new_halfedge(edge, pm):
+        he_left.append(NONE)
+        he_right.append(NONE)
+        he_edge.append(edge)
+        he_pm.append(pm)
+        he_stamp.append(0)
+        return len(he_edge) - 1
+
+    def insert(left, he):
+        right = he_right[left]
+        he_left[he] = left
+        he_right[he] = right
+        he_left[right] = he
+        he_right[left] = he
+
+    def delete(he):
+        left, right = he_left[he], he_right[he]
+        he_right[left] = right
+        he_left[right] = left
+        he_edge[he] = DELETED
+
+    def bisect(s1, s2):
+        dx = xs[s2] - xs[s1]
+        dy = ys[s2] - ys[s1]
+        c = xs[s1] * dx + ys[s1] * dy + (dx * dx + dy * dy) * 0.5
+        if abs(dx) > abs(dy):
+            a, b, c = 1.0, dy / dx, c / dx
+        else:
+            a, b, c = dx / dy, 1.0, c / dy
+        edge_a.append(a)
+        edge_b.append(b)
+        edge_c.append(c)
+        edge_reg0.append(s1)
+        edge_reg1.append(s2)
+        return len(edge_a) - 1
+
+    def leftreg(he):
+        edge = he_edge[he]
+        if edge < 0:
+            return 0
+        return edge_reg0[edge] if he_pm[he] == 0 else edge_reg1[edge]
+
+    def rightreg(he):
+        edge = he_edge[he]
+        if edge < 0:
+            return 0
+        return edge_reg1[edge] if he_pm[he] == 0 else edge_reg0[edge]
+
+    def is_right_of(he, px, py):
+        e = he_edge[he]
+        top = edge_reg1[e]
+        tx, ty = xs[top], ys[top]
+        right_of_site = px > tx
+        pm = he_pm[he]
+        if right_of_site and pm == 0:
+            return True
+        if not right_of_site and pm == 1:
+            return False
+        a, b, c = edge_a[e], edge_b[e], edge_c[e]
+        if a == 1.0:
+            dyp = py - ty
+            dxp = px - tx
+            fast = False
+            if (not right_of_site and b < 0.0) or (right_of_site and b >= 0.0):
+                above = dyp >= b * dxp
+                fast = above
+            else:
+                above = px + py * b > c
+                if b < 0.0:
+                    above = not above
+                if not above:
+                    fast = True
+            if not fast:
+                dxs = tx - xs[edge_reg0[e]]
+                above = b * (dxp * dxp - dyp * dyp) < dxs * dyp * (1.0 + 2.0 * dxp / dxs + b * b)
+                if b < 0.0:
+                    above = not above
+        else:
+            yl = c - a * px
+            t1 = py - yl
+            t2 = px - tx
+            t3 = yl - ty
+            above = t1 * t1 > t2 * t2 + t3 * t3
+        return above if pm == 0 else not above
+
+    def intersect(he1, he2):
+        e1, e2 = he_edge[he1], he_edge[he2]
+        if e1 < 0 or e2 < 0:
+            return None
+        top1, top2 = edge_reg1[e1], edge_reg1[e2]
+        if top1 == top2:
+            return None
+        d = edge_a[e1] * edge_b[e2] - edge_b[e1] * edge_a[e2]
+        if d == 0.0:
+            return None
+        x = (edge_c[e1] * edge_b[e2] - edge_c[e2] * edge_b[e1]) / d
+        y = (edge_c[e2] * edge_a[e1] - edge_c[e1] * edge_a[e2]) / d
+        # sites are numbered in sweep order
+        if top1 < top2:
+            he, top = he1, top1
+        else:
+            he, top = he2, top2
+        right_of_site = x >= xs[top]
+        if right_of_site == (he_pm[he] == 0):
+            return None
+        return x, y
+
+    # events: (y of the top of the circle, x, stamp, halfedge); events of
+    # halfedges which were deleted or got a new event are skipped when popped
+    queue = []
+    stamps = [0]
+
+    def push_event(he, point, site):
+        x, y = point
+        dx, dy = xs[site] - x, ys[site] - y
+        stamps[0] += 1
+        he_stamp[he] = stamps[0]
+        heappush(queue, (y + sqrt(dx * dx + dy * dy), x, stamps[0], he))
+
+    def first_event():
+        while queue:
+            event = queue[0]
+            if he_stamp[event[3]] == event[2]:
+                return event
+            heappop(queue)
+        return None
+
+    # beach line with a hash by x to find the halfedge left of a site quickly
+    leftend = new_halfedge(NONE, 0)
+    rightend = new_halfedge(NONE, 0)
+    he_right[leftend] = rightend
+    he_left[rightend] = leftend
+    hashsize = int(2 * sqrt(n + 4))
+    hash_table = [None] * hashsize
+    hash_table[0] = leftend
+    hash_table[-1] = rightend
+    deltax = float(xmax - xmin) or 1.0
+
+    def gethash(bucket):
+        if bucket < 0 or bucket >= hashsize:
+            return None
+        he = hash_table[bucket]
+        if he is None or he_edge[he] != DELETED:
+            return he
+        hash_table[bucket] = None
+        return None
+
+    def leftbnd(px, py):
+        bucket = int((px - xmin) / deltax * hashsize)
+        bucket = min(max(bucket, 0), hashsize - 1)
+        he = gethash(bucket)
+        i = 1
+        while he is None:
+            he = gethash(bucket - i)
+            if he is None:
+                he = gethash(bucket + i)
+            i += 1
+        if he == leftend or (he != rightend and is_right_of(he, px, py)):
+            he = he_right[he]
+            while he != rightend and is_right_of(he, px, py):
+                he = he_right[he]
+            he = he_left[he]
+        else:
+            he = he_left[he]
+            while he != leftend and not is_right_of(he, px, py):
+                he = he_left[he]
+        if 0 < bucket < hashsize - 1:
+            hash_table[bucket] = he
+        return he
+
+    newsite = 1
+    while True:
+        event = first_event()
+        if newsite < n and (event is None or ys[newsite] < event[0] or
+                            (ys[newsite] == event[0] and xs[newsite] < event[1])):
+            # site event
+            px, py = xs[newsite], ys[newsite]
+            lbnd = leftbnd(px, py)
+            rbnd = he_right[lbnd]
+            edge = bisect(rightreg(lbnd), newsite)
+            bisector = new_halfedge(edge, 0)
+            insert(lbnd, bisector)
+            p = intersect(lbnd, bisector)
+            if p is not None:
+                push_event(lbnd, p, newsite)
+            lbnd = bisector
+            bisector = new_halfedge(edge, 1)
+            insert(lbnd, bisector)
+            p = intersect(bisector, rbnd)
+            if p is not None:
+                push_event(bisector, p, newsite)
+            newsite += 1
+
+        elif event is not None:
+            # circle event
+            heappop(queue)
+            lbnd = event[3]
+            llbnd = he_left[lbnd]
+            rbnd = he_right[lbnd]
+            rrbnd = he_right[rbnd]
+            bot = leftreg(lbnd)
+            top = rightreg(rbnd)
+            triangles.append((bot, top, rightreg(lbnd)))
+
+            he_stamp[lbnd] = 0
+            he_stamp[rbnd] = 0
+            delete(lbnd)
+            delete(rbnd)
+
+            pm = 0
+            if ys[bot] > ys[top]:
+                bot, top = top, bot
+                pm = 1
+            bisector = new_halfedge(bisect(bot, top), pm)
+            insert(llbnd, bisector)
+            p = intersect(llbnd, bisector)
+            if p is not None:
+                push_event(llbnd, p, bot)
+            p = intersect(bisector, rrbnd)
+            if p is not None:
+                push_event(bisector, p, bot)
+        else:
+            break
+
+    return triangles
+
+
+def _as_points(points):
+    """(N, 2) float array of x and y of points"""
+    if not len(points):
+        return np.zeros((0, 2))
+    return np.asarray(points, dtype=np.float64).reshape((len(points), -1))[:, :2]
+
+
+def _remove_doubles(points):
+    return remove_doubles(np.column_stack((points, np.zeros(len(points)))))
+
+
+def _cross(a, b):
+    """z of cross products of 2D vectors"""
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def _next_in_loop(loops, offsets):
+    """For each item of loops, index of the next one in the same polygon"""
+    following = np.arange(1, len(loops) + 1)
+    not_empty = offsets[1:] > offsets[:-1]
+    following[offsets[1:][not_empty] - 1] = offsets[:-1][not_empty]
+    return following
+
+
+def delaunay_triangles(points):
+    """
+    Delaunay triangulation of 2D points ((N, 2) array or list of points,
+    other coordinates are ignored). Returns (T, 3) array of point indices,
+    triangles are counter-clockwise. Of coincident points, only the
+    first one is used.
+    """
+    points = _as_points(points)
+    if len(points) < 3:
+        return np.zeros((0, 3), dtype=np.int64)
+    kept, _ = _remove_doubles(points)
+    sites = points[kept]
+    order = np.lexsort((sites[:, 0], sites[:, 1]))
+    sites = sites[order]
+    triangles = _sweep(sites[:, 0].tolist(), sites[:, 1].tolist(), sites[:, 0].min(), sites[:, 0].max())
+    triangles = np.array(triangles, dtype=np.int64).reshape((-1, 3))
+    return _counter_clockwise(points, kept[order][triangles])
+
+
+def _counter_clockwise(points, triangles):
+    a, b, c = (points[triangles[:, i]] for i in range(3))
+    area = _cross(b - a, c - a)
+    clockwise = area < 0
+    triangles[clockwise] = triangles[clockwise][:, ::-1]
+    return triangles
+
+
+def circumcenters(points, triangles):
+    """Centers of circumscribed circles of triangles, (T, 2) array"""
+    a = points[triangles[:, 0]]
+    b = points[triangles[:, 1]] - a
+    c = points[triangles[:, 2]] - a
+    d = 2.0 * _cross(b, c)
+    b2 = (b * b).sum(axis=1)
+    c2 = (c * c).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = (c[:, 1] * b2 - b[:, 1] * c2) / d
+        y = (b[:, 0] * c2 - c[:, 0] * b2) / d
+    return a + np.stack((x, y), axis=1)
+
+
+def voronoi_edges(points):
+    """
+    Finite part of Voronoi diagram of 2D points: returns vertices (V, 2)
+    and edges (E, 2) between them. Rays going to infinity are omitted.
+    """
+    points = _as_points(points)
+    triangles = delaunay_triangles(points)
+    centers = circumcenters(points, triangles)
+    # an edge of the diagram connects centers of two triangles sharing a side
+    sides = np.stack((triangles, np.roll(triangles, -1, axis=1)), axis=2).reshape((-1, 2))
+    owner = np.repeat(np.arange(len(triangles)), 3)
+    sides = np.sort(sides, axis=1)
+    order = np.lexsort((sides[:, 1], sides[:, 0]))
+    sides, owner = sides[order], owner[order]
+    shared = np.nonzero((sides[1:] == sides[:-1]).all(axis=1))[0]
+    edges = np.stack((owner[shared], owner[shared + 1]), axis=1)
+    kept, index = _remove_doubles(centers)
+    edges = index[edges]
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    return centers[kept], edges
+
+
+def polygon_edges(loops, offsets, count):
+    """Unique edges (E, 2) of polygons, count is the number of vertices"""
+    following = loops[_next_in_loop(loops, offsets)]
+    a = np.minimum(loops, following)
+    b = np.maximum(loops, following)
+    keys = np.unique(a * count + b)
+    return np.stack((keys // count, keys % count), axis=1)
+
+
+def bounding_box(points, margin=0.0):
+    """Counter-clockwise (4, 2) rectangle around 2D points"""
+    points = _as_points(points)
+    (x0, y0), (x1, y1) = points.min(axis=0) - margin, points.max(axis=0) + margin
+    return np.array([(x0, y0), (x1, y0), (x1, y1), (x0, y1)])
+
+
+def clip_polygons(vertices, loops, offsets, bounds):
+    """
+    Clip polygons (vertices[loops[offsets[i]:offsets[i+1]]]) to the
+    convex polygon bounds, with all polygons at once (Sutherland-Hodgman,
+    by one side of bounds at a time). Adjacent polygons keep sharing
+    vertices where their common sides cross bounds.
+    Returns new vertices, loops and offsets; polygons which are outside
+    of bounds become empty.
+    """
+    bounds = _as_points(bounds)
+    x, y = bounds[:, 0], bounds[:, 1]
+    if (x * np.roll(y, -1) - np.roll(x, -1) * y).sum() < 0:
+        bounds = bounds[::-1]
+
+    for start, end in zip(bounds, np.roll(bounds, -1, axis=0)):
+        count = len(vertices)
+        distance = _cross(end - start, vertices - start)
+        inside = distance >= 0
+
+        current, following = loops, loops[_next_in_loop(loops, offsets)]
+        current_inside = inside[current]
+        crossing = current_inside != inside[following]
+
+        # new vertex for each side crossing the line, shared by both polygons of the side
+        a = np.minimum(current[crossing], following[crossing])
+        b = np.maximum(current[crossing], following[crossing])
+        keys, new_index = np.unique(a * count + b, return_inverse=True)
+        a, b = keys // count, keys % count
+        t = distance[a] / (distance[a] - distance[b])
+        vertices = np.concatenate((vertices, vertices[a] + (vertices[b] - vertices[a]) * t[:, np.newaxis]))
+
+        # each item of loops becomes its own vertex if it is inside,
+        # followed by the crossing point if the side crosses the line
+        counts = current_inside.astype(np.int64) + crossing
+        positions = np.zeros(len(loops) + 1, dtype=np.int64)
+        np.cumsum(counts, out=positions[1:])
+        new_loops = np.empty(positions[-1], dtype=np.int64)
+        new_loops[positions[:-1][current_inside]] = current[current_inside]
+        new_loops[positions[:-1][crossing] + current_inside[crossing]] = count + new_index
+        loops, offsets = new_loops, positions[offsets]
+
+    return vertices, loops, offsets
+
+
+def voronoi_cells(points, bounds):
+    """
+    Voronoi cells of 2D points, clipped to convex polygon bounds.
+    Returns vertices (V, 2), loops and offsets of polygons, and
+    for each polygon, index of its point. Cells which are outside of
+    bounds, and cells of repeated points, are omitted.
+    """
+    points = _as_points(points)
+    bounds = _as_points(bounds)
+    if not len(points):
+        return np.zeros((0, 2)), np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    kept, _ = _remove_doubles(points)
+
+    everything = np.concatenate((points, bounds))
+    low, high = everything.min(axis=0), everything.max(axis=0)
+    center = (low + high) / 2.0
+    size = FAR_POINTS_DISTANCE * max((high - low).max(), 1.0)
+    far = center + size * np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)])
+    sites = np.concatenate((points[kept], far))
+
+    order = np.lexsort((sites[:, 0], sites[:, 1]))
+    triangles = _sweep(sites[order, 0].tolist(), sites[order, 1].tolist(), low[0], high[0])
+    triangles = order[np.array(triangles, dtype=np.int64).reshape((-1, 3))]
+    triangles = _counter_clockwise(sites, triangles)
+    centers = circumcenters(sites, triangles)
+
+    # cell of a site consists of centers of triangles around it, sorted by angle
+    corner_site = triangles.ravel()
+    corner_triangle = np.repeat(np.arange(len(triangles)), 3)
+    real = corner_site < len(kept)
+    corner_site, corner_triangle = corner_site[real], corner_triangle[real]
+    direction = centers[corner_triangle] - sites[corner_site]
+    angle = np.arctan2(direction[:, 1], direction[:, 0])
+    order = np.lexsort((angle, corner_site))
+    loops = corner_triangle[order]
+    cell_sites, counts = np.unique(corner_site[order], return_counts=True)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    vertices, loops, offsets = clip_polygons(centers, loops, offsets, bounds)
+
+    # merge coincident vertices (e.g. centers of triangles on one circle)
+    used, loops = np.unique(loops, return_inverse=True)
+    vertices = vertices[used]
+    kept_vertices, index = _remove_doubles(vertices)
+    vertices, loops = vertices[kept_vertices], index[loops]
+    polygon = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    keep = loops != loops[_next_in_loop(loops, offsets)]
+    loops, polygon = loops[keep], polygon[keep]
+    counts = np.bincount(polygon, minlength=len(offsets) - 1)
+    good = counts >= 3
+    loops = loops[good[polygon]]
+    offsets = np.zeros(good.sum() + 1, dtype=np.int64)
+    np.cumsum(counts[good], out=offsets[1:])
+    return vertices, loops, offsets, kept[cell_sites[good]]